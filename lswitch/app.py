@@ -10,6 +10,7 @@ import sys
 import threading
 
 import lswitch.log  # registers TRACE level and logger.trace()
+from lswitch.log import lazy
 from lswitch.config import ConfigManager
 
 logger = logging.getLogger(__name__)
@@ -124,7 +125,23 @@ class _PidLock:
 from lswitch.core.event_bus import EventBus
 from lswitch.core.state_manager import StateManager
 from lswitch.core.conversion_engine import ConversionEngine
-from lswitch.core.event_manager import EventManager
+from lswitch.core.layout_registry import LayoutRegistry, lang_of
+from lswitch.core.platform_snapshot import PlatformSnapshot
+from lswitch.core.event_manager import (
+    EventManager,
+    KEY_BACKSPACE,
+    KEY_ENTER,
+    KEY_SPACE,
+    MODIFIER_KEYS,
+    NAVIGATION_KEYS,
+    SHIFT_KEYS,
+)
+from lswitch.input.key_mapper import keycode_to_char
+
+
+def _key_label(code: int, shifted: bool = False) -> str:
+    """Character for *code* in the EN layout, ``'?'`` if it has none."""
+    return keycode_to_char(code, shift=shifted) or '?'
 
 
 class _SelectionPollerThread(threading.Thread):
@@ -133,7 +150,8 @@ class _SelectionPollerThread(threading.Thread):
     Logs changes at DEBUG level, and notifies ``LSwitchApp`` via
     ``on_selection_changed`` callback so the baseline is always up to date.
     Does NOT read selection at click time (avoids platform races).
-    Enabled only when the platform factory marks polling as appropriate.
+    Enabled only when the platform factory marks polling as appropriate
+    and the selection adapter cannot push owner changes itself.
     """
 
     def __init__(
@@ -187,6 +205,7 @@ class LSwitchApp:
     """
 
     MANUAL_WEIGHT_STEP = 2
+    EVENT_QUEUE_CAPACITY = 1024
 
     def __init__(
         self,
@@ -225,8 +244,13 @@ class LSwitchApp:
         self.virtual_kb = None
         self.device_manager = None
         self.conversion_engine = None
+        self._layout_registry: LayoutRegistry | None = None
         self.event_manager = None
         self._udev_monitor = None
+        self._event_ring = None
+        self._signal_fd = None
+        self._stopped = False
+        self._ui_thread = None   # QtMainThreadInvoker for UI-bound publishes
         self.auto_detector = None
         self.user_dict = None
         self._last_auto_marker = None
@@ -237,6 +261,10 @@ class LSwitchApp:
         self._prev_sel_text: str = ""
         self._prev_sel_owner_id: int = 0
         self._selection_baseline_initialized: bool = False
+        # A plain click skipped the read: the baseline may be stale (the
+        # click usually cleared the selection it describes).
+        self._selection_baseline_unconfirmed: bool = False
+        self._selection_reads_skipped: int = 0
         self._last_retype_events: list = []   # sticky buffer for repeat Shift+Shift
         self._platform = None
         self._selection_poller: _SelectionPollerThread | None = None
@@ -306,7 +334,10 @@ class LSwitchApp:
         from lswitch.input.device_manager import DeviceManager
         from lswitch.input.virtual_keyboard import VirtualKeyboard as _VK
 
-        self.device_manager = DeviceManager(debug=self.debug)
+        self.device_manager = DeviceManager(
+            debug=self.debug,
+            grab_during_conversion=self.config.get('grab_input_during_conversion', False),
+        )
         if self.virtual_kb:
             self.device_manager.set_virtual_kb_name(_VK.DEVICE_NAME)
 
@@ -314,7 +345,7 @@ class LSwitchApp:
         from lswitch.input.udev_monitor import UdevMonitor
 
         self._udev_monitor = UdevMonitor(
-            on_added=self.device_manager._try_add_device,
+            on_added=self.device_manager.add_device_async,
             on_removed=lambda path: self.device_manager.remove_device(path),
         )
 
@@ -371,6 +402,11 @@ class LSwitchApp:
         )
         if self.conversion_engine is not None:
             self.conversion_engine.timing = self.timing
+        if self.device_manager is not None:
+            self.device_manager.grab_during_conversion = self.config.get(
+                'grab_input_during_conversion',
+                False,
+            )
 
         if self.config.get('user_dict_enabled'):
             try:
@@ -418,9 +454,6 @@ class LSwitchApp:
         self._selection_repeat_generation = 0
 
     def _on_key_press(self, event):
-        from lswitch.core.event_manager import SHIFT_KEYS, KEY_BACKSPACE, KEY_SPACE, MODIFIER_KEYS
-        from lswitch.input.key_mapper import keycode_to_char
-
         data = event.data
         logger.trace(  # type: ignore[attr-defined]
             "KeyPress: code=%d dev=%s | state=%s buf=%d",
@@ -447,7 +480,7 @@ class LSwitchApp:
                 ctx.event_buffer.pop()
             logger.trace(  # type: ignore[attr-defined]
                 "Buffer -[BS] → %r (%d chars)",
-                self._decode_buffer(),
+                lazy(self._decode_buffer),
                 self.state_manager.context.chars_in_buffer,
             )
             ctx.backspace_repeats = 0
@@ -457,19 +490,19 @@ class LSwitchApp:
         elif data.code == KEY_SPACE:
             # Word boundary — try auto-conversion if enabled
             if self.auto_detector and self.config.get('auto_switch'):
-                if self._try_auto_conversion_at_space():
+                if self._try_auto_conversion_at_space(data.timestamp):
                     self._clear_selection_repeat()
                     return  # space was consumed by auto-conversion
             # Normal space: add to buffer
             self.state_manager.on_key_press(data.code)
             self.state_manager.context.chars_in_buffer += 1
             data.shifted = self.state_manager.context.shift_pressed
-            self.state_manager.context.event_buffer.append(data)
+            self._append_to_buffer(data)
             logger.trace(  # type: ignore[attr-defined]
                 "Buffer +[%d:%s] → %r (%d chars)",
                 data.code,
-                keycode_to_char(data.code, shift=data.shifted) or '?',
-                self._decode_buffer(),
+                lazy(_key_label, data.code, data.shifted),
+                lazy(self._decode_buffer),
                 self.state_manager.context.chars_in_buffer,
             )
             self.state_manager.context.backspace_repeats = 0
@@ -480,12 +513,12 @@ class LSwitchApp:
             self.state_manager.on_key_press(data.code)
             self.state_manager.context.chars_in_buffer += 1
             data.shifted = self.state_manager.context.shift_pressed
-            self.state_manager.context.event_buffer.append(data)
+            self._append_to_buffer(data)
             logger.trace(  # type: ignore[attr-defined]
                 "Buffer +[%d:%s] → %r (%d chars)",
                 data.code,
-                keycode_to_char(data.code, shift=data.shifted) or '?',
-                self._decode_buffer(),
+                lazy(_key_label, data.code, data.shifted),
+                lazy(self._decode_buffer),
                 self.state_manager.context.chars_in_buffer,
             )
             self.state_manager.context.backspace_repeats = 0
@@ -494,10 +527,6 @@ class LSwitchApp:
             self._last_retype_events = []
 
     def _on_key_release(self, event):
-        from lswitch.core.event_manager import (
-            SHIFT_KEYS, NAVIGATION_KEYS, KEY_BACKSPACE, KEY_ENTER, KEY_SPACE,
-        )
-
         data = event.data
         if data.code == KEY_SPACE and getattr(self, '_pending_auto_space', False):
             self._pending_auto_space = False
@@ -508,7 +537,7 @@ class LSwitchApp:
                 logger.error("Failed to inject deferred auto-space: %s", exc)
 
         if data.code in SHIFT_KEYS:
-            is_double = self.state_manager.on_shift_up()
+            is_double = self.state_manager.on_shift_up(data.timestamp)
             if is_double:
                 logger.debug(
                     "DoubleShift detected → _do_conversion() "
@@ -535,9 +564,18 @@ class LSwitchApp:
             if self.state_manager.context.chars_in_buffer > 0:
                 self.state_manager.context.chars_in_buffer -= 1
 
-    def _on_key_repeat(self, event):
-        from lswitch.core.event_manager import KEY_BACKSPACE
+    def _append_to_buffer(self, data) -> None:
+        """Buffer a typed key, keeping the char count within what can be replayed.
+
+        The ring drops its oldest key once full; a count above its length
+        would make retype delete more characters than it types back.
+        """
+        ctx = self.state_manager.context
+        ctx.event_buffer.append(data)
+        if ctx.chars_in_buffer > len(ctx.event_buffer):
+            ctx.chars_in_buffer = len(ctx.event_buffer)
 
+    def _on_key_repeat(self, event):
         data = event.data
         if data.code == KEY_BACKSPACE:
             ctx = self.state_manager.context
@@ -547,13 +585,13 @@ class LSwitchApp:
                 ctx.event_buffer.pop()
             logger.trace(  # type: ignore[attr-defined]
                 "Buffer -[BS repeat] → %r (%d chars)",
-                self._decode_buffer(),
+                lazy(self._decode_buffer),
                 len(self.state_manager.context.event_buffer),
             )
             if ctx.chars_in_buffer > 0:
                 ctx.chars_in_buffer -= 1
             if ctx.backspace_repeats >= 3:
-                self.state_manager.on_backspace_hold()
+                self.state_manager.on_backspace_hold(data.timestamp)
 
     def _on_mouse_click(self, event):
         self._last_auto_marker = None
@@ -564,7 +602,10 @@ class LSwitchApp:
         # owner app (for example via Ctrl+C), and doing that during click
         # handling can race with deselection. Adapters with a passive reader
         # may safely prime the baseline before _on_mouse_release compares it.
-        self._update_passive_selection_baseline_on_click()
+        if self._pointer_may_select() is False:
+            self._skip_selection_read("MouseClick")
+        else:
+            self._update_passive_selection_baseline_on_click()
         self.state_manager.on_mouse_click()
 
     def _on_mouse_release(self, event):
@@ -578,6 +619,9 @@ class LSwitchApp:
         Reading at release time is safer because the target application has
         already processed the button-release event and committed selection
         state for the current platform.
+
+        Gestures that cannot select text (plain, right and middle clicks,
+        see ``EventManager.pointer_may_select``) skip the read.
         """
         if self.selection is None:
             return
@@ -587,16 +631,25 @@ class LSwitchApp:
             True,
         ):
             return
+        if self._pointer_may_select() is False:
+            self._skip_selection_read("MouseRelease")
+            # A plain click usually deselects: the baseline no longer
+            # matches, so reselecting the same text must count as fresh.
+            if self._selection_baseline_initialized:
+                self._selection_baseline_unconfirmed = True
+            return
         try:
             reader = self._passive_selection_reader()
             info = reader() if reader is not None else self.selection.get_selection()
             old_text = self._prev_sel_text
             old_owner = self._prev_sel_owner_id
             had_baseline = self._selection_baseline_initialized
+            unconfirmed = self._selection_baseline_unconfirmed
             # Always update baseline on release
             self._prev_sel_text = info.text or ""
             self._prev_sel_owner_id = info.owner_id
             self._selection_baseline_initialized = True
+            self._selection_baseline_unconfirmed = False
             if not info.text:
                 self._selection_valid = False
                 self._clear_selection_repeat()
@@ -611,7 +664,7 @@ class LSwitchApp:
                 )
                 return
             # If selection changed → fresh selection (drag-select happened)
-            if info.text != old_text or (
+            if unconfirmed or info.text != old_text or (
                 info.owner_id != old_owner and info.owner_id != 0
             ):
                 self._selection_valid = True
@@ -627,6 +680,20 @@ class LSwitchApp:
         except Exception:
             pass
 
+    def _pointer_may_select(self) -> bool | None:
+        """Gesture verdict from the event manager; None when unknown."""
+        if self.event_manager is None:
+            return None
+        return self.event_manager.pointer_may_select()
+
+    def _skip_selection_read(self, where: str) -> None:
+        """Count a selection read avoided for a gesture that cannot select."""
+        self._selection_reads_skipped += 1
+        logger.trace(  # type: ignore[attr-defined]
+            "%s: plain click — selection not read (%d skipped)",
+            where, self._selection_reads_skipped,
+        )
+
     def _passive_selection_reader(self):
         """Return a no-shortcut selection reader when the adapter provides one."""
         from lswitch.platform.selection_adapter import get_passive_selection_reader
@@ -651,9 +718,11 @@ class LSwitchApp:
             old_owner = self._prev_sel_owner_id
             info = reader()
             had_baseline = self._selection_baseline_initialized
+            unconfirmed = self._selection_baseline_unconfirmed
             self._prev_sel_text = info.text or ""
             self._prev_sel_owner_id = info.owner_id
             self._selection_baseline_initialized = True
+            self._selection_baseline_unconfirmed = False
             if not had_baseline:
                 logger.trace(  # type: ignore[attr-defined]
                     "MouseClick: initial passive selection baseline — text=%r",
@@ -661,7 +730,8 @@ class LSwitchApp:
                 )
                 return
             if info.text and (
-                info.text != old_text
+                unconfirmed
+                or info.text != old_text
                 or (info.owner_id != old_owner and info.owner_id != 0)
             ):
                 self._selection_valid = True
@@ -683,7 +753,6 @@ class LSwitchApp:
 
     def _decode_buffer(self, events: list | None = None) -> str:
         """Decode event buffer to human-readable string of characters."""
-        from lswitch.input.key_mapper import keycode_to_char
         if events is None:
             events = self.state_manager.context.event_buffer
         chars = []
@@ -697,7 +766,7 @@ class LSwitchApp:
     # ------------------------------------------------------------------
 
     def _on_poller_selection_changed(self, text: str, owner_id: int) -> None:
-        """Called by _SelectionPollerThread when platform selection changes.
+        """Called when platform selection changes (owner watcher or poller).
 
         Sets fresh=True so the next Shift+Shift will use SelectionMode.
         Does NOT update baseline (_prev_sel_text / _prev_sel_owner_id) —
@@ -709,6 +778,32 @@ class LSwitchApp:
             text[:50] if text else "", owner_id,
         )
 
+    def _on_selection_owner_changed(self, owner_id: int) -> None:
+        """Called from the platform owner watcher (X11: XFixes).
+
+        Only ownership is reported; the text itself is read when a
+        conversion asks for it. A vanished owner leaves nothing selected.
+        """
+        if owner_id:
+            self._on_poller_selection_changed("", owner_id)
+
+    def _watch_selection_owner(self) -> None:
+        """Subscribe to selection owner changes, polling only as a fallback."""
+        try:
+            watching = self.selection.watch_owner_changes(self._on_selection_owner_changed)
+        except Exception as exc:
+            logger.debug("Selection owner watch failed: %s", exc)
+            watching = False
+        if watching is True:
+            logger.debug("Выделение: уведомления о смене владельца PRIMARY")
+            return
+        self._selection_poller = _SelectionPollerThread(
+            self.selection,
+            on_selection_changed=self._on_poller_selection_changed,
+            poll_interval=self.x11_selection_timing.get('poll_interval', 0.5),
+        )
+        self._selection_poller.start()
+
     def _selection_baseline_tracking_enabled(self) -> bool:
         """Return whether passive selection baseline reads are safe/useful."""
         if self._platform is None:
@@ -734,6 +829,7 @@ class LSwitchApp:
             self._prev_sel_text = info.text or ""
             self._prev_sel_owner_id = info.owner_id
             self._selection_baseline_initialized = True
+            self._selection_baseline_unconfirmed = False
         except Exception:
             pass
 
@@ -741,6 +837,22 @@ class LSwitchApp:
     # Conversion
     # ------------------------------------------------------------------
 
+    def _isolated_input(self):
+        """Grab physical keyboards while a conversion injects keys.
+
+        Keystrokes typed meanwhile are re-injected through the virtual
+        keyboard afterwards (see ``DeviceManager.isolated_input``).
+        """
+        from contextlib import nullcontext
+
+        if (
+            self.device_manager is None
+            or self.virtual_kb is None
+            or not self.config.get('grab_input_during_conversion', False)
+        ):
+            return nullcontext()
+        return self.device_manager.isolated_input(self.virtual_kb.send_key_events)
+
     def _do_conversion(self):
         """Trigger conversion if state machine is in CONVERTING state.
 
@@ -759,6 +871,9 @@ class LSwitchApp:
         if self.state_manager.state != State.CONVERTING:
             return
 
+        # Layout and selection reads for this gesture share one snapshot.
+        snapshot = PlatformSnapshot(self.xkb, self.selection, registry=self.layout_registry)
+
         # --- Extract typed word from buffer BEFORE convert() clears it ---
         # Only relevant for Case B (manual conversion); Case A buffer is already empty.
         manual_word: str = ""
@@ -775,7 +890,7 @@ class LSwitchApp:
         )
         if self.user_dict and chars_in_buffer > 0:
             try:
-                layout_info = self.xkb.get_current_layout() if self.xkb else None
+                layout_info = snapshot.current_layout()
                 manual_lang = self._layout_to_lang(layout_info)
                 manual_word, _ = self._extract_last_word_events(layout_info)
             except Exception:
@@ -783,7 +898,7 @@ class LSwitchApp:
         elif self.user_dict and chars_in_buffer == 0 and selection_valid_for_convert and self._last_auto_marker is None:
             try:
                 from lswitch.core.text_converter import detect_language
-                sel_obj = self.selection.get_selection() if self.selection else None
+                sel_obj = snapshot.get_selection() if self.selection else None
                 if sel_obj and sel_obj.text:
                     sel_text = sel_obj.text.strip()
                     # Only learn single words, ignore multi-word selections
@@ -808,27 +923,25 @@ class LSwitchApp:
             
             # Undo auto-conversion (Case A undo block)
             if chars_in_buffer == 0 and 'word_events' in marker:
-                from lswitch.core.event_manager import KEY_BACKSPACE, KEY_SPACE
                 try:
-                    self.virtual_kb.tap_key(KEY_BACKSPACE, n_times=marker['converted_len'] + 1)
-                    if self.xkb:
-                        target = next((
-                            l for l in self.xkb.get_layouts()
-                            if l.name.lower().startswith(marker['lang'])
-                        ), None)
-                        if target:
-                            self.xkb.switch_layout(target=target)
-                    import time as _time_mod
-                    _time_mod.sleep(
-                        self.timing.get('undo_before_replay_delay', 0.03)
-                    )
-                    self.virtual_kb.replay_events(marker['word_events'])
-                    self.virtual_kb.tap_key(KEY_SPACE)
+                    with self._isolated_input():
+                        self.virtual_kb.tap_key(KEY_BACKSPACE, n_times=marker['converted_len'] + 1)
+                        if self.xkb:
+                            target = snapshot.layout_for_lang(marker['lang'])
+                            if target:
+                                snapshot.switch_layout(target=target)
+                        import time as _time_mod
+                        _time_mod.sleep(
+                            self.timing.get('undo_before_replay_delay', 0.03)
+                        )
+                        self.virtual_kb.replay_events(marker['word_events'])
+                        self.virtual_kb.tap_key(KEY_SPACE)
                 except Exception as exc:
                     logger.error("Undo auto-conversion failed: %s", exc)
                 
                 self.state_manager.on_conversion_complete()
                 self._last_auto_marker = None
+                logger.debug("Конвертация (отмена): вызовов платформы %s", snapshot.summary())
                 return
 
             self._last_auto_marker = None
@@ -850,7 +963,7 @@ class LSwitchApp:
             if saved_count == 0 and self._last_retype_events:
                 saved_events = list(self._last_retype_events)
                 saved_count = len(saved_events)
-                self.state_manager.context.event_buffer = list(saved_events)
+                self.state_manager.context.event_buffer.replace(saved_events)
                 self.state_manager.context.chars_in_buffer = saved_count
                 logger.debug(
                     "DoConversion: restored sticky buffer → chars=%d",
@@ -864,18 +977,17 @@ class LSwitchApp:
             if saved_count > 0 and not selection_valid_for_convert:
                 try:
                     _, last_word_events = self._extract_last_word_events(
-                        self.xkb.get_current_layout() if self.xkb else None
+                        snapshot.current_layout()
                     )
                     if last_word_events and len(last_word_events) < saved_count:
                         # fix-1B: include trailing spaces for correct backspace count
-                        from lswitch.core.event_manager import KEY_SPACE as _KS
+                        buf = self.state_manager.context.event_buffer
                         trailing = []
-                        for ev in reversed(saved_events):
-                            if ev.code == _KS:
-                                trailing.append(ev)
+                        for i in range(len(buf) - buf.trailing_boundaries(), len(buf)):
+                            if buf.code_at(i) == KEY_SPACE:
+                                trailing.append(buf[i])
                             else:
-                                break
-                        trailing.reverse()
+                                trailing.clear()
                         trimmed = last_word_events + trailing
                         logger.debug(
                             "DoConversion: trim buffer to last word → %d events (was %d, trailing_spaces=%d)",
@@ -883,7 +995,7 @@ class LSwitchApp:
                         )
                         saved_events = trimmed
                         saved_count = len(trimmed)
-                        self.state_manager.context.event_buffer = list(trimmed)
+                        self.state_manager.context.event_buffer.replace(trimmed)
                         self.state_manager.context.chars_in_buffer = saved_count
                 except Exception as exc:
                     logger.debug("DoConversion: trim skipped: %s", exc)
@@ -897,13 +1009,15 @@ class LSwitchApp:
                 selection_valid_for_convert,
                 saved_count,
                 len(saved_events), len(self._last_retype_events),
-                self._decode_buffer(saved_events),
+                lazy(self._decode_buffer, saved_events),
             )
 
-            success = self.conversion_engine.convert(
-                self.state_manager.context,
-                selection_valid=selection_valid_for_convert,
-            )
+            with self._isolated_input():
+                success = self.conversion_engine.convert(
+                    self.state_manager.context,
+                    selection_valid=selection_valid_for_convert,
+                    snapshot=snapshot,
+                )
 
             if success and self.user_dict:
                 if pending_manual_learning is not None:
@@ -923,6 +1037,7 @@ class LSwitchApp:
             else:
                 self._last_retype_events = []
         finally:
+            logger.debug("Конвертация: вызовов платформы %s", snapshot.summary())
             # Update baseline to prevent re-conversion of same text
             self._update_selection_baseline()
             self._selection_valid = False  # consumed
@@ -1011,7 +1126,7 @@ class LSwitchApp:
     # Auto-conversion (space-triggered, AutoDetector)
     # ------------------------------------------------------------------
 
-    def _try_auto_conversion_at_space(self) -> bool:
+    def _try_auto_conversion_at_space(self, timestamp: float = 0.0) -> bool:
         """Check and perform auto-conversion at Space word boundary.
 
         Returns True if conversion was performed (Space consumed).
@@ -1021,6 +1136,9 @@ class LSwitchApp:
         reset before auto-conversion activates.  Set to 0 (default) to
         convert from the very first word.  Increase to avoid false-positives
         at the start of a field (e.g., 5 = activate after ≥5 chars typed).
+
+        *timestamp* is the Space press's kernel event time; it stamps the
+        auto-conversion marker.
         """
         MIN_WORD_LEN = 1
 
@@ -1030,8 +1148,7 @@ class LSwitchApp:
 
         # Guard: if buffer ends with space(s), the last word was already
         # evaluated on a previous space press — skip auto-conversion.
-        from lswitch.core.event_manager import KEY_SPACE as _KS_GUARD
-        if ctx.event_buffer and ctx.event_buffer[-1].code == _KS_GUARD:
+        if ctx.event_buffer and ctx.event_buffer.code_at(-1) == KEY_SPACE:
             return False
 
         # Buffer warmup: don't activate until enough chars have been typed
@@ -1087,14 +1204,15 @@ class LSwitchApp:
         logger.info("Auto-convert at space: '%s' → %s (%s)", word, direction, reason)
         self._do_auto_conversion_at_space(
             len(word_events), word_events, direction,
-            orig_word=word, orig_lang=current_lang,
+            orig_word=word, orig_lang=current_lang, timestamp=timestamp,
         )
         return True
 
     def _extract_last_word_events(self, current_layout=None) -> "tuple[str, list]":
         """Extract events for the last typed word from event_buffer.
 
-        Scans backwards until a space or non-alpha character is found.
+        Uses the buffer's word-boundary index (Space/Enter/Tab/Esc), so the
+        cost is O(word length) however long the buffer is.
         Returns (word_str, word_events_in_order).
 
         When ``current_layout`` (a LayoutInfo) is provided and ``self.xkb`` is
@@ -1103,51 +1221,37 @@ class LSwitchApp:
         EN physical-key equivalents, where б→, and ю→. are non-alpha and would
         truncate the word prematurely).
         """
-        from lswitch.core.event_manager import KEY_SPACE
-        from lswitch.input.key_mapper import keycode_to_char as _kc_en
-
-        # Chars in EN layout that map to Cyrillic letters (e.g. ',' → 'б').
-        # These keys must NOT break word scanning when the user is typing
-        # Russian on the wrong EN keyboard.
-        from lswitch.intelligence.maps import EN_TO_RU as _EN_TO_RU
-        _is_cyrillic_key = lambda c: bool(c and not c.isalpha() and _EN_TO_RU.get(c.lower(), '').isalpha())
+        buf = self.state_manager.context.event_buffer
+        start, stop = buf.last_word_span()
+        word_events = buf[start:stop]
 
-        word_events: list = []
         chars: list[str] = []
-        skipping_trailing_spaces = True
-        from lswitch.core.event_manager import KEY_SPACE, KEY_ENTER, KEY_TAB, KEY_ESC, KEY_BACKSPACE
-        for ev in reversed(self.state_manager.context.event_buffer):
-            if ev.code in (KEY_SPACE, KEY_ENTER, KEY_TAB, KEY_ESC, KEY_BACKSPACE):
-                if skipping_trailing_spaces:
-                    continue
-                break
-            skipping_trailing_spaces = False
+        use_xkb = current_layout is not None and self.xkb is not None
+        for ev in word_events:
             # Prefer actual XKB mapping for the current layout
-            if current_layout is not None and self.xkb is not None:
+            if use_xkb:
                 ch = self.xkb.keycode_to_char(ev.code, current_layout)
             else:
-                ch = _kc_en(ev.code)
-
+                ch = keycode_to_char(ev.code)
             if ch:
                 chars.append(ch)
-            word_events.append(ev)
-
-        word_events.reverse()
-        chars.reverse()
         return "".join(chars), word_events
 
+    @property
+    def layout_registry(self) -> LayoutRegistry:
+        """Language → layout index over the current XKB adapter."""
+        registry = self._layout_registry
+        if registry is None or registry.xkb is not self.xkb:
+            registry = self._layout_registry = LayoutRegistry(self.xkb)
+        return registry
+
     def _layout_to_lang(self, layout_info) -> str:
         """Map LayoutInfo to a 2-letter language code ('en' or 'ru')."""
-        if layout_info is None:
-            return "en"
-        name = layout_info.name.lower()
-        if name.startswith("ru") or name in ("russian", "россия"):
-            return "ru"
-        return "en"
+        return "ru" if lang_of(layout_info) == "ru" else "en"
 
     def _do_auto_conversion_at_space(
         self, word_len: int, word_events: list, direction: str,
-        orig_word: str = "", orig_lang: str = "",
+        orig_word: str = "", orig_lang: str = "", timestamp: float = 0.0,
     ) -> None:
         """Perform auto-conversion: delete (word + space), retype in target layout, add space.
 
@@ -1157,7 +1261,6 @@ class LSwitchApp:
         import time as _time_mod
         t_start = _time_mod.perf_counter()
         
-        from lswitch.core.event_manager import KEY_BACKSPACE, KEY_SPACE
         from lswitch.core.states import State
 
         ctx = self.state_manager.context
@@ -1167,28 +1270,25 @@ class LSwitchApp:
             # Find target layout
             target_lang = "ru" if direction == "en_to_ru" else "en"
             try:
-                layouts = self.xkb.get_layouts() if self.xkb else []
-                target = next(
-                    (l for l in layouts if l.name.lower().startswith(target_lang)),
-                    None,
-                )
+                target = self.layout_registry.for_lang(target_lang) if self.xkb else None
             except Exception:
                 target = None
 
-            # Delete: word_len chars + 1 for the space that already landed in the app
-            self.virtual_kb.tap_key(KEY_BACKSPACE, n_times=word_len + 1)
+            with self._isolated_input():
+                # Delete: word_len chars + 1 for the space that already landed in the app
+                self.virtual_kb.tap_key(KEY_BACKSPACE, n_times=word_len + 1)
 
-            # Switch to target layout
-            if target and self.xkb:
-                self.xkb.switch_layout(target=target)
+                # Switch to target layout
+                if target and self.xkb:
+                    self.xkb.switch_layout(target=target)
 
-            _time_mod.sleep(self.timing.get('auto_before_replay_delay', 0.03))
+                _time_mod.sleep(self.timing.get('auto_before_replay_delay', 0.03))
 
-            # Replay original keycodes in the new layout (produces converted text)
-            self.virtual_kb.replay_events(word_events)
-            
-            # Дать приложению переварить введенный текст перед финальным пробелом
-            _time_mod.sleep(self.timing.get('auto_before_space_delay', 0.01))
+                # Replay original keycodes in the new layout (produces converted text)
+                self.virtual_kb.replay_events(word_events)
+
+                # Дать приложению переварить введенный текст перед финальным пробелом
+                _time_mod.sleep(self.timing.get('auto_before_space_delay', 0.01))
 
             # We DO NOT tap_key(KEY_SPACE) here, because the physical Space key
             # is almost certainly still held down by the user, and desktop
@@ -1202,13 +1302,12 @@ class LSwitchApp:
             self._pending_auto_space = True
 
             # Save marker BEFORE reset so correction can be detected later
-            import time as _time
             if orig_word and conversion_ok:
                 self._last_auto_marker = {
                     'word': orig_word,
                     'direction': direction,
                     'lang': orig_lang,
-                    'time': _time.time(),
+                    'time': timestamp or _time_mod.monotonic(),
                     'word_events': list(word_events),
                     'converted_len': len(word_events),
                 }
@@ -1231,6 +1330,15 @@ class LSwitchApp:
         self._pid_lock = _PidLock(replace=self._replace)
         self._pid_lock.acquire()
 
+        # Headless without Qt: signals arrive through the evdev selector.
+        # Must happen before any thread is started (they inherit the mask).
+        if self.headless and not runtime_plan.uses_qt_event_loop:
+            from lswitch.input.signal_fd import SignalFD
+
+            self._signal_fd = SignalFD.open(
+                (signal.SIGHUP, signal.SIGTERM, signal.SIGINT)
+            )
+
         try:
             if runtime_plan.requires_qt_before_platform:
                 from lswitch.ui.qt_bridge import QtMainThreadInvoker, ensure_qt_application
@@ -1245,28 +1353,24 @@ class LSwitchApp:
             raise
 
         if self.selection and getattr(self._platform, "selection_polling_enabled", False):
-            self._selection_poller = _SelectionPollerThread(
-                self.selection,
-                on_selection_changed=self._on_poller_selection_changed,
-                poll_interval=self.x11_selection_timing.get('poll_interval', 0.5),
-            )
-            self._selection_poller.start()
+            self._watch_selection_owner()
 
         count = self.device_manager.scan_devices()
 
         if self._udev_monitor:
-            self._udev_monitor.start()
+            self._udev_monitor.attach(self.device_manager)
+        self._watch_layout_changes()
 
         self._running = True
 
         logger.info("LSwitch 2.0 запущен (headless=%s, %d устройств)", self.headless, count)
 
-        def _reload_handler(signum, frame):
-            if self.config.reload():
-                self._apply_runtime_config()
-            if self.debug:
-                logger.debug("Config reloaded via SIGHUP")
-        signal.signal(signal.SIGHUP, _reload_handler)
+        if self._signal_fd is not None:
+            self.device_manager.add_watch(self._signal_fd, self._on_signal_fd)
+        else:
+            def _reload_handler(signum, frame):
+                self._reload_config()
+            signal.signal(signal.SIGHUP, _reload_handler)
 
         if runtime_plan.uses_qt_event_loop:
             if qt_app is None:
@@ -1279,16 +1383,138 @@ class LSwitchApp:
         else:
             self._run_with_gui()
 
+    def _reload_config(self):
+        if self.config.reload():
+            self._apply_runtime_config()
+        if self.debug:
+            logger.debug("Config reloaded via SIGHUP")
+
+    def _on_signal_fd(self):
+        """Selector callback (reader thread) for SIGHUP/SIGTERM/SIGINT."""
+        for signum in self._signal_fd.read():
+            if signum == signal.SIGHUP:
+                # Reload on the handler thread, between two events.
+                self._event_ring.put(None, self._reload_config)
+            else:
+                logger.info("Получен сигнал %d. Завершение...", signum)
+                self._request_stop()
+
+    def _watch_layout_changes(self):
+        """Serve XKB layout notifications from the evdev selector."""
+        if self.xkb is None:
+            return
+        try:
+            watcher = self.xkb.watch_layout_changes(self._on_layout_changed)
+            if watcher is not None:
+                self.device_manager.add_watch(watcher, watcher.process)
+        except Exception as exc:
+            logger.debug("Уведомления о смене раскладки недоступны: %s", exc)
+
+    def _on_layout_changed(self):
+        """Layout notification (reader thread): publish on the handler thread."""
+        if self._event_ring is not None:
+            self._event_ring.put(None, self._publish_layout_changed)
+        else:
+            self._publish_layout_changed()
+
+    def _publish_layout_changed(self):
+        import time
+        from lswitch.core.events import Event, EventType
+
+        try:
+            layout = self.xkb.get_current_layout()
+        except Exception as exc:
+            logger.debug("get_current_layout failed: %s", exc)
+            return
+        event = Event(EventType.LAYOUT_CHANGED, layout.name, time.time())
+        if self._ui_thread is None:
+            self.event_bus.publish(event)
+            return
+        # Tray/debug window update widgets: publish on the Qt thread,
+        # without making the caller wait for a busy GUI.
+        def _delivered(future):
+            if future.exception() is not None:
+                logger.debug("LAYOUT_CHANGED not delivered: %s", future.exception())
+
+        try:
+            self._ui_thread.submit(self.event_bus.publish, event).add_done_callback(_delivered)
+        except Exception as exc:
+            logger.debug("LAYOUT_CHANGED not delivered: %s", exc)
+
+    def _request_stop(self):
+        """Stop the reader loop; the handler drains the ring and calls stop()."""
+        self._running = False
+        if self.device_manager:
+            self.device_manager.wake()
+
     def _run_evdev_loop(self):
-        """Evdev event loop (blocking, main thread)."""
+        """Evdev event loop (blocking, main thread handles events)."""
+        reader = self._start_evdev_reader()
         try:
-            while self._running:
-                for device, event in self.device_manager.get_events(timeout=0.1):
-                    self.event_manager.handle_raw_event(event, device.name)
+            self._handle_queued_events()
         except KeyboardInterrupt:
             pass
         finally:
             self.stop()
+            reader.join(timeout=2.0)
+
+    def _start_evdev_reader(self) -> threading.Thread:
+        """Start the thread that only drains evdev devices into the ring.
+
+        Handlers run elsewhere (:meth:`_handle_queued_events`), so the kernel
+        buffer keeps emptying while a conversion sleeps between injected keys
+        and no ``SYN_DROPPED`` is produced under load.
+        """
+        from lswitch.input.event_ring import EventRing
+
+        ring = self._event_ring = EventRing(self.EVENT_QUEUE_CAPACITY)
+
+        def _reader():
+            overflowing = False
+            try:
+                while self._running:
+                    # No timeout: stop() and signals wake the selector.
+                    for device, event in self.device_manager.get_events(timeout=None):
+                        if ring.put(device, event):
+                            if overflowing and ring.depth < ring.capacity:
+                                overflowing = False
+                        elif not overflowing:
+                            overflowing = True
+                            logger.warning(
+                                "Очередь событий переполнена (%d), старые события отброшены",
+                                ring.capacity,
+                            )
+            except Exception as exc:
+                if self._running:
+                    logger.error("Evdev reader error: %s", exc)
+            finally:
+                ring.close()
+
+        t = threading.Thread(target=_reader, daemon=True, name="evdev-reader")
+        t.start()
+        return t
+
+    def _handle_queued_events(self):
+        """Run handlers for events queued by the reader until it stops."""
+        ring = self._event_ring
+        handle = self.event_manager.handle_raw_event
+        get = ring.get
+        while True:
+            item = get()
+            if item is None:
+                if ring.closed and not ring.depth:
+                    break
+                continue
+            device, event = item
+            if device is None:
+                event()     # control call queued by the reader (e.g. SIGHUP)
+                continue
+            handle(event, device.name)
+
+    @property
+    def event_queue_stats(self) -> dict:
+        """Reader→handler queue counters (empty before :meth:`run`)."""
+        return self._event_ring.stats() if self._event_ring else {}
 
     def _run_with_gui(self):
         """Run evdev in background thread + Qt event loop in main thread."""
@@ -1308,7 +1534,10 @@ class LSwitchApp:
             from lswitch.ui.tray_icon import TrayIcon
             from lswitch.ui.context_menu import ContextMenu
 
+            from lswitch.ui.qt_bridge import QtMainThreadInvoker
+
             tray = TrayIcon(event_bus=self.event_bus, config=self.config, app=qt_app)
+            self._ui_thread = QtMainThreadInvoker(qt_app)
 
             menu_obj = ContextMenu(config=self.config, event_bus=self.event_bus, app=self)
             menu = menu_obj.build()
@@ -1327,12 +1556,12 @@ class LSwitchApp:
             qt_app.quit()
         self.event_bus.subscribe(EventType.APP_QUIT, _on_quit)
 
-        # Evdev loop in background thread
+        # Evdev reader + handler in background threads
+        reader = self._start_evdev_reader()
+
         def _evdev_thread():
             try:
-                while self._running:
-                    for device, event in self.device_manager.get_events(timeout=0.1):
-                        self.event_manager.handle_raw_event(event, device.name)
+                self._handle_queued_events()
             except Exception as exc:
                 logger.error("Evdev thread error: %s", exc)
             finally:
@@ -1362,15 +1591,46 @@ class LSwitchApp:
             if tray is not None:
                 tray.cleanup()
             self.stop()
+            reader.join(timeout=2.0)
             t.join(timeout=2.0)
 
     # ------------------------------------------------------------------
     # Shutdown
     # ------------------------------------------------------------------
 
+    def _log_main_thread_latency(self) -> None:
+        """Debug-log how long work waited for the Qt main thread."""
+        invokers = [self._ui_thread, getattr(self._platform, "main_thread", None)]
+        seen = set()
+        for invoker in invokers:
+            summary = getattr(invoker, "latency_summary", None)
+            if not callable(summary) or id(invoker) in seen:
+                continue
+            seen.add(id(invoker))
+            try:
+                logger.debug("Очередь Qt: %s", summary())
+            except Exception:
+                pass
+
     def stop(self):
         """Graceful shutdown — safe to call multiple times."""
+        first_stop = not self._stopped
+        self._stopped = True
         self._running = False
+        if first_stop and self._event_ring is not None:
+            stats = self._event_ring.stats()
+            log = logger.warning if stats["overflow"] else logger.debug
+            log(
+                "Очередь событий: максимум %d/%d, переполнений %d, всего %d",
+                stats["high_water"], stats["capacity"], stats["overflow"], stats["total"],
+            )
+        if first_stop and self._selection_reads_skipped:
+            logger.debug(
+                "Выделение: пропущено чтений при обычных кликах: %d",
+                self._selection_reads_skipped,
+            )
+        if first_stop:
+            self._log_main_thread_latency()
         if self._selection_poller:
             self._selection_poller.stop()
         if self._udev_monitor:
@@ -1379,6 +1639,12 @@ class LSwitchApp:
             except Exception:
                 pass
         if self.device_manager:
+            self.device_manager.wake()
+            if first_stop:
+                try:
+                    logger.debug("События evdev: %s", self.device_manager.event_stats())
+                except Exception:
+                    pass
             try:
                 self.device_manager.close()
             except Exception:
@@ -1393,6 +1659,14 @@ class LSwitchApp:
                 self.xkb.close()
             except Exception:
                 pass
+        if self.system and hasattr(self.system, 'close'):
+            try:
+                self.system.close()
+            except Exception:
+                pass
+        if self._signal_fd is not None:
+            self._signal_fd.close()
+            self._signal_fd = None
         if self._pid_lock:
             self._pid_lock.release()
             self._pid_lock = None
@@ -69,10 +69,12 @@ def main():
     debug = args.debug or args.trace  # --trace implies --debug
     _setup_logging(debug=debug, trace=args.trace)
     if args.diagnose_wayland or args.diagnose_wayland_switch_test:
+        from lswitch.platform.wayland import KDE_LAYOUT_STATE_PATH
         from lswitch.platform.wayland_diagnostics import run_wayland_diagnostics
 
         report = run_wayland_diagnostics(
             switch_test=args.diagnose_wayland_switch_test,
+            state_path=KDE_LAYOUT_STATE_PATH,
         )
         print(report.to_text())
         raise SystemExit(0 if report.ok else 1)
@@ -30,8 +30,8 @@ WAYLAND_SELECTION_STRATEGIES = {
 }
 
 DEFAULT_TIMING: dict[str, float] = {
-    'key_press_delay': 0.001,
-    'key_repeat_delay': 0.001,
+    'key_press_delay': 0.0,
+    'key_repeat_delay': 0.0,
     'retype_before_replay_delay': 0.05,
     'direct_type_after_layout_switch_delay': 0.03,
     'undo_before_replay_delay': 0.03,
@@ -43,6 +43,7 @@ DEFAULT_X11_SELECTION_TIMING: dict[str, float] = {
     'poll_interval': 0.5,
     'paste_delay': 0.02,
     'restore_delay': 0.05,
+    'paste_timeout': 0.5,
     'expand_selection_delay': 0.05,
 }
 
@@ -56,6 +57,7 @@ DEFAULT_WAYLAND_SELECTION_TIMING: dict[str, float] = {
     'copy_retry_delay': 0.1,
     'paste_delay': 0.12,
     'restore_delay': 0.15,
+    'paste_timeout': 0.5,
     'expand_selection_delay': 0.2,
 }
 
@@ -70,6 +72,7 @@ DEFAULT_CONFIG: dict = {
     'user_dict_enabled': False,
     'user_dict_min_weight': 2,
     'wayland_selection_strategy': 'auto',
+    'grab_input_during_conversion': False,
     'timing': DEFAULT_TIMING,
     'x11_selection_timing': DEFAULT_X11_SELECTION_TIMING,
     'wayland_timing': DEFAULT_WAYLAND_TIMING,
@@ -102,18 +105,20 @@ _CONFIG_COMMENTS: dict[str, str] = {
     'user_dict_enabled': 'Enable the self-learning user dictionary.',
     'user_dict_min_weight': 'Minimum user dictionary score required to affect detection.',
     'wayland_selection_strategy': 'Wayland selection conversion mode.',
+    'grab_input_during_conversion': 'Grab physical keyboards during conversion and replay keys typed meanwhile.',
     'timing': 'Common input/conversion timings, seconds.',
-    'timing.key_press_delay': 'Delay between virtual key press and release.',
-    'timing.key_repeat_delay': 'Delay between successive virtual key taps.',
+    'timing.key_press_delay': 'Delay between virtual key press and release (0 = one write per transaction).',
+    'timing.key_repeat_delay': 'Delay between successive virtual key taps (0 = one write per transaction).',
     'timing.retype_before_replay_delay': 'After layout switch before replaying typed word.',
     'timing.direct_type_after_layout_switch_delay': 'After layout switch before direct selection typing.',
     'timing.undo_before_replay_delay': 'After layout switch before undo replay.',
     'timing.auto_before_replay_delay': 'After layout switch before auto-conversion replay.',
     'timing.auto_before_space_delay': 'After auto-conversion replay before final Space handling.',
     'x11_selection_timing': 'X11-only selection timings, seconds.',
-    'x11_selection_timing.poll_interval': 'PRIMARY selection polling interval.',
+    'x11_selection_timing.poll_interval': 'PRIMARY selection polling interval (used only without XFixes).',
     'x11_selection_timing.paste_delay': 'After writing clipboard before Ctrl+V.',
-    'x11_selection_timing.restore_delay': 'After Ctrl+V before restoring clipboard.',
+    'x11_selection_timing.restore_delay': 'After Ctrl+V before restoring clipboard, when paste completion is not observable.',
+    'x11_selection_timing.paste_timeout': 'Maximum wait for the target app to read the in-process clipboard after Ctrl+V.',
     'x11_selection_timing.expand_selection_delay': 'After Ctrl+Shift+Left before reading PRIMARY.',
     'wayland_timing': 'Wayland-only system timings, seconds.',
     'wayland_timing.wl_clipboard_timeout': 'Timeout for wl-copy/wl-paste helper commands.',
@@ -121,8 +126,9 @@ _CONFIG_COMMENTS: dict[str, str] = {
     'wayland_selection_timing.copy_wait_timeout': 'Maximum wait for Ctrl+C to update clipboard.',
     'wayland_selection_timing.copy_poll_interval': 'Clipboard poll interval after copy shortcut.',
     'wayland_selection_timing.copy_retry_delay': 'Delay before trying fallback copy shortcut.',
-    'wayland_selection_timing.paste_delay': 'After writing clipboard before Ctrl+V.',
-    'wayland_selection_timing.restore_delay': 'After Ctrl+V before restoring clipboard.',
+    'wayland_selection_timing.paste_delay': 'After writing clipboard before Ctrl+V; with wl-copy --paste-once, maximum wait for it to own the clipboard.',
+    'wayland_selection_timing.restore_delay': 'After Ctrl+V before restoring clipboard, when paste completion is not observable.',
+    'wayland_selection_timing.paste_timeout': 'Maximum wait for the target app to read the paste-once clipboard after Ctrl+V.',
     'wayland_selection_timing.expand_selection_delay': 'After Ctrl+Shift+Left before reading selection.',
 }
 
@@ -321,6 +327,15 @@ def validate_config(conf: dict | None) -> dict:
         )
     out['wayland_selection_strategy'] = wss
 
+    # grab_input_during_conversion — boolean
+    gic = conf.get(
+        'grab_input_during_conversion',
+        defaults['grab_input_during_conversion'],
+    )
+    if not isinstance(gic, bool):
+        raise ValueError("Invalid 'grab_input_during_conversion': must be boolean")
+    out['grab_input_during_conversion'] = gic
+
     out['timing'] = _validate_timing_table(
         conf,
         'timing',
@@ -5,6 +5,8 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from lswitch.core.platform_snapshot import PlatformSnapshot
+
 if TYPE_CHECKING:
     from lswitch.core.states import StateContext
     from lswitch.platform.xkb_adapter import IXKBAdapter
@@ -71,10 +73,21 @@ class ConversionEngine:
         )
         return "selection_expand"
 
-    def convert(self, context: "StateContext", selection_valid: bool = False) -> bool:
-        """Perform conversion. Returns True on success."""
+    def convert(
+        self,
+        context: "StateContext",
+        selection_valid: bool = False,
+        snapshot: PlatformSnapshot | None = None,
+    ) -> bool:
+        """Perform conversion. Returns True on success.
+
+        *snapshot* carries platform state the caller already read for this
+        gesture; a fresh one is used when omitted.
+        """
         from lswitch.core.modes import RetypeMode, SelectionMode
 
+        if snapshot is None:
+            snapshot = PlatformSnapshot(self.xkb, self.selection)
         mode = self.choose_mode(context, selection_valid=selection_valid)
         logger.debug("Converting in mode: %s", mode)
         self.last_conversion = None
@@ -86,7 +99,7 @@ class ConversionEngine:
                 self.debug,
                 timing=self.timing,
             )
-            return retype.execute(context)
+            return retype.execute(context, snapshot)
         elif mode == "selection_expand":
             sel_mode = SelectionMode(
                 self.selection,
@@ -96,7 +109,7 @@ class ConversionEngine:
                 expand=True,
                 timing=self.timing,
             )
-            success = sel_mode.execute(context)
+            success = sel_mode.execute(context, snapshot)
             if success:
                 self._remember_selection_conversion(mode, sel_mode)
             return success
@@ -108,7 +121,7 @@ class ConversionEngine:
                 self.debug,
                 timing=self.timing,
             )
-            success = sel_mode.execute(context)
+            success = sel_mode.execute(context, snapshot)
             if success:
                 self._remember_selection_conversion(mode, sel_mode)
             return success
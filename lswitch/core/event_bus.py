@@ -12,25 +12,32 @@ logger = logging.getLogger(__name__)
 
 
 class EventBus:
-    """Lightweight synchronous pub/sub bus."""
+    """Lightweight synchronous pub/sub bus.
+
+    Handlers are kept in immutable tuples that are rebuilt on
+    (un)subscribe, so :meth:`publish` iterates them without copying and a
+    handler may safely (un)subscribe while an event is being dispatched.
+    """
 
     def __init__(self):
-        self._handlers: dict[EventType, list[Callable[[Event], None]]] = defaultdict(list)
+        self._handlers: dict[EventType, tuple[Callable[[Event], None], ...]] = defaultdict(tuple)
 
     def subscribe(self, event_type: EventType, handler: Callable[[Event], None]) -> None:
         """Register a handler for an event type."""
-        self._handlers[event_type].append(handler)
+        self._handlers[event_type] += (handler,)
 
     def unsubscribe(self, event_type: EventType, handler: Callable[[Event], None]) -> None:
         """Remove a previously registered handler."""
+        handlers = list(self._handlers.get(event_type, ()))
         try:
-            self._handlers[event_type].remove(handler)
+            handlers.remove(handler)
         except ValueError:
-            pass
+            return
+        self._handlers[event_type] = tuple(handlers)
 
     def publish(self, event: Event) -> None:
         """Dispatch event to all registered handlers synchronously."""
-        for handler in list(self._handlers.get(event.type, [])):
+        for handler in self._handlers.get(event.type, ()):
             try:
                 handler(event)
             except Exception:
@@ -23,6 +23,7 @@ KEY_ESC = 1
 
 NAVIGATION_KEYS = {103, 108, 105, 106, 102, 107, 104, 109, 15}  # arrows, home, end, pgup, pgdn, tab
 MOUSE_BUTTONS = {272, 273, 274}  # BTN_LEFT, BTN_RIGHT, BTN_MIDDLE
+BTN_LEFT = 272
 
 # Modifier and control keys that must never enter the event buffer
 MODIFIER_KEYS = {
@@ -36,12 +37,58 @@ MODIFIER_KEYS = {
     59, 60, 61, 62, 63, 64, 65, 66, 67, 68, 87, 88,
 }
 
-# EV_KEY type constant (used when evdev is not importable)
+_VALUE_NAMES = {0: 'release', 1: 'press', 2: 'repeat'}
+
+# Event type constants (used when evdev is not importable)
 EV_KEY = 1
+EV_REL = 2
+EV_ABS = 3
+
+# Pointer gestures: motion events between press and release that make a
+# drag, and the longest gap between presses of a double/triple click.
+DRAG_MOTION_EVENTS = 4
+MULTI_CLICK_INTERVAL = 0.5
+
+# Kernel stamps older than this are not trusted (realtime clock, bogus
+# replayed events); the event is stamped with time.monotonic() instead.
+MAX_EVENT_AGE = 60.0
+
+
+def event_time(event, now: float) -> float:
+    """Return the kernel timestamp of *event* on the ``time.monotonic()`` scale.
+
+    DeviceManager switches devices to CLOCK_MONOTONIC, so ``sec``/``usec``
+    can be compared with *now* directly. Events without a usable stamp
+    (synthetic events, devices left on CLOCK_REALTIME) get *now*.
+    """
+    sec = getattr(event, "sec", None)
+    if sec is None:
+        return now
+    stamp = sec + getattr(event, "usec", 0) / 1_000_000
+    if 0.0 <= now - stamp < MAX_EVENT_AGE:
+        return stamp
+    return now
 
 
 class EventManager:
-    """Receives raw evdev events and dispatches typed events to EventBus."""
+    """Receives raw evdev events and dispatches typed events to EventBus.
+
+    Key and mouse events are published through one preallocated
+    :class:`Event`/:class:`KeyEventData` pair per event type that is
+    overwritten for every raw event, so the hot path allocates nothing.
+    Handlers must copy whatever they need to keep beyond the ``publish``
+    call (``StateContext.event_buffer`` already stores fields, not
+    objects). A handler that feeds raw events back in gets fresh objects.
+
+    ``KeyEventData.timestamp`` carries the kernel event time (see
+    :func:`event_time`), so gesture timing does not depend on how late the
+    handler runs; ``Event.timestamp`` stays wall-clock for display.
+
+    Mouse buttons also feed a small pointer-gesture tracker: motion events
+    between press and release are counted (not interpreted) and press
+    spacing gives the click count, so :meth:`pointer_may_select` can tell
+    a drag or double click from a plain click.
+    """
 
     def __init__(self, event_bus: EventBus, debug: bool = False):
         self.bus = event_bus
@@ -49,40 +96,129 @@ class EventManager:
         try:
             from evdev import ecodes
             self._ev_key = ecodes.EV_KEY
+            self._ev_motion = (ecodes.EV_REL, ecodes.EV_ABS)
         except Exception:
             self._ev_key = EV_KEY
+            self._ev_motion = (EV_REL, EV_ABS)
+        # value (0=release, 1=press, 2=repeat) -> reusable Event
+        self._key_events = {
+            1: self._reusable_event(EventType.KEY_PRESS),
+            0: self._reusable_event(EventType.KEY_RELEASE),
+            2: self._reusable_event(EventType.KEY_REPEAT),
+        }
+        self._mouse_events = {
+            1: self._reusable_event(EventType.MOUSE_CLICK),
+            0: self._reusable_event(EventType.MOUSE_RELEASE),
+        }
+        self._depth = 0
+        # Pointer gesture since the last first-button press
+        self._buttons_down = 0
+        self._shifts_down: set[int] = set()
+        self._gesture_button: int | None = None
+        self._gesture_shift = False
+        self._press_time = 0.0
+        self.pointer_motion = 0
+        self.click_count = 0
+
+    @staticmethod
+    def _reusable_event(event_type: EventType) -> Event:
+        return Event(event_type, KeyEventData(code=0, value=0), 0.0)
 
     def handle_raw_event(self, event, device_name: str = "") -> None:
         """Process a single evdev input event.
 
         Publishes KEY_PRESS / KEY_RELEASE / KEY_REPEAT for EV_KEY events and
-        MOUSE_CLICK for mouse button presses.
+        MOUSE_CLICK / MOUSE_RELEASE for mouse buttons.
         """
-        event_type = getattr(event, "type", None)
-        if event_type != self._ev_key:
+        ev_type = getattr(event, "type", None)
+        if ev_type != self._ev_key:
+            if self._buttons_down and ev_type in self._ev_motion:
+                self.pointer_motion += 1
             return
 
         code = event.code
         value = event.value  # 0=release, 1=press, 2=repeat
 
         if self.debug:
-            val_name = {0: 'release', 1: 'press', 2: 'repeat'}.get(value, str(value))
-            logger.trace("RawEvent: dev=%s code=%d (%s)", device_name, code, val_name)  # type: ignore[attr-defined]
+            logger.trace(  # type: ignore[attr-defined]
+                "RawEvent: dev=%s code=%d (%s)", device_name, code, _VALUE_NAMES.get(value, value),
+            )
 
         # Mouse button → MOUSE_CLICK on press, MOUSE_RELEASE on release
-        if code in MOUSE_BUTTONS:
-            if value == 1:
-                self.bus.publish(Event(EventType.MOUSE_CLICK, KeyEventData(code=code, value=value, device_name=device_name), time.time()))
-            elif value == 0:
-                self.bus.publish(Event(EventType.MOUSE_RELEASE, KeyEventData(code=code, value=value, device_name=device_name), time.time()))
+        out = (self._mouse_events if code in MOUSE_BUTTONS else self._key_events).get(value)
+        if out is None:
             return
 
-        data = KeyEventData(code=code, value=value, device_name=device_name)
-        ts = time.time()
+        stamp = event_time(event, time.monotonic())
+        if code in MOUSE_BUTTONS:
+            self._track_button(code, value, stamp)
+        elif code in SHIFT_KEYS:
+            if value:
+                self._shifts_down.add(code)
+            else:
+                self._shifts_down.discard(code)
+
+        if self._depth:
+            # Re-entered from a handler: the shared object is still in use.
+            out = Event(
+                out.type, KeyEventData(code, value, device_name, timestamp=stamp), time.time(),
+            )
+        else:
+            data = out.data
+            data.code = code
+            data.value = value
+            data.device_name = device_name
+            data.shifted = False
+            data.timestamp = stamp
+            out.timestamp = time.time()
+
+        self._depth += 1
+        try:
+            self.bus.publish(out)
+        finally:
+            self._depth -= 1
 
-        if value == 1:
-            self.bus.publish(Event(EventType.KEY_PRESS, data, ts))
-        elif value == 0:
-            self.bus.publish(Event(EventType.KEY_RELEASE, data, ts))
-        elif value == 2:
-            self.bus.publish(Event(EventType.KEY_REPEAT, data, ts))
+    # ------------------------------------------------------------------
+    # Pointer gestures
+    # ------------------------------------------------------------------
+
+    def _track_button(self, code: int, value: int, stamp: float) -> None:
+        if not value:
+            self._buttons_down = max(0, self._buttons_down - 1)
+            return
+        self._buttons_down += 1
+        if self._buttons_down > 1:
+            return      # chord: still the gesture of the first button
+        if (
+            code == self._gesture_button
+            and stamp - self._press_time <= MULTI_CLICK_INTERVAL
+            and self.pointer_motion < DRAG_MOTION_EVENTS
+        ):
+            self.click_count += 1
+        else:
+            self.click_count = 1
+        self._gesture_button = code
+        self._gesture_shift = bool(self._shifts_down)
+        self._press_time = stamp
+        self.pointer_motion = 0
+
+    def pointer_may_select(self) -> bool | None:
+        """Whether the current (or last) button gesture could select text.
+
+        A left-button drag, a double/triple click or a Shift+click can; a
+        plain click and right/middle clicks cannot. Returns None until a
+        press has been seen, and while a single left press is held (it may
+        still turn into a drag), so callers fall back to reading the
+        selection.
+        """
+        if self._gesture_button is None:
+            return None
+        if self._gesture_button != BTN_LEFT:
+            return False
+        if (
+            self.click_count > 1
+            or self._gesture_shift
+            or self.pointer_motion >= DRAG_MOTION_EVENTS
+        ):
+            return True
+        return None if self._buttons_down else False
@@ -28,20 +28,25 @@ class EventType(Enum):
     # App lifecycle
     APP_QUIT = auto()
 
+    # Members are singletons: identity hashing keeps EventBus lookups off
+    # Enum.__hash__, which hashes the member name on every publish.
+    __hash__ = object.__hash__
 
-@dataclass
+
+@dataclass(slots=True)
 class Event:
     type: EventType
     data: Any
     timestamp: float
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyEventData:
     code: int
     value: int          # 0=release, 1=press, 2=repeat
     device_name: str = ""
     shifted: bool = False   # True if Shift was held when this key was pressed
+    timestamp: float = 0.0  # kernel event time, time.monotonic() scale; 0.0 = unknown
 
 
 @dataclass
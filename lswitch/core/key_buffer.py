@@ -0,0 +1,203 @@
+"""KeyBuffer — bounded, array-backed buffer of typed key presses.
+
+Replaces the unbounded ``list[KeyEventData]`` in :class:`StateContext`.
+Keycodes live in a preallocated ``array('H')`` ring, per-slot flags in a
+``bytearray``, so memory stays constant however long the user types
+without a navigation key or mouse click. Positions of word-boundary keys
+are indexed as keys arrive, so the last word (or last N words) is found
+in O(word length) instead of rescanning the whole buffer on every Space.
+
+The buffer behaves like a list of :class:`KeyEventData`: items are
+materialised on access and carry ``code``, ``value`` and ``shifted``.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Iterable, Iterator
+
+from lswitch.core.event_manager import KEY_BACKSPACE, KEY_ENTER, KEY_ESC, KEY_SPACE, KEY_TAB
+from lswitch.core.events import KeyEventData
+
+# Keys that end a word when scanning backwards from the cursor.
+WORD_BOUNDARY_KEYS = frozenset({KEY_SPACE, KEY_ENTER, KEY_TAB, KEY_ESC, KEY_BACKSPACE})
+
+_SHIFTED = 0x01
+_RELEASE = 0x02     # value == 0; typed input only ever stores presses
+
+
+class KeyBuffer:
+    """Ring buffer of key presses with an incremental word-boundary index."""
+
+    __slots__ = ("capacity", "_codes", "_flags", "_start", "_end", "_boundaries")
+
+    def __init__(self, events: Iterable = (), capacity: int = 512):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._codes = array("H", bytes(2 * capacity))
+        self._flags = bytearray(capacity)
+        # Absolute positions: slot = position % capacity.
+        self._start = 0
+        self._end = 0
+        # Absolute positions of boundary keys, ascending.
+        self._boundaries: deque[int] = deque()
+        for ev in events:
+            self.append(ev)
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def append(self, event) -> None:
+        """Store *event* (anything with ``code``/``value``/``shifted``)."""
+        self.push(
+            event.code,
+            bool(getattr(event, "shifted", False)),
+            getattr(event, "value", 1),
+        )
+
+    def push(self, code: int, shifted: bool = False, value: int = 1) -> None:
+        """Store a key by its fields; drops the oldest key when full."""
+        pos = self._end
+        if pos - self._start == self.capacity:
+            self._start += 1
+            boundaries = self._boundaries
+            if boundaries and boundaries[0] < self._start:
+                boundaries.popleft()
+        slot = pos % self.capacity
+        self._codes[slot] = code
+        self._flags[slot] = (_SHIFTED if shifted else 0) | (_RELEASE if value == 0 else 0)
+        self._end = pos + 1
+        if code in WORD_BOUNDARY_KEYS:
+            self._boundaries.append(pos)
+
+    def pop(self) -> KeyEventData:
+        """Remove and return the newest key."""
+        if self._end == self._start:
+            raise IndexError("pop from empty KeyBuffer")
+        self._end -= 1
+        pos = self._end
+        boundaries = self._boundaries
+        if boundaries and boundaries[-1] == pos:
+            boundaries.pop()
+        return self._event_at(pos)
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+        self._boundaries.clear()
+
+    def replace(self, events: Iterable) -> None:
+        """Replace the contents with *events* (oldest first)."""
+        self.clear()
+        for ev in events:
+            self.append(ev)
+
+    # ------------------------------------------------------------------
+    # Word index
+    # ------------------------------------------------------------------
+
+    def last_word_span(self) -> tuple[int, int]:
+        """Return ``(start, stop)`` offsets of the last word.
+
+        Trailing boundary keys are skipped; the word ends just before them
+        and starts after the previous boundary (or at the buffer start).
+        Offsets are relative to the oldest stored key and usable as a slice.
+        """
+        return self.last_words_span(1)
+
+    def last_words_span(self, n: int) -> tuple[int, int]:
+        """Return ``(start, stop)`` offsets covering the last *n* words.
+
+        Boundaries between the words are included; trailing ones are not.
+        """
+        boundaries = self._boundaries
+        i = len(boundaries) - 1
+        stop = self._end
+        while i >= 0 and boundaries[i] == stop - 1:
+            stop -= 1
+            i -= 1
+        start = stop
+        for k in range(n):
+            if k:
+                # Take in the boundary run before the word collected last.
+                while i >= 0 and boundaries[i] == start - 1:
+                    start -= 1
+                    i -= 1
+            if i < 0:
+                start = self._start
+                break
+            start = boundaries[i] + 1
+        return start - self._start, stop - self._start
+
+    def trailing_boundaries(self) -> int:
+        """Number of boundary keys at the end of the buffer."""
+        boundaries = self._boundaries
+        count = 0
+        pos = self._end - 1
+        i = len(boundaries) - 1
+        while i >= 0 and boundaries[i] == pos:
+            count += 1
+            pos -= 1
+            i -= 1
+        return count
+
+    def last_word(self) -> list[KeyEventData]:
+        """Key presses of the last word, oldest first."""
+        start, stop = self.last_word_span()
+        return self[start:stop]
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+
+    def _event_at(self, pos: int) -> KeyEventData:
+        slot = pos % self.capacity
+        flags = self._flags[slot]
+        return KeyEventData(
+            code=self._codes[slot],
+            value=0 if flags & _RELEASE else 1,
+            shifted=bool(flags & _SHIFTED),
+        )
+
+    def code_at(self, index: int) -> int:
+        """Keycode at *index* without materialising an event."""
+        return self._codes[self._position(index) % self.capacity]
+
+    def _position(self, index: int) -> int:
+        size = self._end - self._start
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("KeyBuffer index out of range")
+        return self._start + index
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __bool__(self) -> bool:
+        return self._end != self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._event_at(self._start + i) for i in range(*index.indices(len(self)))]
+        return self._event_at(self._position(index))
+
+    def __iter__(self) -> Iterator[KeyEventData]:
+        for pos in range(self._start, self._end):
+            yield self._event_at(pos)
+
+    def __reversed__(self) -> Iterator[KeyEventData]:
+        for pos in range(self._end - 1, self._start - 1, -1):
+            yield self._event_at(pos)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (KeyBuffer, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"KeyBuffer({[e.code for e in self]!r}, capacity={self.capacity})"
@@ -0,0 +1,83 @@
+"""LayoutRegistry — language ↔ layout resolution shared by all conversion paths.
+
+Every backend describes layouts with the same :class:`LayoutInfo`, but
+names differ (``en``/``us``/``English (US)``, ``ru``/``ru(phonetic)``).
+The registry classifies each layout once and keeps a ``lang → LayoutInfo``
+index, so :meth:`LayoutRegistry.for_lang` is a dict lookup.
+
+The index is tied to the list object returned by ``get_layouts()``.
+Adapters cache that list and drop it when the keymap or the configured
+layouts change (XKB notifications, Cinnamon/KDE signals), so a new list
+object is what triggers a rebuild; no separate invalidation hook is needed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence
+
+if TYPE_CHECKING:
+    from lswitch.platform.xkb_adapter import IXKBAdapter, LayoutInfo
+
+_RU_NAMES = frozenset({"russian", "россия"})
+_EN_NAMES = frozenset({"en", "us", "english"})
+
+
+def lang_of(layout: "LayoutInfo | None") -> str:
+    """Language code of *layout*: ``en``, ``ru`` or the layout's own name."""
+    if layout is None:
+        return "en"
+    name = (getattr(layout, "name", "") or "").lower()
+    xkb_name = (getattr(layout, "xkb_name", "") or "").lower()
+    if name.startswith("ru") or xkb_name.startswith("ru") or name in _RU_NAMES:
+        return "ru"
+    if name in _EN_NAMES or name.startswith("en") or xkb_name.split("(")[0] == "us":
+        return "en"
+    return name or xkb_name
+
+
+class LayoutRegistry:
+    """Precomputed language → layout index over an adapter's layout list."""
+
+    def __init__(self, xkb: "IXKBAdapter | None" = None):
+        self.xkb = xkb
+        self._source: Optional[Sequence["LayoutInfo"]] = None
+        self._by_lang: dict[str, "LayoutInfo"] = {}
+
+    def index(self, layouts: Sequence["LayoutInfo"]) -> None:
+        """Rebuild the index unless *layouts* is the list already indexed."""
+        if layouts is self._source:
+            return
+        by_lang: dict[str, "LayoutInfo"] = {}
+        for layout in layouts:
+            by_lang.setdefault(lang_of(layout), layout)
+        for layout in layouts:      # exact names as aliases, e.g. "us", "de"
+            for alias in (layout.name, layout.xkb_name):
+                if alias:
+                    by_lang.setdefault(alias.lower(), layout)
+        self._by_lang = by_lang
+        self._source = layouts
+
+    def layouts(self) -> Sequence["LayoutInfo"]:
+        layouts = self.xkb.get_layouts() if self.xkb is not None else []
+        self.index(layouts)
+        return layouts
+
+    def for_lang(
+        self,
+        lang: str | None,
+        layouts: Sequence["LayoutInfo"] | None = None,
+    ) -> "LayoutInfo | None":
+        """Layout to type *lang* in, or None.
+
+        *layouts* is the caller's already-fetched list; otherwise the
+        adapter's is used.
+        """
+        if not lang:
+            return None
+        if layouts is None:
+            self.layouts()
+        else:
+            self.index(layouts)
+        return self._by_lang.get(lang.lower())
+
+    lang_of = staticmethod(lang_of)
@@ -7,6 +7,9 @@ import time
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+from lswitch.core.platform_snapshot import PlatformSnapshot
+from lswitch.log import lazy
+
 if TYPE_CHECKING:
     from lswitch.core.states import StateContext
     from lswitch.input.virtual_keyboard import VirtualKeyboard
@@ -23,6 +26,10 @@ SHIFT_KEYS = {KEY_LEFTSHIFT, KEY_RIGHTSHIFT}
 KEY_BACKSPACE = 14
 
 
+def _event_codes(events) -> list:
+    return [getattr(e, 'code', '?') for e in events]
+
+
 class _SyntheticEvent:
     """Minimal event-like object for VirtualKeyboard.replay_events()."""
     __slots__ = ("code", "value")
@@ -34,8 +41,16 @@ class _SyntheticEvent:
 
 class BaseMode(ABC):
     @abstractmethod
-    def execute(self, context: "StateContext") -> bool:
-        """Execute the conversion. Returns True on success."""
+    def execute(
+        self,
+        context: "StateContext",
+        snapshot: PlatformSnapshot | None = None,
+    ) -> bool:
+        """Execute the conversion. Returns True on success.
+
+        Platform reads and layout switches go through *snapshot* (a fresh
+        one when omitted) so each value is fetched once per conversion.
+        """
 
 
 class RetypeMode(BaseMode):
@@ -64,7 +79,13 @@ class RetypeMode(BaseMode):
             timing.get("retype_before_replay_delay", 0.05)
         )
 
-    def execute(self, context: "StateContext") -> bool:
+    def execute(
+        self,
+        context: "StateContext",
+        snapshot: PlatformSnapshot | None = None,
+    ) -> bool:
+        if snapshot is None:
+            snapshot = PlatformSnapshot(self.xkb)
         if context.chars_in_buffer <= 0:
             logger.debug("RetypeMode: skip — chars_in_buffer=%d", context.chars_in_buffer)
             return False
@@ -78,7 +99,7 @@ class RetypeMode(BaseMode):
                 "RetypeMode: start — chars=%d, buffer_events=%d, event_codes=%s",
                 n_chars,
                 len(saved_events),
-                [getattr(e, 'code', '?') for e in saved_events],
+                lazy(_event_codes, saved_events),
             )
 
         # 1. Delete typed characters
@@ -91,7 +112,7 @@ class RetypeMode(BaseMode):
         # (after replay) and switch back — that's a separate desktop keyboard
         # shortcut users should disable in keyboard preferences.
         try:
-            new_layout = self.xkb.switch_layout()
+            new_layout = snapshot.switch_layout()
             logger.debug("RetypeMode: switched layout → %s", getattr(new_layout, 'name', new_layout))
         except Exception as exc:
             logger.error("RetypeMode: switch_layout failed: %s", exc)
@@ -109,7 +130,7 @@ class RetypeMode(BaseMode):
             logger.debug(
                 "RetypeMode: replaying %d events (codes=%s)",
                 len(saved_events),
-                [getattr(e, 'code', '?') for e in saved_events],
+                lazy(_event_codes, saved_events),
             )
         self.virtual_kb.replay_events(saved_events)
 
@@ -146,18 +167,28 @@ class SelectionMode(BaseMode):
             timing.get("direct_type_after_layout_switch_delay", 0.03)
         )
 
-    def execute(self, context: "StateContext") -> bool:
+    def execute(
+        self,
+        context: "StateContext",
+        snapshot: PlatformSnapshot | None = None,
+    ) -> bool:
         from lswitch.core.text_converter import invert_layout_runs
 
+        if snapshot is None:
+            snapshot = PlatformSnapshot(self.xkb, self.selection)
+
         self.last_original = ""
         self.last_converted = ""
         self.last_target_lang = None
 
         if self.expand or context.backspace_hold_active:
-            logger.debug(f"SelectionMode: expanding selection... (expand={self.expand}, backspace_hold={context.backspace_hold_active})")
-            sel = self.selection.expand_selection_to_word()
+            logger.debug(
+                "SelectionMode: expanding selection... (expand=%s, backspace_hold=%s)",
+                self.expand, context.backspace_hold_active,
+            )
+            sel = snapshot.expand_selection_to_word()
         else:
-            sel = self.selection.get_selection()
+            sel = snapshot.get_selection()
 
         if not sel.text:
             return False
@@ -170,8 +201,7 @@ class SelectionMode(BaseMode):
         target_langs = [lang for _text, lang in converted_runs if lang]
         final_target_lang = target_langs[-1] if target_langs else None
 
-        layouts = self.xkb.get_layouts()
-        target_layout = self._find_layout_for_lang(layouts, final_target_lang)
+        target_layout = snapshot.layout_for_lang(final_target_lang)
 
         direct_replacement = None
         if getattr(type(self.selection), "prefers_direct_replacement", None) is not None:
@@ -186,21 +216,21 @@ class SelectionMode(BaseMode):
                 return False
             fallback_lang = final_target_lang or "en"
             for run_text, run_lang in converted_runs:
-                layout = self._find_layout_for_lang(layouts, run_lang or fallback_lang)
+                layout = snapshot.layout_for_lang(run_lang or fallback_lang)
                 if layout is None:
                     logger.debug(
                         "SelectionMode: direct replacement skipped, no target layout for %s",
                         run_lang or fallback_lang,
                     )
                     return False
-                self.xkb.switch_layout(target=layout)
+                snapshot.switch_layout(target=layout)
                 time.sleep(self.direct_type_after_layout_switch_delay)
                 if not replace_by_typing(run_text, layout_name=layout.name):
                     return False
         else:
-            if not self.selection.replace_selection(converted):
+            if not snapshot.replace_selection(converted):
                 return False
-            self.xkb.switch_layout(target=target_layout)  # None = cycle, which is ok as fallback
+            snapshot.switch_layout(target=target_layout)  # None = cycle, which is ok as fallback
 
         logger.debug(
             "SelectionMode: '%s' → '%s', target_langs=%s, switching to layout '%s'",
@@ -213,20 +243,3 @@ class SelectionMode(BaseMode):
         self.last_converted = converted
         self.last_target_lang = final_target_lang
         return True
-
-    @staticmethod
-    def _find_layout_for_lang(layouts, lang: str | None):
-        if not lang:
-            return None
-
-        wanted = lang.lower()
-        for layout in layouts:
-            name = getattr(layout, "name", "").lower()
-            xkb_name = getattr(layout, "xkb_name", "").lower()
-            if wanted == "en" and (name in {"en", "us"} or xkb_name == "us"):
-                return layout
-            if wanted == "ru" and (name == "ru" or xkb_name.startswith("ru")):
-                return layout
-            if name == wanted or xkb_name == wanted:
-                return layout
-        return None
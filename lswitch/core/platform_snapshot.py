@@ -0,0 +1,111 @@
+"""PlatformSnapshot — platform state read at most once per conversion.
+
+One Shift+Shift touches the platform from several places: user-dict
+learning, buffer trimming and the conversion mode all want the current
+layout, the layout list or the selection. On X11/Cinnamon/KDE each of
+those is an X round trip, a D-Bus call or a subprocess, so the snapshot
+reads each value lazily on first use and serves later lookups from the
+cache. Layout switches go through it as well, keeping the cached current
+layout correct.
+
+``calls`` counts real platform calls by name and ``hits`` the lookups
+served from the cache; :meth:`summary` formats both for the debug log.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Optional
+
+from lswitch.core.layout_registry import LayoutRegistry
+
+if TYPE_CHECKING:
+    from lswitch.platform.selection_adapter import ISelectionAdapter, SelectionInfo
+    from lswitch.platform.xkb_adapter import IXKBAdapter, LayoutInfo
+
+_UNSET = object()
+
+
+class PlatformSnapshot:
+    """Per-gesture cache in front of the layout and selection adapters."""
+
+    def __init__(
+        self,
+        xkb: "IXKBAdapter | None",
+        selection: "ISelectionAdapter | None" = None,
+        registry: LayoutRegistry | None = None,
+    ):
+        self.xkb = xkb
+        self.selection = selection
+        self.registry = registry if registry is not None else LayoutRegistry(xkb)
+        self.calls: Counter[str] = Counter()
+        self.hits = 0
+        self._current = _UNSET
+        self._layouts: Optional[list] = None
+        self._selection = None
+
+    def _call(self, name: str, func, *args, **kwargs):
+        self.calls[name] += 1
+        return func(*args, **kwargs)
+
+    # -- layouts -----------------------------------------------------------
+
+    def current_layout(self) -> "LayoutInfo | None":
+        if self.xkb is None:
+            return None
+        if self._current is _UNSET:
+            self._current = self._call("get_current_layout", self.xkb.get_current_layout)
+        else:
+            self.hits += 1
+        return self._current
+
+    def layouts(self) -> "list[LayoutInfo]":
+        if self.xkb is None:
+            return []
+        if self._layouts is None:
+            self._layouts = self._call("get_layouts", self.xkb.get_layouts)
+        else:
+            self.hits += 1
+        return self._layouts
+
+    def layout_for_lang(self, lang: str | None) -> "LayoutInfo | None":
+        """Resolve *lang* through the registry over the cached layout list."""
+        if not lang:
+            return None
+        return self.registry.for_lang(lang, self.layouts())
+
+    def switch_layout(self, *args, **kwargs) -> "LayoutInfo":
+        """``xkb.switch_layout(...)``, remembering the new current layout."""
+        new_layout = self._call("switch_layout", self.xkb.switch_layout, *args, **kwargs)
+        self._current = new_layout if new_layout is not None else _UNSET
+        return new_layout
+
+    # -- selection ---------------------------------------------------------
+
+    def get_selection(self) -> "SelectionInfo":
+        if self._selection is None:
+            self._selection = self._call("get_selection", self.selection.get_selection)
+        else:
+            self.hits += 1
+        return self._selection
+
+    def expand_selection_to_word(self) -> "SelectionInfo":
+        """Expand (always a platform action) and cache the result."""
+        self._selection = self._call(
+            "expand_selection_to_word", self.selection.expand_selection_to_word,
+        )
+        return self._selection
+
+    def replace_selection(self, text: str) -> bool:
+        self._selection = None      # the selection is gone once pasted over
+        return self._call("replace_selection", self.selection.replace_selection, text)
+
+    # -- reporting ---------------------------------------------------------
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def summary(self) -> str:
+        detail = ", ".join(f"{name}×{count}" for name, count in sorted(self.calls.items()))
+        return f"{self.total_calls} ({detail or '-'}), из кэша {self.hits}"
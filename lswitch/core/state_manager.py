@@ -47,14 +47,16 @@ class StateManager:
         self.context.shift_pressed = True
         self._transition("shift_down")
 
-    def on_shift_up(self) -> bool:
+    def on_shift_up(self, timestamp: float = 0.0) -> bool:
         """Returns True if double-shift was detected.
 
         Double-shift is measured as the time between the FIRST release and
         the SECOND release (not press→release, which is always fast).
+        *timestamp* is the release's kernel event time
+        (``KeyEventData.timestamp``); ``time.monotonic()`` when unknown.
         """
         self.context.shift_pressed = False
-        now = time.time()
+        now = timestamp or time.monotonic()
         delta = now - self.context.last_shift_time
         if self.context.last_shift_time > 0 and delta < self.double_click_timeout:
             self.context.last_shift_time = 0  # reset so next single Shift starts fresh
@@ -65,8 +67,8 @@ class StateManager:
             self._transition("shift_up_single")
             return False
 
-    def on_backspace_hold(self) -> None:
-        self.context.backspace_hold_at = time.time()
+    def on_backspace_hold(self, timestamp: float = 0.0) -> None:
+        self.context.backspace_hold_at = timestamp or time.monotonic()
         self.context.backspace_hold_active = True
         self._transition("backspace_hold")
 
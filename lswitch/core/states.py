@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
 
+from lswitch.core.key_buffer import KeyBuffer
+
 
 class State(Enum):
     IDLE = auto()
@@ -20,10 +22,10 @@ class StateContext:
 
     # Text and event buffers
     text_buffer: list[str] = field(default_factory=list)
-    event_buffer: list = field(default_factory=list)
+    event_buffer: KeyBuffer = field(default_factory=KeyBuffer)
     chars_in_buffer: int = 0
 
-    # Timing
+    # Timing (time.monotonic() scale, see KeyEventData.timestamp)
     last_shift_time: float = 0.0
     backspace_hold_at: float = 0.0
 
@@ -35,6 +37,12 @@ class StateContext:
     # Layout
     current_layout: str = "en"
 
+    def __setattr__(self, name, value) -> None:
+        # Keep event_buffer bounded even when a plain list is assigned.
+        if name == "event_buffer" and not isinstance(value, KeyBuffer):
+            value = KeyBuffer(value)
+        super().__setattr__(name, value)
+
     def reset(self) -> None:
         """Clear buffers and reset transient flags."""
         self.text_buffer.clear()
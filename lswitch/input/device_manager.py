@@ -5,9 +5,17 @@ Ported from archive/lswitch/device_manager.py (production-ready).
 
 from __future__ import annotations
 
+import ctypes
+import fcntl
+import os
 import selectors
+import struct
 import threading
 import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, Optional, Callable, Iterator, Any
 
 try:
@@ -24,23 +32,97 @@ from lswitch.input.device_filter import should_include_device
 
 logger = logging.getLogger(__name__)
 
+# EVIOCSMASK = _IOW('E', 0x93, struct input_mask); Linux >= 4.4
+EVIOCSMASK = 0x40104593
+_INPUT_MASK = struct.Struct("IIQ")   # type, codes_size, codes_ptr
+_EV_CNT = 0x20
+_KEY_CNT = 0x300
+# Pointer motion let through a mouse's mask while one of its buttons is
+# held: event type -> (code count, codes). REL_X/REL_Y for mice and
+# trackpoints, ABS_X/ABS_Y for touchpads.
+_MOTION_CODES = {0x02: (0x10, (0x00, 0x01)), 0x03: (0x40, (0x00, 0x01))}
+# EVIOCSCLOCKID = _IOW('E', 0xa0, int); Linux >= 3.4
+EVIOCSCLOCKID = 0x400445A0
+_CLOCK_MONOTONIC = 1
+
+
+class _Watch:
+    """Selector payload for a non-device fd served by :meth:`DeviceManager.get_events`."""
+
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: Callable[[], Any]):
+        self.callback = callback
+
 
 class DeviceManager:
-    """Manages physical evdev input devices with hot-plug support."""
+    """Manages physical evdev input devices with hot-plug support.
+
+    Each device gets an EVIOCSMASK filter so that only ``EV_KEY`` events
+    (for mice: only the buttons we handle) and the ``SYN_REPORT`` closing
+    them reach userspace. Mouse motion is let through only while a mouse
+    button is held, so that drags can be told from plain clicks; otherwise
+    it never wakes the read loop. Kernels without EVIOCSMASK simply deliver
+    everything, and :meth:`event_stats` shows how many non-key events still
+    got through.
+
+    Besides devices the selector can serve other fds (:meth:`add_watch`:
+    the udev netlink socket, a signalfd) and an eventfd that :meth:`wake`
+    signals, so a reader blocked in :meth:`get_events` without a timeout
+    returns immediately on shutdown.
+
+    With ``grab_during_conversion=True`` :meth:`isolated_input` takes an
+    exclusive EVIOCGRAB on the physical keyboards while a conversion injects
+    its own keys, so the user's next keystrokes cannot interleave with the
+    injected backspaces. Keystrokes that arrive meanwhile are re-injected in
+    order once the grab is released and then handed to :meth:`get_events`.
+
+    Devices are opened and classified on a small thread pool; the
+    capability verdict is cached per device fingerprint. Hot-plugged nodes
+    go through :meth:`add_device_async`, which retries with backoff instead
+    of sleeping on the loop thread.
+    """
+
+    PROBE_WORKERS = 4
+    PROBE_RETRY_DELAYS = (0.02, 0.05, 0.1, 0.2, 0.4)   # seconds, ~0.8 s total
 
     def __init__(
         self,
         debug: bool = False,
         on_device_added: Optional[Callable] = None,
         on_device_removed: Optional[Callable] = None,
+        grab_during_conversion: bool = False,
     ):
         self.debug = debug
         self.devices: Dict[str, Any] = {}
         self.selector = selectors.DefaultSelector()
         self.on_device_added = on_device_added
         self.on_device_removed = on_device_removed
+        self.grab_during_conversion = grab_during_conversion
         self._lock = threading.Lock()
         self._virtual_kb_name: Optional[str] = None
+        self._keyboards: set[str] = set()
+        # path -> wall-clock time just before EVIOCGRAB
+        self._grabbed: Dict[str, float] = {}
+        # (device, event) pairs drained from grabbed devices, not yet yielded
+        self._pending: deque[tuple] = deque()
+        # key transitions read by get_events() from grabbed devices
+        self._captured: list[tuple[int, int]] = []
+        # paths whose EVIOCSMASK filter is active
+        self._masked: set[str] = set()
+        # paths whose event timestamps use CLOCK_MONOTONIC
+        self._monotonic: set[str] = set()
+        self._delivered_key = 0
+        self._delivered_syn = 0
+        self._delivered_other = 0
+        # mouse buttons currently held (reader thread only)
+        self._buttons_held = 0
+        self._wake_fd = self._open_wake_fd()
+        # Device probing (startup scan and hot-plug)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._fingerprints: Dict[tuple, tuple[bool, bool]] = {}
+        self._probing: set[str] = set()
+        self._probe_generation: Dict[str, int] = {}
 
     # ------------------------------------------------------------------
     # Public helpers
@@ -50,6 +132,43 @@ class DeviceManager:
         """Set the virtual keyboard name so it's excluded from scanning."""
         self._virtual_kb_name = name
 
+    def _open_wake_fd(self) -> Optional[int]:
+        try:
+            fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        except (AttributeError, OSError) as exc:  # pragma: no cover - non-Linux
+            logger.debug("eventfd unavailable: %s", exc)
+            return None
+        self.selector.register(fd, selectors.EVENT_READ, _Watch(self._drain_wake))
+        return fd
+
+    def _drain_wake(self) -> None:
+        try:
+            os.eventfd_read(self._wake_fd)
+        except (BlockingIOError, OSError, TypeError):
+            pass
+
+    def wake(self) -> None:
+        """Make a blocked :meth:`get_events` return now. Thread-safe."""
+        if self._wake_fd is None:
+            return
+        try:
+            os.eventfd_write(self._wake_fd, 1)
+        except OSError:
+            pass
+
+    def add_watch(self, fileobj: Any, callback: Callable[[], Any]) -> None:
+        """Call *callback* from :meth:`get_events` whenever *fileobj* is readable."""
+        with self._lock:
+            self.selector.register(fileobj, selectors.EVENT_READ, _Watch(callback))
+        self.wake()   # a blocked select() must pick up the new fd
+
+    def remove_watch(self, fileobj: Any) -> None:
+        with self._lock:
+            try:
+                self.selector.unregister(fileobj)
+            except (KeyError, ValueError):
+                pass
+
     @property
     def device_count(self) -> int:
         """Number of currently tracked devices."""
@@ -62,6 +181,9 @@ class DeviceManager:
     def scan_devices(self) -> int:
         """Scan ``/dev/input/`` and register suitable devices.
 
+        Devices are opened and probed concurrently on a small thread pool;
+        registration happens afterwards in ``list_devices()`` order.
+
         Returns:
             Number of newly registered devices.
         """
@@ -69,67 +191,284 @@ class DeviceManager:
             logger.warning("evdev not available — cannot scan devices")
             return 0
 
+        paths = [path for path in evdev.list_devices() if path not in self.devices]
+        if not paths:
+            return 0
+        if len(paths) == 1:
+            probed = [self._probe(paths[0])]
+        else:
+            probed = list(self._probe_pool().map(self._probe, paths))
+
         count = 0
-        for path in evdev.list_devices():
-            if self._try_add_device(path):
+        for path, result in zip(paths, probed):
+            if result is not None and self._register(path, *result):
                 count += 1
         return count
 
-    def _is_suitable_device(self, device: Any) -> bool:
-        """Return True if *device* should be monitored."""
+    def add_device_async(self, path: str) -> None:
+        """Probe and register a hot-plugged device in the background.
+
+        Repeated "add" notifications for a path that is already being
+        probed are coalesced. A node that cannot be opened yet (udev has not
+        applied permissions, or the node is not there) is retried with
+        exponential backoff, up to :attr:`PROBE_RETRY_DELAYS`.
+        """
+        with self._lock:
+            if path in self.devices or path in self._probing:
+                return
+            generation = self._probe_generation.get(path, 0) + 1
+            self._probe_generation[path] = generation
+            self._probing.add(path)
+        try:
+            self._probe_pool().submit(self._probe_with_retry, path, generation)
+        except RuntimeError:  # pool already shut down
+            with self._lock:
+                self._probing.discard(path)
+
+    def _probe_with_retry(self, path: str, generation: int) -> bool:
+        try:
+            for delay in (0.0, *self.PROBE_RETRY_DELAYS):
+                if delay:
+                    time.sleep(delay)
+                if self._probe_generation.get(path) != generation:
+                    return False    # removed or re-added meanwhile
+                try:
+                    result = self._probe(path, raise_errors=True)
+                except (OSError, PermissionError) as exc:
+                    logger.debug("Probe %s failed (%s), retrying", path, exc)
+                    continue
+                if result is None:
+                    return False
+                if self._probe_generation.get(path) != generation:
+                    result[0].close()
+                    return False
+                return self._register(path, *result)
+            if self.debug:
+                logger.warning("Cannot add %s: gave up after retries", path)
+            return False
+        finally:
+            with self._lock:
+                self._probing.discard(path)
+
+    def _probe_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.PROBE_WORKERS, thread_name_prefix="lswitch-probe",
+                )
+            return self._executor
+
+    def _probe(self, path: str, raise_errors: bool = False) -> Optional[tuple[Any, bool]]:
+        """Open *path* and classify it. Runs without the manager lock.
+
+        Returns:
+            ``(device, is_keyboard)`` for a device worth monitoring, else None.
+        """
+        try:
+            device = evdev.InputDevice(path)
+        except (OSError, PermissionError) as exc:
+            if raise_errors:
+                raise
+            if self.debug:
+                logger.warning("Cannot add %s: %s", path, exc)
+            return None
+        try:
+            suitable, is_keyboard = self._classify(device)
+        except (OSError, PermissionError) as exc:
+            suitable = False
+            if self.debug:
+                logger.warning("Cannot probe %s: %s", path, exc)
+        if not suitable:
+            device.close()
+            return None
+        return device, is_keyboard
+
+    @staticmethod
+    def _fingerprint(device: Any) -> Optional[tuple]:
+        info = getattr(device, "info", None)
+        if info is None:
+            return None
+        try:
+            return (
+                info.bustype, info.vendor, info.product, info.version,
+                device.name, getattr(device, "phys", ""),
+            )
+        except AttributeError:
+            return None
+
+    def _classify(self, device: Any) -> tuple[bool, bool]:
+        """Return ``(suitable, is_keyboard)`` for *device*.
+
+        Name-based filters are always applied; the capability verdict is
+        cached per fingerprint (bus/vendor/product/version/name/phys), so a
+        re-plugged known device is admitted without ``capabilities()``.
+        """
         # Exclude our own virtual keyboard
         if self._virtual_kb_name and self._virtual_kb_name in device.name:
-            return False
+            return False, False
 
         # Exclude known virtual / unwanted devices via device_filter
         if not should_include_device(device.name):
-            return False
-
-        caps = device.capabilities()
-        if ecodes.EV_KEY not in caps:
-            return False
+            return False, False
 
-        keys = caps.get(ecodes.EV_KEY, [])
+        fingerprint = self._fingerprint(device)
+        cached = self._fingerprints.get(fingerprint) if fingerprint is not None else None
+        if cached is not None:
+            return cached
 
-        is_keyboard = ecodes.KEY_A in keys
-        is_mouse = ecodes.BTN_LEFT in keys or ecodes.BTN_RIGHT in keys
+        caps = device.capabilities()
+        keys = caps.get(ecodes.EV_KEY) if ecodes.EV_KEY in caps else None
+        if keys is None:
+            verdict = (False, False)
+        else:
+            is_keyboard = ecodes.KEY_A in keys
+            is_mouse = ecodes.BTN_LEFT in keys or ecodes.BTN_RIGHT in keys
+            verdict = (is_keyboard or is_mouse, is_keyboard)
+        if fingerprint is not None:
+            self._fingerprints[fingerprint] = verdict
+        return verdict
 
-        return is_keyboard or is_mouse
+    def _is_suitable_device(self, device: Any) -> bool:
+        """Return True if *device* should be monitored."""
+        return self._classify(device)[0]
 
     def _try_add_device(self, path: str) -> bool:
-        """Try to open and register device at *path*.
+        """Try to open and register device at *path* (synchronously).
 
         Returns:
             True if the device was successfully added.
         """
+        if path in self.devices:
+            return False
+        result = self._probe(path)
+        if result is None:
+            return False
+        return self._register(path, *result)
+
+    def _register(self, path: str, device: Any, is_keyboard: bool) -> bool:
         with self._lock:
             if path in self.devices:
+                device.close()
                 return False
-
             try:
-                device = evdev.InputDevice(path)
-                if not self._is_suitable_device(device):
-                    device.close()
-                    return False
-
-                self.devices[path] = device
                 self.selector.register(device, selectors.EVENT_READ)
-
+            except (OSError, ValueError, KeyError) as exc:
                 if self.debug:
-                    logger.info("Device added: %s (%s)", device.name, path)
+                    logger.warning("Cannot add %s: %s", path, exc)
+                device.close()
+                return False
+            self.devices[path] = device
+            if is_keyboard:
+                self._keyboards.add(path)
+            if self._apply_event_mask(device, is_keyboard):
+                self._masked.add(path)
+            if self._use_monotonic_clock(device):
+                self._monotonic.add(path)
 
-                if self.on_device_added:
-                    try:
-                        self.on_device_added(device)
-                    except Exception:
-                        pass
+            if self.debug:
+                logger.info("Device added: %s (%s)", device.name, path)
+
+            if self.on_device_added:
+                try:
+                    self.on_device_added(device)
+                except Exception:
+                    pass
+
+            return True
 
-                return True
+    @staticmethod
+    def _use_monotonic_clock(device: Any) -> bool:
+        """Switch *device* event timestamps to CLOCK_MONOTONIC.
 
-            except (OSError, PermissionError) as exc:
-                if self.debug:
-                    logger.warning("Cannot add %s: %s", path, exc)
-                return False
+        Gesture timing (double Shift, backspace hold) compares event
+        timestamps with ``time.monotonic()``; the default CLOCK_REALTIME
+        stamps would jump with NTP adjustments.
+        """
+        try:
+            fcntl.ioctl(int(device.fd), EVIOCSCLOCKID, struct.pack("i", _CLOCK_MONOTONIC))
+        except (AttributeError, TypeError, ValueError, OSError) as exc:
+            logger.debug(
+                "EVIOCSCLOCKID unavailable for %s: %s — realtime stamps",
+                getattr(device, "name", "?"), exc,
+            )
+            return False
+        return True
+
+    @staticmethod
+    def _apply_event_mask(device: Any, is_keyboard: bool, motion: bool = False) -> bool:
+        """Install an in-kernel event filter on *device*.
+
+        Keyboards get all key codes, mice only the buttons in
+        ``MOUSE_BUTTONS`` and, with *motion*, the pointer axes. Returns
+        False when the kernel does not support EVIOCSMASK (or the device
+        has no real fd); events then arrive unfiltered and are dropped in
+        userspace as before.
+        """
+        from lswitch.core.event_manager import MOUSE_BUTTONS
+
+        try:
+            fd = int(device.fd)
+        except (AttributeError, TypeError, ValueError):
+            return False
+
+        masks = []
+        types = (ctypes.c_ubyte * (_EV_CNT // 8))()
+        types[ecodes.EV_KEY // 8] |= 1 << (ecodes.EV_KEY % 8)
+        masks.append((0, types))     # type 0 (EV_SYN) selects event types
+        if not is_keyboard:
+            codes = (ctypes.c_ubyte * (_KEY_CNT // 8))()
+            for code in MOUSE_BUTTONS:
+                codes[code // 8] |= 1 << (code % 8)
+            masks.append((ecodes.EV_KEY, codes))
+            if motion:
+                for ev_type, (count, axes) in _MOTION_CODES.items():
+                    types[ev_type // 8] |= 1 << (ev_type % 8)
+                    bits = (ctypes.c_ubyte * (count // 8))()
+                    for code in axes:
+                        bits[code // 8] |= 1 << (code % 8)
+                    masks.append((ev_type, bits))
+
+        try:
+            for ev_type, bits in masks:
+                request = _INPUT_MASK.pack(ev_type, ctypes.sizeof(bits), ctypes.addressof(bits))
+                fcntl.ioctl(fd, EVIOCSMASK, request)
+        except OSError as exc:
+            logger.debug(
+                "EVIOCSMASK unavailable for %s: %s — unfiltered",
+                getattr(device, "name", "?"), exc,
+            )
+            return False
+        return True
+
+    def _track_button(self, value: int) -> None:
+        """Open the mice masks to motion on the first held button, close on the last."""
+        held = self._buttons_held
+        self._buttons_held = held = max(0, held + (1 if value else -1))
+        if (held == 1 and value) or held == 0:
+            self._set_motion_masks(bool(held))
+
+    def _set_motion_masks(self, motion: bool) -> None:
+        with self._lock:
+            mice = [
+                self.devices[path] for path in self._masked - self._keyboards
+                if path in self.devices
+            ]
+        for device in mice:
+            self._apply_event_mask(device, False, motion=motion)
+
+    def event_stats(self) -> dict:
+        """Counters for events that reached userspace.
+
+        ``other`` counts non-key, non-SYN events (mouse motion, scan codes,
+        LEDs); while every device is masked it only grows during drags.
+        """
+        return {
+            "masked_devices": len(self._masked),
+            "unmasked_devices": len(self.devices) - len(self._masked),
+            "key": self._delivered_key,
+            "syn": self._delivered_syn,
+            "other": self._delivered_other,
+        }
 
     # ------------------------------------------------------------------
     # Device removal
@@ -142,9 +481,16 @@ class DeviceManager:
             True if the device was present and removed.
         """
         with self._lock:
+            # Cancels a hot-plug probe still in flight for this path.
+            if path in self._probe_generation:
+                self._probe_generation[path] += 1
             device = self.devices.pop(path, None)
             if device is None:
                 return False
+            self._keyboards.discard(path)
+            self._masked.discard(path)
+            self._monotonic.discard(path)
+            self._grabbed.pop(path, None)
 
             try:
                 self.selector.unregister(device)
@@ -179,24 +525,226 @@ class DeviceManager:
             logger.warning("Read error on %s: %s", device.name, error)
         self.remove_device(path)
 
-    def get_events(self, timeout: float = 0.1) -> Iterator[tuple]:
-        """Yield ``(device, event)`` tuples from ready devices."""
+    def get_events(self, timeout: Optional[float] = 0.1) -> Iterator[tuple]:
+        """Yield ``(device, event)`` tuples from ready devices.
+
+        ``timeout=None`` blocks until a device, a watched fd or :meth:`wake`
+        becomes ready; watch callbacks run here, on the caller's thread.
+
+        Events drained from grabbed keyboards by :meth:`end_isolation` are
+        yielded first, so handlers see them in their original order. Key
+        events read from a grabbed keyboard (e.g. by a dedicated reader
+        thread) are also recorded for re-injection.
+        """
+        while self._pending:
+            yield self._pending.popleft()
+        ev_key = ecodes.EV_KEY
+        from lswitch.core.event_manager import MOUSE_BUTTONS
         ready = self.selector.select(timeout=timeout)
+        # end_isolation() may have drained (and woken us) during select()
+        while self._pending:
+            yield self._pending.popleft()
         for key, _mask in ready:
+            if type(key.data) is _Watch:
+                try:
+                    key.data.callback()
+                except Exception as exc:
+                    logger.error("Watch callback error: %s", exc)
+                continue
             device = key.fileobj
             try:
-                for event in device.read():
+                if self._grabbed:
+                    events = self._read_isolated(device)
+                else:
+                    events = device.read()
+                for event in events:
+                    event_type = event.type
+                    if event_type == ev_key:
+                        self._delivered_key += 1
+                        if event.code in MOUSE_BUTTONS and event.value != 2:
+                            self._track_button(event.value)
+                    elif event_type == 0:
+                        self._delivered_syn += 1
+                    else:
+                        self._delivered_other += 1
                     yield (device, event)
+            except BlockingIOError:
+                # end_isolation() drained the fd between select() and read()
+                continue
             except (OSError, IOError) as exc:
                 self.handle_read_error(device, exc)
 
+    # ------------------------------------------------------------------
+    # Input isolation (EVIOCGRAB)
+    # ------------------------------------------------------------------
+
+    @property
+    def is_isolated(self) -> bool:
+        """True while at least one keyboard is grabbed."""
+        return bool(self._grabbed)
+
+    def begin_isolation(self) -> int:
+        """Grab all physical keyboards. Returns the number of grabbed devices.
+
+        A keyboard that already has a key held down is left alone: its
+        release would be swallowed by the grab and the compositor would keep
+        the key pressed (and auto-repeat it) forever.
+        """
+        if not self.grab_during_conversion:
+            return 0
+        with self._lock:
+            for path in sorted(self._keyboards):
+                device = self.devices.get(path)
+                if device is None or path in self._grabbed:
+                    continue
+                try:
+                    held = device.active_keys()
+                except Exception:
+                    held = []
+                if held:
+                    logger.debug(
+                        "Input isolation: skip %s, keys held: %s",
+                        getattr(device, "name", path), held,
+                    )
+                    continue
+                # Same clock as the device's event timestamps
+                grab_time = time.monotonic() if path in self._monotonic else time.time()
+                try:
+                    device.grab()
+                except (OSError, IOError) as exc:
+                    logger.debug("Input isolation: cannot grab %s: %s", path, exc)
+                    continue
+                self._grabbed[path] = grab_time
+            count = len(self._grabbed)
+        if count:
+            logger.debug("Input isolation: grabbed %d keyboard(s)", count)
+        return count
+
+    def end_isolation(
+        self,
+        reinject: Optional[Callable[[list[tuple[int, int]]], Any]] = None,
+    ) -> int:
+        """Release grabs and re-inject keystrokes queued while grabbed.
+
+        Every pending event of a grabbed keyboard is read and queued for
+        :meth:`get_events`, which is woken to yield them. Press/release events that arrived after the grab
+        are also passed to *reinject* as ``(code, value)`` pairs, followed by
+        a release for every key that is still held, so the virtual keyboard
+        never leaves a key stuck down.
+
+        Returns:
+            Number of re-injected key transitions.
+        """
+        with self._lock:
+            grabbed, self._grabbed = self._grabbed, {}
+            keys, self._captured = self._captured, []
+            for path, grab_time in grabbed.items():
+                device = self.devices.get(path)
+                if device is None:
+                    continue
+                keys.extend(self._drain_grabbed(device, grab_time))
+                try:
+                    device.ungrab()
+                except (OSError, IOError) as exc:
+                    logger.debug("Input isolation: cannot ungrab %s: %s", path, exc)
+            drained = bool(self._pending)
+        if drained:
+            self.wake()   # a blocked reader must yield the drained events now
+
+        held: dict[int, None] = {}
+        for code, value in keys:
+            if value == 1:
+                held[code] = None
+            else:
+                held.pop(code, None)
+        keys.extend((code, 0) for code in held)
+
+        if grabbed:
+            logger.debug(
+                "Input isolation: released %d keyboard(s), re-injecting %d key events",
+                len(grabbed), len(keys),
+            )
+        if keys and reinject is not None:
+            try:
+                reinject(keys)
+            except Exception as exc:
+                logger.error("Input isolation: re-inject failed: %s", exc)
+        return len(keys)
+
+    def _read_isolated(self, device: Any) -> list:
+        """Read *device* and record its keys atomically w.r.t. :meth:`end_isolation`.
+
+        Reading and capturing under the lock means a key read from a grabbed
+        keyboard always lands in the list the current isolation re-injects,
+        never in the fresh one swapped in by ``end_isolation``.
+        """
+        with self._lock:
+            events = list(device.read())
+            grab_time = self._grabbed.get(device.path)
+            if grab_time is not None:
+                for event in events:
+                    self._capture_key(event, grab_time, self._captured)
+        return events
+
+    def _drain_grabbed(self, device: Any, grab_time: float) -> list[tuple[int, int]]:
+        keys: list[tuple[int, int]] = []
+        while True:
+            try:
+                events = list(device.read())
+            except BlockingIOError:
+                break
+            except (OSError, IOError) as exc:
+                logger.debug("Input isolation: drain error on %s: %s", device.path, exc)
+                break
+            if not events:
+                break
+            for event in events:
+                self._pending.append((device, event))
+                self._capture_key(event, grab_time, keys)
+        return keys
+
+    @staticmethod
+    def _capture_key(event: Any, grab_time: float, keys: list[tuple[int, int]]) -> None:
+        if getattr(event, "type", None) != ecodes.EV_KEY:
+            return
+        if getattr(event, "value", None) not in (0, 1):
+            return  # auto-repeat is generated by the compositor
+        # Events stamped before the grab already reached the compositor.
+        stamp = getattr(event, "sec", 0) + getattr(event, "usec", 0) / 1e6
+        if stamp and stamp < grab_time:
+            return
+        keys.append((event.code, event.value))
+
+    @contextmanager
+    def isolated_input(
+        self,
+        reinject: Optional[Callable[[list[tuple[int, int]]], Any]] = None,
+    ) -> Iterator[int]:
+        """Context manager around :meth:`begin_isolation`/:meth:`end_isolation`."""
+        count = self.begin_isolation()
+        try:
+            yield count
+        finally:
+            if count:
+                self.end_isolation(reinject)
+
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
 
     def close(self) -> None:
         """Release all resources."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
         with self._lock:
+            self._probe_generation.clear()
+            self._keyboards.clear()
+            self._grabbed.clear()
+            self._pending.clear()
+            self._captured.clear()
+            self._masked.clear()
+            self._monotonic.clear()
             for path in list(self.devices.keys()):
                 device = self.devices.pop(path, None)
                 if device:
@@ -213,6 +761,12 @@ class DeviceManager:
                 self.selector.close()
             except Exception:
                 pass
+            if self._wake_fd is not None:
+                try:
+                    os.close(self._wake_fd)
+                except OSError:
+                    pass
+                self._wake_fd = None
 
     def __enter__(self) -> "DeviceManager":
         return self
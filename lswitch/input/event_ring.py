@@ -0,0 +1,103 @@
+"""EventRing — bounded FIFO between the evdev reader and the event handler.
+
+The reader thread does nothing but drain :meth:`DeviceManager.get_events`
+into the ring, so the kernel evdev buffer keeps emptying even while a
+handler sleeps through a conversion. Slots are allocated once up front;
+when the handler falls behind by a full ring the oldest event is
+overwritten and counted in :attr:`EventRing.overflow_count`.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+
+class EventRing:
+    """Single-producer / single-consumer ring of ``(device, event)`` pairs."""
+
+    __slots__ = (
+        "capacity", "_devices", "_events", "_head", "_depth", "_closed",
+        "_cond", "overflow_count", "high_water", "total_count",
+    )
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._devices: list[Any] = [None] * capacity
+        self._events: list[Any] = [None] * capacity
+        self._head = 0          # index of the oldest queued slot
+        self._depth = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self.overflow_count = 0
+        self.high_water = 0
+        self.total_count = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of events waiting for the handler."""
+        return self._depth
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, device: Any, event: Any) -> bool:
+        """Queue one event. Returns False if an older event had to be dropped."""
+        with self._cond:
+            capacity = self.capacity
+            dropped = self._depth == capacity
+            if dropped:
+                # Overwrite the oldest slot — the tail catches up with the head.
+                self._head = (self._head + 1) % capacity
+                self._depth -= 1
+                self.overflow_count += 1
+            tail = (self._head + self._depth) % capacity
+            self._devices[tail] = device
+            self._events[tail] = event
+            self._depth += 1
+            self.total_count += 1
+            if self._depth > self.high_water:
+                self.high_water = self._depth
+            self._cond.notify()
+        return not dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[tuple]:
+        """Pop the oldest ``(device, event)`` pair.
+
+        Blocks up to *timeout* seconds; returns None on timeout or once the
+        ring is closed and empty.
+        """
+        with self._cond:
+            if not self._depth:
+                if self._closed:
+                    return None
+                self._cond.wait(timeout)
+                if not self._depth:
+                    return None
+            head = self._head
+            item = (self._devices[head], self._events[head])
+            self._devices[head] = None
+            self._events[head] = None
+            self._head = (head + 1) % self.capacity
+            self._depth -= 1
+            return item
+
+    def close(self) -> None:
+        """Wake the consumer; queued events can still be drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Snapshot of queue counters for diagnostics."""
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "depth": self._depth,
+                "high_water": self.high_water,
+                "overflow": self.overflow_count,
+                "total": self.total_count,
+            }
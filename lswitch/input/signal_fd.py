@@ -0,0 +1,143 @@
+"""SignalFD — deliver POSIX signals as readable events on a file descriptor.
+
+Used by the headless daemon so SIGHUP/SIGTERM/SIGINT are handled by the
+same selector loop as evdev and udev (:meth:`DeviceManager.add_watch`)
+instead of asynchronous Python signal handlers.
+
+The signals are blocked with ``pthread_sigmask`` first; threads started
+afterwards inherit the mask, so the kernel queues the signals on the fd
+rather than running the default action in some other thread. Call
+:meth:`SignalFD.open` before starting any thread.
+
+The mask also survives fork/exec, so a helper started meanwhile (xdotool,
+setxkbmap, an ``xclip -i`` serving the selection) would ignore SIGTERM and
+SIGINT from ``systemctl stop`` or Ctrl+C. Subprocesses are therefore
+started through :func:`child_argv`, which puts ``env --default-signal`` in
+front of the command to unblock them again in the exec'd child. No Python
+code runs between fork and exec (``preexec_fn`` is not safe with threads).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import signal
+import struct
+import subprocess
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_SFD_CLOEXEC = 0o2000000
+_SFD_NONBLOCK = 0o4000
+_SIGINFO_SIZE = 128                 # sizeof(struct signalfd_siginfo)
+_SIGSET = ctypes.c_ulong * (1024 // (8 * ctypes.sizeof(ctypes.c_ulong)))
+
+# Signals blocked by open SignalFDs; subprocesses must not inherit them.
+_blocked: frozenset[int] = frozenset()
+# Whether env(1) has --default-signal (coreutils >= 8.31); probed once.
+_env_default_signal: Optional[bool] = None
+
+
+def child_argv(args: list[str]) -> list[str]:
+    """*args* wrapped so the child runs with SignalFD signals unblocked.
+
+    Unchanged while nothing is blocked, or when ``env`` cannot reset
+    signals (the child then inherits the mask, as before SignalFD).
+    """
+    blocked = _blocked
+    if not blocked or not _env_resets_signals():
+        return args
+    names = ",".join(str(sig) for sig in sorted(blocked))
+    return ["env", f"--default-signal={names}", "--", *args]
+
+
+def _env_resets_signals() -> bool:
+    global _env_default_signal
+    if _env_default_signal is None:
+        try:
+            _env_default_signal = subprocess.run(
+                ["env", "--default-signal=TERM", "true"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=1.0,
+            ).returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            _env_default_signal = False
+        if not _env_default_signal:
+            logger.debug("env --default-signal unsupported; children inherit the signal mask")
+    return _env_default_signal
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.signalfd  # noqa: B018 - probe the symbol
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class SignalFD:
+    """Owns a non-blocking signalfd for a fixed set of signals."""
+
+    def __init__(self, fd: int, signals: frozenset[int]):
+        self._fd = fd
+        self.signals = signals
+
+    @classmethod
+    def open(cls, signals: Iterable[int]) -> Optional["SignalFD"]:
+        """Block *signals* and return a SignalFD, or None if unsupported.
+
+        On failure the signal mask is left unchanged, so callers can fall
+        back to ``signal.signal`` handlers.
+        """
+        sigs = frozenset(int(s) for s in signals)
+        libc = _load_libc()
+        if libc is None:
+            return None
+        mask = _SIGSET()
+        libc.sigemptyset(ctypes.byref(mask))
+        for sig in sigs:
+            libc.sigaddset(ctypes.byref(mask), sig)
+
+        previous = signal.pthread_sigmask(signal.SIG_BLOCK, sigs)
+        fd = libc.signalfd(-1, ctypes.byref(mask), _SFD_NONBLOCK | _SFD_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+            logger.debug("signalfd unavailable: %s", os.strerror(err))
+            return None
+        global _blocked
+        _blocked = _blocked | sigs
+        return cls(fd, sigs)
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self) -> list[int]:
+        """Return the signal numbers received since the last call."""
+        received: list[int] = []
+        while True:
+            try:
+                data = os.read(self._fd, _SIGINFO_SIZE * 8)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            for offset in range(0, len(data) - _SIGINFO_SIZE + 1, _SIGINFO_SIZE):
+                received.append(struct.unpack_from("I", data, offset)[0])
+        return received
+
+    def close(self) -> None:
+        """Close the fd and unblock the signals again."""
+        if self._fd < 0:
+            return
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+        self._fd = -1
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, self.signals)
+        global _blocked
+        _blocked = _blocked - self.signals
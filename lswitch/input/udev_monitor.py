@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 import threading
-import time
 from typing import Callable
 
 try:
@@ -21,8 +20,15 @@ logger = logging.getLogger(__name__)
 class UdevMonitor:
     """Monitors udev events and notifies on device changes.
 
+    Either runs its own daemon thread (:meth:`start`) or, preferably, is
+    :meth:`attach`-ed to a :class:`DeviceManager` so the netlink socket is
+    served by the same selector as the evdev devices.
+
     Parameters:
         on_added:   Called with device path (``/dev/input/eventX``) on plug.
+                    Runs on the event loop thread and must not block; the
+                    node may not be readable yet (see
+                    :meth:`DeviceManager.add_device_async`).
         on_removed: Called with device path on unplug.
     """
 
@@ -35,6 +41,8 @@ class UdevMonitor:
         self.on_removed = on_removed
         self._thread: threading.Thread | None = None
         self._running = False
+        self._monitor = None
+        self._device_manager = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -58,52 +66,101 @@ class UdevMonitor:
         self._thread.start()
         return True
 
+    def attach(self, device_manager) -> bool:
+        """Serve udev events from *device_manager*'s selector (no own thread).
+
+        Returns:
+            True if attached, False if pyudev is unavailable or the netlink
+            monitor could not be opened.
+        """
+        if not PYUDEV_AVAILABLE:
+            logger.warning("pyudev not installed — hot-plug disabled")
+            return False
+        if self._device_manager is not None:
+            return True
+        try:
+            monitor = self._open_monitor()
+            device_manager.add_watch(monitor, self._on_readable)
+        except Exception as exc:
+            logger.error("UdevMonitor error: %s", exc)
+            return False
+        self._monitor = monitor
+        self._device_manager = device_manager
+        self._running = True
+        return True
+
     def stop(self) -> None:
         """Signal the monitoring loop to stop."""
         self._running = False
+        if self._device_manager is not None:
+            try:
+                self._device_manager.remove_watch(self._monitor)
+            except Exception:
+                pass
+            self._device_manager = None
+            self._monitor = None
         if self._thread is not None:
             self._thread.join(timeout=2)
             self._thread = None
 
     @property
     def is_running(self) -> bool:
+        if self._device_manager is not None:
+            return self._running
         return self._running and self._thread is not None and self._thread.is_alive()
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _open_monitor():
+        context = pyudev.Context()
+        monitor = pyudev.Monitor.from_netlink(context)
+        monitor.filter_by(subsystem="input")
+        monitor.start()
+        return monitor
+
+    def _on_readable(self) -> None:
+        """Selector callback: drain every pending udev event."""
+        monitor = self._monitor
+        if monitor is None:
+            return
+        while True:
+            device = monitor.poll(timeout=0)
+            if device is None:
+                return
+            self._dispatch(device)
+
+    def _dispatch(self, device) -> None:
+        dev_path = device.device_node
+        if not dev_path or not dev_path.startswith("/dev/input/event"):
+            return
+
+        if device.action == "add":
+            if self.on_added:
+                try:
+                    self.on_added(dev_path)
+                except Exception as exc:
+                    logger.debug("on_added callback error: %s", exc)
+
+        elif device.action == "remove":
+            if self.on_removed:
+                try:
+                    self.on_removed(dev_path)
+                except Exception as exc:
+                    logger.debug("on_removed callback error: %s", exc)
+
     def _run(self) -> None:
         """Main monitoring loop — runs in a daemon thread."""
         try:
-            context = pyudev.Context()
-            monitor = pyudev.Monitor.from_netlink(context)
-            monitor.filter_by(subsystem="input")
-            monitor.start()
+            monitor = self._open_monitor()
 
             while self._running:
                 device = monitor.poll(timeout=1)
                 if device is None:
                     continue
-
-                dev_path = device.device_node
-                if not dev_path or not dev_path.startswith("/dev/input/event"):
-                    continue
-
-                if device.action == "add":
-                    time.sleep(0.1)  # let the device initialise
-                    if self.on_added:
-                        try:
-                            self.on_added(dev_path)
-                        except Exception as exc:
-                            logger.debug("on_added callback error: %s", exc)
-
-                elif device.action == "remove":
-                    if self.on_removed:
-                        try:
-                            self.on_removed(dev_path)
-                        except Exception as exc:
-                            logger.debug("on_removed callback error: %s", exc)
+                self._dispatch(device)
 
         except Exception as exc:
             logger.error("UdevMonitor error: %s", exc)
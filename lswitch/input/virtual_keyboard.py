@@ -2,12 +2,214 @@
 
 from __future__ import annotations
 
+import os
+import struct
 import time
 import logging
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+import lswitch.log  # registers TRACE level and logger.trace()
+from lswitch.input.key_mapper import KEYCODE_TO_CHAR_EN
+from lswitch.log import lazy
 
 logger = logging.getLogger(__name__)
 
+# Kernel input ABI constants (linux/input-event-codes.h). Resolved once here
+# instead of importing evdev.ecodes for every written event.
+EV_SYN = 0
+EV_KEY = 1
+SYN_REPORT = 0
+
+# struct input_event: struct timeval + __u16 type + __u16 code + __s32 value.
+# uinput stamps its own time, so the timeval part is always zero.
+_INPUT_EVENT = struct.Struct("@llHHi")
+_SYN_FRAME = _INPUT_EVENT.pack(0, 0, EV_SYN, SYN_REPORT, 0)
+
+# US character -> evdev keycode, for type_text() without a live keymap
+_EN_CHAR_TO_CODE = {char: code for code, char in KEYCODE_TO_CHAR_EN.items()}
+
+
+def _count_writes(steps: list) -> int:
+    return sum(1 for step in steps if isinstance(step, bytearray) and step)
+
+
+@dataclass(frozen=True)
+class Pacing:
+    """Sleep policy applied inside a :class:`KeyTransaction`.
+
+    Delays are inserted only where they are non-zero, so ``Pacing()`` sends
+    a whole transaction in a single ``write()``.
+    """
+
+    press_delay: float = 0.0   # between a key press and its release
+    tap_delay: float = 0.0     # between successive taps
+
+
+class KeyTransaction:
+    """Pre-encoded batch of virtual key events.
+
+    Events are encoded into ``struct input_event`` records as they are added.
+    Every key transition is followed by its own ``SYN_REPORT`` so applications
+    see one key change per frame, but consecutive frames are written with one
+    ``write()`` call. The batch is only split where the pacing policy asks for
+    a pause or where :meth:`call` schedules an out-of-band step (for example a
+    layout switch between backspaces and replay).
+    """
+
+    def __init__(self, keyboard: "VirtualKeyboard", pacing: Pacing):
+        self._keyboard = keyboard
+        self.pacing = pacing
+        # Steps: bytearray (encoded frames), float (pause) or callable.
+        self._steps: list[Any] = []
+        self._pending_gap = 0.0
+        self.event_count = 0
+
+    # -- building -----------------------------------------------------------
+
+    def _buffer(self) -> bytearray:
+        if self._pending_gap > 0:
+            self._steps.append(self._pending_gap)
+        self._pending_gap = 0.0
+        if not self._steps or not isinstance(self._steps[-1], bytearray):
+            self._steps.append(bytearray())
+        return self._steps[-1]
+
+    def key(self, code: int, value: int) -> "KeyTransaction":
+        """Append one key transition followed by ``SYN_REPORT``."""
+        buf = self._buffer()
+        buf += _INPUT_EVENT.pack(0, 0, EV_KEY, code, value)
+        buf += _SYN_FRAME
+        self.event_count += 1
+        return self
+
+    def pause(self, seconds: float) -> "KeyTransaction":
+        """Split the batch with an explicit sleep."""
+        if seconds > 0:
+            self._buffer()
+            self._steps.append(float(seconds))
+        return self
+
+    def call(self, func: Callable[[], Any]) -> "KeyTransaction":
+        """Run *func* at this point of the transaction during :meth:`commit`."""
+        self._pending_gap = 0.0
+        self._steps.append(func)
+        return self
+
+    def _end_tap(self) -> None:
+        self._pending_gap = self.pacing.tap_delay
+
+    def tap(self, code: int, n_times: int = 1, shifted: bool = False) -> "KeyTransaction":
+        """Append *n_times* press/release pairs, optionally wrapped in Shift."""
+        for _ in range(n_times):
+            if shifted:
+                self.key(VirtualKeyboard.KEY_LEFTSHIFT, 1)
+                self.pause(self.pacing.press_delay)
+            self.key(code, 1)
+            self.pause(self.pacing.press_delay)
+            self.key(code, 0)
+            if shifted:
+                self.key(VirtualKeyboard.KEY_LEFTSHIFT, 0)
+            self._end_tap()
+        return self
+
+    def combo(self, keycodes: list[int]) -> "KeyTransaction":
+        """Press *keycodes* in order and release them in reverse order."""
+        for code in keycodes:
+            self.key(code, 1)
+            self.pause(self.pacing.press_delay)
+        for code in reversed(keycodes):
+            self.key(code, 0)
+            self.pause(self.pacing.press_delay)
+        return self
+
+    def replay(self, events: Iterable[Any]) -> "KeyTransaction":
+        """Append recorded events; see :meth:`VirtualKeyboard.replay_events`."""
+        events = list(events)
+        released_codes: set[int] = set()
+        for ev in events:
+            if getattr(ev, 'value', None) == 0:
+                released_codes.add(getattr(ev, 'code', -1))
+
+        for ev in events:
+            code = getattr(ev, 'code', None)
+            value = getattr(ev, 'value', None)
+            if code is None or value is None:
+                continue
+            # Use strict identity check so that MagicMock attrs (truthy but
+            # not literally True) don't accidentally trigger Shift injection.
+            shifted = getattr(ev, 'shifted', False) is True
+            if shifted:
+                self.key(VirtualKeyboard.KEY_LEFTSHIFT, 1)
+                self.pause(self.pacing.press_delay)
+            self.key(code, value)
+            # Send synthetic release if this is a press without a paired release
+            if value == 1 and code not in released_codes:
+                self.pause(self.pacing.press_delay)
+                self.key(code, 0)
+            if shifted:
+                self.key(VirtualKeyboard.KEY_LEFTSHIFT, 0)
+            self._end_tap()
+        return self
+
+    # -- sending ------------------------------------------------------------
+
+    @property
+    def write_count(self) -> int:
+        """Number of ``write()`` calls :meth:`commit` will issue on a real device."""
+        return _count_writes(self._steps)
+
+    def commit(self) -> None:
+        """Send all queued steps in order and clear the transaction."""
+        steps, self._steps = self._steps, []
+        self._pending_gap = 0.0
+        kb = self._keyboard
+        if kb._uinput is None:
+            # Out-of-band steps still run so callers keep their ordering.
+            for step in steps:
+                if callable(step):
+                    step()
+            return
+
+        fd = kb._raw_fd()
+        logger.debug(
+            "VirtualKeyboard: commit events=%d writes=%s",
+            self.event_count,
+            lazy(_count_writes, steps),
+        )
+        self.event_count = 0
+        for step in steps:
+            if isinstance(step, bytearray):
+                if not step:
+                    continue
+                if fd is None:
+                    self._write_per_event(step)
+                else:
+                    self._write_raw(fd, step)
+            elif callable(step):
+                step()
+            else:
+                time.sleep(step)
+
+    def _write_raw(self, fd: int, payload: bytearray) -> None:
+        if lswitch.log.trace_enabled(logger):
+            for _sec, _usec, etype, code, value in _INPUT_EVENT.iter_unpack(payload):
+                if etype == EV_KEY:
+                    logger.trace("VK_out: write code=%s value=%s", code, value)  # type: ignore[attr-defined]
+        view = memoryview(payload)
+        try:
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        except OSError as e:
+            logger.debug("VirtualKeyboard write error: %s", e)
+
+    def _write_per_event(self, payload: bytearray) -> None:
+        """Fallback for UInput objects without a raw file descriptor."""
+        for _sec, _usec, etype, code, value in _INPUT_EVENT.iter_unpack(payload):
+            if etype == EV_KEY:
+                self._keyboard._write(code, value)
+
 
 class VirtualKeyboard:
     """Creates and manages a UInput virtual keyboard device."""
@@ -17,6 +219,8 @@ class VirtualKeyboard:
     def __init__(self, debug: bool = False, timing: dict | None = None):
         self.debug = debug
         self._uinput: Any = None
+        # (char, layout_name) -> (keycode, shifted) from the live keymap
+        self._char_lookup: Callable[[str, str], tuple[int, bool] | None] | None = None
         timing = timing or {}
         self.KEY_PRESS_DELAY = float(
             timing.get("key_press_delay", type(self).KEY_PRESS_DELAY)
@@ -34,10 +238,13 @@ class VirtualKeyboard:
             logger.warning("Cannot create UInput device: %s", e)
 
     # Delay between press and release, and between successive key taps.
-    # Without a pause many applications (GTK, Qt, X terminals) drop events
-    # when they arrive faster than the input processing loop runs.
-    KEY_PRESS_DELAY  = 0.001   # 1 ms between press and release
-    KEY_REPEAT_DELAY = 0.001   # 1 ms between successive key taps
+    # Zero by default: every key transition is its own SYN_REPORT frame, so
+    # applications see one change per frame and a transaction goes out in
+    # a single write(). The only pause a conversion needs is after the
+    # layout switch (retype_before_replay_delay and friends). Raise these
+    # for an application that still drops fast input.
+    KEY_PRESS_DELAY  = 0.0
+    KEY_REPEAT_DELAY = 0.0
 
     _KEY_NAME_MAP: dict[str, int] = {
         "ctrl": 29,
@@ -119,15 +326,32 @@ class VirtualKeyboard:
         "~": "`",
     }
 
-    def tap_key(self, keycode: int, n_times: int = 1) -> None:
+    def set_char_lookup(
+        self, lookup: Callable[[str, str], tuple[int, bool] | None] | None,
+    ) -> None:
+        """Resolve :meth:`type_text` characters through the live keymap first.
+
+        *lookup* is ``X11XKBAdapter.char_to_key``; characters it does not
+        know fall back to the built-in US/RU tables.
+        """
+        self._char_lookup = lookup
+
+    @property
+    def pacing(self) -> Pacing:
+        """Default pacing policy built from the configured key delays."""
+        return Pacing(
+            press_delay=self.KEY_PRESS_DELAY,
+            tap_delay=self.KEY_REPEAT_DELAY,
+        )
+
+    def transaction(self, pacing: Pacing | None = None) -> KeyTransaction:
+        """Start a batched key transaction; send it with ``commit()``."""
+        return KeyTransaction(self, self.pacing if pacing is None else pacing)
+
+    def tap_key(self, keycode: int, n_times: int = 1, pacing: Pacing | None = None) -> None:
         """Press and release a keycode n times."""
         logger.debug("VirtualKeyboard: tap_key code=%s n_times=%s", keycode, n_times)
-        for i in range(n_times):
-            self._write(keycode, 1)
-            time.sleep(self.KEY_PRESS_DELAY)
-            self._write(keycode, 0)
-            if i < n_times - 1:
-                time.sleep(self.KEY_REPEAT_DELAY)
+        self.transaction(pacing).tap(keycode, n_times).commit()
 
     @classmethod
     def _key_name_to_code(cls, name: str) -> int:
@@ -139,21 +363,21 @@ class VirtualKeyboard:
         except KeyError as exc:
             raise ValueError(f"Unsupported key name in sequence: {name!r}") from exc
 
-    def send_combo(self, sequence: str) -> None:
+    def send_combo(self, sequence: str, pacing: Pacing | None = None) -> None:
         """Send a key combination such as ``ctrl+v`` via UInput."""
         names = [part.strip() for part in sequence.split("+") if part.strip()]
         if not names:
             return
         keycodes = [self._key_name_to_code(name) for name in names]
         logger.debug("VirtualKeyboard: send_combo sequence=%s codes=%s", sequence, keycodes)
-        for code in keycodes:
-            self._write(code, 1)
-            time.sleep(self.KEY_PRESS_DELAY)
-        for code in reversed(keycodes):
-            self._write(code, 0)
-            time.sleep(self.KEY_PRESS_DELAY)
+        self.transaction(pacing).combo(keycodes).commit()
 
-    def type_text(self, text: str, layout_name: str = "en") -> bool:
+    def type_text(
+        self,
+        text: str,
+        layout_name: str = "en",
+        pacing: Pacing | None = None,
+    ) -> bool:
         """Type text through the currently active keyboard layout.
 
         ``layout_name`` describes the layout that is active in the compositor,
@@ -169,21 +393,18 @@ class VirtualKeyboard:
             len(text),
             layout_name,
         )
+        tx = self.transaction(pacing)
+        lookup = self._char_lookup
         for ch in text:
-            key = self._text_char_to_key(ch, layout_name=layout_name)
+            key = lookup(ch, layout_name) if lookup is not None else None
+            if key is None:
+                key = self._text_char_to_key(ch, layout_name=layout_name)
             if key is None:
                 logger.debug("VirtualKeyboard: unsupported text char %r", ch)
                 return False
             code, shifted = key
-            if shifted:
-                self._write(self.KEY_LEFTSHIFT, 1)
-                time.sleep(self.KEY_PRESS_DELAY)
-            self._write(code, 1)
-            time.sleep(self.KEY_PRESS_DELAY)
-            self._write(code, 0)
-            if shifted:
-                self._write(self.KEY_LEFTSHIFT, 0)
-            time.sleep(self.KEY_REPEAT_DELAY)
+            tx.tap(code, shifted=shifted)
+        tx.commit()
         return True
 
     @classmethod
@@ -192,8 +413,6 @@ class VirtualKeyboard:
         ch: str,
         layout_name: str = "en",
     ) -> tuple[int, bool] | None:
-        from lswitch.input.key_mapper import KEYCODE_TO_CHAR_EN
-
         if ch == "\n":
             return cls._KEY_NAME_MAP["enter"], False
         if ch == "\t":
@@ -206,7 +425,7 @@ class VirtualKeyboard:
 
             physical = RU_TO_EN.get(ch, ch)
 
-        base_to_code = {value: code for code, value in KEYCODE_TO_CHAR_EN.items()}
+        base_to_code = _EN_CHAR_TO_CODE
         if physical in base_to_code:
             return base_to_code[physical], False
 
@@ -224,7 +443,7 @@ class VirtualKeyboard:
     # evdev keycode for Left Shift — used to replay shifted keys.
     KEY_LEFTSHIFT = 42
 
-    def replay_events(self, events: list) -> None:
+    def replay_events(self, events: list, pacing: Pacing | None = None) -> None:
         """Replay a list of evdev InputEvent objects.
 
         If an event has value=1 (key press) and no matching release follows in
@@ -237,39 +456,42 @@ class VirtualKeyboard:
         uppercase letter in the new layout.
         """
         logger.debug("VirtualKeyboard: replay_events %d events", len(events))
-        # Build a set of codes that get a release in the list already
-        released_codes: set[int] = set()
-        for ev in events:
-            if getattr(ev, 'value', None) == 0:
-                released_codes.add(getattr(ev, 'code', -1))
+        self.transaction(pacing).replay(events).commit()
 
-        for ev in events:
-            code = getattr(ev, 'code', None)
-            value = getattr(ev, 'value', None)
-            if code is None or value is None:
-                continue
-            # Use strict identity check so that MagicMock attrs (truthy but
-            # not literally True) don't accidentally trigger Shift injection.
-            shifted = getattr(ev, 'shifted', False) is True
-            if shifted:
-                self._write(self.KEY_LEFTSHIFT, 1)
-                time.sleep(self.KEY_PRESS_DELAY)
-            self._write(code, value)
-            # Send synthetic release if this is a press without a paired release
-            if value == 1 and code not in released_codes:
-                time.sleep(self.KEY_PRESS_DELAY)
-                self._write(code, 0)
-            if shifted:
-                self._write(self.KEY_LEFTSHIFT, 0)
-            time.sleep(self.KEY_REPEAT_DELAY)
+    def send_key_events(
+        self,
+        keys: Iterable[tuple[int, int]],
+        pacing: Pacing | None = None,
+    ) -> None:
+        """Send raw ``(code, value)`` key transitions exactly as given.
+
+        Used to re-inject physical keystrokes captured during input isolation;
+        no synthetic releases or Shift wrapping are added.
+        """
+        tx = self.transaction(Pacing() if pacing is None else pacing)
+        for code, value in keys:
+            tx.key(code, value)
+        logger.debug("VirtualKeyboard: send_key_events %d events", tx.event_count)
+        tx.commit()
+
+    @property
+    def available(self) -> bool:
+        """True when the UInput device was created and events can be sent."""
+        return self._uinput is not None
+
+    def _raw_fd(self) -> int | None:
+        """Return the uinput file descriptor for batched writes, if any."""
+        fd = getattr(self._uinput, "fd", None)
+        if isinstance(fd, int) and not isinstance(fd, bool) and fd >= 0:
+            return fd
+        return None
 
     def _write(self, code: int, value: int) -> None:
         if self._uinput is None:
             return
         logger.trace("VK_out: write code=%s value=%s", code, value)  # type: ignore[attr-defined]
         try:
-            from evdev import ecodes
-            self._uinput.write(ecodes.EV_KEY, code, value)
+            self._uinput.write(EV_KEY, code, value)
             self._uinput.syn()
         except Exception as e:
             logger.debug("VirtualKeyboard write error: %s", e)
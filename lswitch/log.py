@@ -9,9 +9,17 @@ Usage:
     import lswitch.log  # must be imported once before any logger is used
     logger = logging.getLogger(__name__)
     logger.trace("very noisy message")
+
+Expensive arguments are wrapped in :class:`lazy` so they are only computed
+when the record is actually emitted:
+
+    logger.trace("Buffer → %r", lazy(self._decode_buffer))
 """
 
+from __future__ import annotations
+
 import logging
+from typing import Any, Callable
 
 TRACE: int = 5
 logging.addLevelName(TRACE, "TRACE")
@@ -22,5 +30,40 @@ def _trace(self: logging.Logger, message: object, *args: object, **kwargs: objec
         self._log(TRACE, message, args, **kwargs)  # type: ignore[attr-defined]
 
 
+class lazy:
+    """Deferred log argument: ``func(*args)`` runs only when formatted.
+
+    ``%s`` and ``%r`` in the message format the computed value. The level
+    check itself is the logger's cached ``isEnabledFor``, so a disabled
+    TRACE/DEBUG call costs one dict lookup plus this small wrapper.
+    """
+
+    __slots__ = ("func", "args", "_value")
+
+    _UNSET = object()
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+        self._value = lazy._UNSET
+
+    def value(self) -> Any:
+        """Compute once; every handler formatting the record reuses it."""
+        if self._value is lazy._UNSET:
+            self._value = self.func(*self.args)
+        return self._value
+
+    def __str__(self) -> str:
+        return str(self.value())
+
+    def __repr__(self) -> str:
+        return repr(self.value())
+
+
+def trace_enabled(logger: logging.Logger) -> bool:
+    """True if *logger* emits TRACE records (cached by ``logging``)."""
+    return logger.isEnabledFor(TRACE)
+
+
 # Patch Logger class once at import time
 logging.Logger.trace = _trace  # type: ignore[attr-defined]
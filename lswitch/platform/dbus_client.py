@@ -0,0 +1,463 @@
+"""Minimal D-Bus client speaking the wire protocol over a unix socket.
+
+Just enough of the D-Bus specification for LSwitch's desktop calls:
+EXTERNAL authentication, method calls with replies, and signal
+subscriptions. It needs no bindings package (dbus-python, jeepney) and
+forks nothing. A connection stays open for the life of the process.
+
+Values map to Python as follows: integers and booleans are ``int``/``bool``,
+strings, object paths and signatures are ``str``, arrays are ``list``,
+structs are ``tuple``, dicts are ``dict``. Variants are decoded to their
+value and are written as a ``(signature, value)`` pair.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import socket
+import struct
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+METHOD_CALL = 1
+METHOD_RETURN = 2
+ERROR = 3
+SIGNAL = 4
+
+# Header field codes
+_PATH, _INTERFACE, _MEMBER, _ERROR_NAME, _REPLY_SERIAL = 1, 2, 3, 4, 5
+_DESTINATION, _SENDER, _SIGNATURE = 6, 7, 8
+_FIELD_TYPES = {
+    _PATH: "o", _INTERFACE: "s", _MEMBER: "s", _ERROR_NAME: "s",
+    _REPLY_SERIAL: "u", _DESTINATION: "s", _SENDER: "s", _SIGNATURE: "g",
+}
+
+_FIXED = {
+    "y": ("B", 1), "b": ("I", 4), "n": ("h", 2), "q": ("H", 2),
+    "i": ("i", 4), "u": ("I", 4), "x": ("q", 8), "t": ("Q", 8),
+    "d": ("d", 8), "h": ("I", 4),
+}
+_ALIGN = {"s": 4, "o": 4, "g": 1, "a": 4, "(": 8, "{": 8, "v": 1}
+
+BUS_NAME = "org.freedesktop.DBus"
+BUS_PATH = "/org/freedesktop/DBus"
+
+
+class DBusError(Exception):
+    """Error reply from the bus or the remote object."""
+
+    def __init__(self, name: str, message: str = ""):
+        super().__init__(f"{name}: {message}" if message else name)
+        self.name = name
+
+
+# ---------------------------------------------------------------------------
+# Marshalling
+# ---------------------------------------------------------------------------
+
+def split_signature(signature: str) -> list[str]:
+    """Split a signature into its complete types: ``"sa{sv}i"`` → 3 items."""
+    types, i = [], 0
+    while i < len(signature):
+        end = _type_end(signature, i)
+        types.append(signature[i:end])
+        i = end
+    return types
+
+
+def _type_end(signature: str, i: int) -> int:
+    c = signature[i]
+    if c == "a":
+        return _type_end(signature, i + 1)
+    if c in "({":
+        close = ")" if c == "(" else "}"
+        depth, j = 0, i
+        while True:
+            if signature[j] == c:
+                depth += 1
+            elif signature[j] == close:
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+            j += 1
+    return i + 1
+
+
+def _alignment(sig: str) -> int:
+    return _FIXED[sig[0]][1] if sig[0] in _FIXED else _ALIGN[sig[0]]
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def align(self, n: int) -> None:
+        self.buf.extend(b"\0" * (-len(self.buf) % n))
+
+    def write(self, sig: str, value: Any) -> None:
+        c = sig[0]
+        if c in _FIXED:
+            fmt, size = _FIXED[c]
+            self.align(size)
+            self.buf.extend(struct.pack("<" + fmt, value))
+        elif c in "so":
+            data = value.encode()
+            self.align(4)
+            self.buf.extend(struct.pack("<I", len(data)) + data + b"\0")
+        elif c == "g":
+            data = value.encode()
+            self.buf.extend(bytes((len(data),)) + data + b"\0")
+        elif c == "v":
+            inner_sig, inner = value
+            self.write("g", inner_sig)
+            self.write(inner_sig, inner)
+        elif c == "(":
+            self.align(8)
+            for item_sig, item in zip(split_signature(sig[1:-1]), value):
+                self.write(item_sig, item)
+        elif c == "a":
+            item_sig = sig[1:]
+            self.align(4)
+            at = len(self.buf)
+            self.buf.extend(b"\0\0\0\0")
+            self.align(_alignment(item_sig))
+            start = len(self.buf)
+            if item_sig[0] == "{":
+                key_sig, value_sig = split_signature(item_sig[1:-1])
+                for key, item in value.items():
+                    self.align(8)
+                    self.write(key_sig, key)
+                    self.write(value_sig, item)
+            else:
+                for item in value:
+                    self.write(item_sig, item)
+            struct.pack_into("<I", self.buf, at, len(self.buf) - start)
+        else:
+            raise ValueError(f"unsupported D-Bus type {sig!r}")
+
+
+class _Reader:
+    def __init__(self, data: bytes, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+
+    def align(self, n: int) -> None:
+        self.pos += -self.pos % n
+
+    def read(self, sig: str) -> Any:
+        c = sig[0]
+        if c in _FIXED:
+            fmt, size = _FIXED[c]
+            self.align(size)
+            (value,) = struct.unpack_from("<" + fmt, self.data, self.pos)
+            self.pos += size
+            return bool(value) if c == "b" else value
+        if c in "so":
+            self.align(4)
+            (length,) = struct.unpack_from("<I", self.data, self.pos)
+            start = self.pos + 4
+            self.pos = start + length + 1
+            return self.data[start:start + length].decode()
+        if c == "g":
+            length = self.data[self.pos]
+            start = self.pos + 1
+            self.pos = start + length + 1
+            return self.data[start:start + length].decode()
+        if c == "v":
+            return self.read(self.read("g"))
+        if c == "(":
+            self.align(8)
+            return tuple(self.read(item) for item in split_signature(sig[1:-1]))
+        if c == "a":
+            item_sig = sig[1:]
+            self.align(4)
+            (length,) = struct.unpack_from("<I", self.data, self.pos)
+            self.pos += 4
+            self.align(_alignment(item_sig))
+            end = self.pos + length
+            if item_sig[0] == "{":
+                key_sig, value_sig = split_signature(item_sig[1:-1])
+                result = {}
+                while self.pos < end:
+                    self.align(8)
+                    key = self.read(key_sig)
+                    result[key] = self.read(value_sig)
+                return result
+            items = []
+            while self.pos < end:
+                items.append(self.read(item_sig))
+            return items
+        raise ValueError(f"unsupported D-Bus type {sig!r}")
+
+
+class Message:
+    """One D-Bus message (header fields plus body)."""
+
+    __slots__ = ("type", "flags", "serial", "fields", "body")
+
+    def __init__(
+        self,
+        type: int,
+        fields: dict[int, Any],
+        body: tuple = (),
+        serial: int = 0,
+        flags: int = 0,
+    ):
+        self.type = type
+        self.flags = flags
+        self.serial = serial
+        self.fields = fields
+        self.body = body
+
+    path = property(lambda self: self.fields.get(_PATH))
+    interface = property(lambda self: self.fields.get(_INTERFACE))
+    member = property(lambda self: self.fields.get(_MEMBER))
+    error_name = property(lambda self: self.fields.get(_ERROR_NAME))
+    reply_serial = property(lambda self: self.fields.get(_REPLY_SERIAL))
+    sender = property(lambda self: self.fields.get(_SENDER))
+    signature = property(lambda self: self.fields.get(_SIGNATURE, ""))
+
+    def encode(self) -> bytes:
+        body = _Writer()
+        for sig, value in zip(split_signature(self.signature), self.body):
+            body.write(sig, value)
+        header = _Writer()
+        header.buf.extend(struct.pack(
+            "<cBBBII", b"l", self.type, self.flags, 1, len(body.buf), self.serial,
+        ))
+        header.write("a(yv)", [
+            (code, (_FIELD_TYPES[code], value)) for code, value in sorted(self.fields.items())
+        ])
+        header.align(8)
+        return bytes(header.buf + body.buf)
+
+    @classmethod
+    def decode(cls, data: bytes) -> Optional[tuple["Message", int]]:
+        """Parse one message from *data*; None until it is complete."""
+        if len(data) < 16:
+            return None
+        endian = data[0:1]
+        if endian != b"l":
+            raise DBusError("org.freedesktop.DBus.Error.InvalidArgs", "big-endian message")
+        type_, flags, _version, body_len, serial, fields_len = struct.unpack_from("<BBBIII", data, 1)
+        header_len = 16 + fields_len + (-(16 + fields_len) % 8)
+        total = header_len + body_len
+        if len(data) < total:
+            return None
+        reader = _Reader(data[:total], 12)
+        fields = dict(reader.read("a(yv)"))
+        msg = cls(type_, fields, serial=serial, flags=flags)
+        reader.pos = header_len
+        msg.body = tuple(reader.read(sig) for sig in split_signature(msg.signature))
+        return msg, total
+
+
+# ---------------------------------------------------------------------------
+# Connection
+# ---------------------------------------------------------------------------
+
+def session_bus_addresses(env: Optional[dict] = None) -> Iterator[str]:
+    """Yield unix socket addresses of the session bus (``\\0`` = abstract)."""
+    env = os.environ if env is None else env
+    for entry in env.get("DBUS_SESSION_BUS_ADDRESS", "").split(";"):
+        transport, _, params = entry.partition(":")
+        if transport != "unix":
+            continue
+        options = dict(p.split("=", 1) for p in params.split(",") if "=" in p)
+        if "path" in options:
+            yield _unescape(options["path"])
+        elif "abstract" in options:
+            yield "\0" + _unescape(options["abstract"])
+    runtime = env.get("XDG_RUNTIME_DIR")
+    if runtime:
+        yield os.path.join(runtime, "bus")
+
+
+def _unescape(value: str) -> str:
+    out, i = bytearray(), 0
+    raw = value.encode()
+    while i < len(raw):
+        if raw[i:i + 1] == b"%":
+            out.append(int(raw[i + 1:i + 3], 16))
+            i += 3
+        else:
+            out.append(raw[i])
+            i += 1
+    return out.decode()
+
+
+class DBusConnection:
+    """Authenticated connection with a reader thread for replies and signals.
+
+    :meth:`call` may be used from any thread; signal callbacks run on the
+    connection's reader thread and must not block.
+    """
+
+    def __init__(self, sock: socket.socket, timeout: float = 2.0):
+        self._sock = sock
+        self._serials = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._replies: dict[int, Message] = {}
+        self._waiting: set[int] = set()   # serials of calls awaiting a reply
+        self._handlers: list[tuple[dict[str, str], Callable[[Message], None]]] = []
+        self._closed = False
+        sock.settimeout(timeout)
+        self._authenticate()
+        sock.settimeout(None)
+        self._thread = threading.Thread(target=self._read_loop, daemon=True, name="lswitch-dbus")
+        self._thread.start()
+        (self.unique_name,) = self.call(BUS_NAME, BUS_PATH, BUS_NAME, "Hello", timeout=timeout)
+
+    @classmethod
+    def session(cls, timeout: float = 2.0, env: Optional[dict] = None) -> "DBusConnection":
+        """Connect to the session bus; raises OSError if none is reachable."""
+        error: Exception = OSError("no session bus address")
+        for address in session_bus_addresses(env):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(address)
+                return cls(sock, timeout=timeout)
+            except (OSError, DBusError, TimeoutError) as exc:
+                sock.close()
+                error = exc
+        raise OSError(f"cannot connect to session bus: {error}")
+
+    # -- protocol ----------------------------------------------------------
+
+    def _authenticate(self) -> None:
+        uid = str(os.getuid()).encode().hex()
+        self._sock.sendall(b"\0AUTH EXTERNAL " + uid.encode() + b"\r\n")
+        line = self._recv_line()
+        if not line.startswith(b"OK "):
+            raise DBusError("org.freedesktop.DBus.Error.AuthFailed", line.decode(errors="replace"))
+        self._sock.sendall(b"BEGIN\r\n")
+
+    def _recv_line(self) -> bytes:
+        data = bytearray()
+        while not data.endswith(b"\r\n"):
+            chunk = self._sock.recv(1)
+            if not chunk:
+                raise OSError("bus closed during authentication")
+            data.extend(chunk)
+        return bytes(data[:-2])
+
+    def _read_loop(self) -> None:
+        buf = b""
+        try:
+            while True:
+                chunk = self._sock.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+                while True:
+                    parsed = Message.decode(buf)
+                    if parsed is None:
+                        break
+                    msg, used = parsed
+                    buf = buf[used:]
+                    self._dispatch(msg)
+        except (OSError, ValueError, DBusError, struct.error) as exc:
+            if not self._closed:
+                logger.debug("D-Bus connection lost: %s", exc)
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+
+    def _dispatch(self, msg: Message) -> None:
+        if msg.type in (METHOD_RETURN, ERROR):
+            with self._cond:
+                if msg.reply_serial in self._waiting:   # else the caller timed out
+                    self._replies[msg.reply_serial] = msg
+                    self._cond.notify_all()
+        elif msg.type == SIGNAL:
+            for match, callback in self._handlers:
+                if all(getattr(msg, key) == value for key, value in match.items()):
+                    try:
+                        callback(msg)
+                    except Exception:
+                        logger.exception("D-Bus signal handler error for %s", msg.member)
+
+    def _send(self, msg: Message, expect_reply: bool = True) -> int:
+        with self._send_lock:
+            msg.serial = next(self._serials)
+            if expect_reply:
+                with self._cond:
+                    self._waiting.add(msg.serial)
+            self._sock.sendall(msg.encode())
+        return msg.serial
+
+    # -- public API --------------------------------------------------------
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: tuple = (),
+        timeout: float = 3.0,
+    ) -> tuple:
+        """Call a method and return the reply body; raises DBusError."""
+        if self._closed:
+            raise DBusError("org.freedesktop.DBus.Error.Disconnected", "connection closed")
+        fields = {_PATH: path, _INTERFACE: interface, _MEMBER: member, _DESTINATION: destination}
+        if signature:
+            fields[_SIGNATURE] = signature
+        serial = self._send(Message(METHOD_CALL, fields, tuple(args)))
+        with self._cond:
+            try:
+                if not self._cond.wait_for(
+                    lambda: serial in self._replies or self._closed, timeout,
+                ):
+                    raise DBusError("org.freedesktop.DBus.Error.NoReply", f"{member} timed out")
+                reply = self._replies.pop(serial, None)
+            finally:
+                self._waiting.discard(serial)
+        if reply is None:
+            raise DBusError("org.freedesktop.DBus.Error.Disconnected", "connection closed")
+        if reply.type == ERROR:
+            raise DBusError(reply.error_name, reply.body[0] if reply.body else "")
+        return reply.body
+
+    def subscribe(
+        self,
+        callback: Callable[[Message], None],
+        sender: Optional[str] = None,
+        path: Optional[str] = None,
+        interface: Optional[str] = None,
+        member: Optional[str] = None,
+        arg0: Optional[str] = None,
+    ) -> None:
+        """Register *callback* for matching signals (AddMatch on the bus)."""
+        rule = ["type='signal'"]
+        match: dict[str, str] = {}
+        for key, value in (("sender", sender), ("path", path),
+                           ("interface", interface), ("member", member)):
+            if value is not None:
+                rule.append(f"{key}='{value}'")
+                if key != "sender":     # signals carry the unique name
+                    match[key] = value
+        if arg0 is not None:
+            rule.append(f"arg0='{arg0}'")
+        self._handlers.append((match, callback))
+        self.call(BUS_NAME, BUS_PATH, BUS_NAME, "AddMatch", "s", (",".join(rule),))
+
+    def close(self) -> None:
+        self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Future
 from typing import Any, Callable, Protocol, TypeVar
 
 
@@ -9,16 +10,32 @@ T = TypeVar("T")
 
 
 class MainThreadInvoker(Protocol):
-    """Runs callables on the runtime's main/UI thread."""
+    """Runs callables on the runtime's main/UI thread.
+
+    ``coalesce=True`` marks an idempotent read: an identical request still
+    waiting for the main thread may answer it instead of a new execution.
+    ``label`` names the call in queue statistics where they are kept.
+    """
 
     def call(
         self,
         func: Callable[..., T],
         *args: Any,
         timeout: float | None = None,
+        coalesce: bool = False,
+        label: str | None = None,
         **kwargs: Any,
     ) -> T: ...
 
+    def submit(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        coalesce: bool = False,
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> "Future[T]": ...
+
 
 class DirectMainThreadInvoker:
     """Invoker for code paths that are already safe to run directly."""
@@ -28,6 +45,23 @@ class DirectMainThreadInvoker:
         func: Callable[..., T],
         *args: Any,
         timeout: float | None = None,
+        coalesce: bool = False,
+        label: str | None = None,
         **kwargs: Any,
     ) -> T:
         return func(*args, **kwargs)
+
+    def submit(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        coalesce: bool = False,
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> "Future[T]":
+        future: Future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
@@ -146,17 +146,22 @@ def create_x11_platform_adapters(
 ) -> PlatformAdapters:
     """Create the current production X11 adapter set."""
     from lswitch.platform.selection_adapter import X11SelectionAdapter
-    from lswitch.platform.subprocess_impl import SubprocessSystemAdapter
+    from lswitch.platform.x11_selection import X11SelectionClient, X11SystemAdapter
     from lswitch.platform.xkb_adapter import X11XKBAdapter
 
-    system = SubprocessSystemAdapter(debug=debug)
+    virtual_kb = VirtualKeyboard(debug=debug, timing=dict(timing or {}))
+    system = X11SystemAdapter(
+        debug=debug,
+        client=X11SelectionClient.open(),
+        virtual_kb=virtual_kb,
+    )
     xkb = X11XKBAdapter(debug=debug)
     selection = X11SelectionAdapter(
         system=system,
         debug=debug,
         timing=dict(selection_timing or {}),
     )
-    virtual_kb = VirtualKeyboard(debug=debug, timing=dict(timing or {}))
+    virtual_kb.set_char_lookup(xkb.char_to_key)
     return PlatformAdapters(
         session_type="x11",
         compositor=compositor or "unknown",
@@ -221,6 +226,7 @@ def create_wayland_platform_adapters(
         strategy=selection_strategy,
         timing=dict(wayland_selection_timing or {}),
     )
+    watching = system.start_clipboard_watch()
     return PlatformAdapters(
         session_type="wayland",
         compositor=compositor or "unknown",
@@ -228,7 +234,8 @@ def create_wayland_platform_adapters(
         xkb=xkb,
         selection=selection,
         virtual_kb=virtual_kb,
-        selection_polling_enabled=False,
+        # Only with a primary watcher: the polling fallback would send Ctrl+C.
+        selection_polling_enabled=watching and selection.strategy != "disabled",
         main_thread=main_thread,
         selection_mouse_release_tracking_enabled=True,
     )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -10,6 +11,8 @@ from typing import Callable
 from lswitch.intelligence.maps import EN_TO_RU
 from lswitch.platform.system_adapter import ISystemAdapter
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class SelectionInfo:
@@ -31,6 +34,14 @@ class ISelectionAdapter(ABC):
     @abstractmethod
     def expand_selection_to_word(self) -> SelectionInfo: ...
 
+    def watch_owner_changes(self, callback: Callable[[int], None]) -> bool:
+        """Push ``callback(owner_id)`` on selection owner changes.
+
+        Returns False when the platform cannot notify, in which case the
+        caller falls back to polling :meth:`get_selection`.
+        """
+        return False
+
 
 def get_passive_selection_reader(selection) -> Callable[[], SelectionInfo] | None:
     """Return a no-shortcut selection reader when an adapter provides one."""
@@ -64,19 +75,6 @@ def _is_layout_word_char(ch: str) -> bool:
 # X11SelectionAdapter — concrete implementation
 # ---------------------------------------------------------------------------
 
-def _get_selection_owner_id() -> int:
-    """Return window ID of the PRIMARY selection owner via Xlib, or 0."""
-    try:
-        from Xlib import display as xdisplay, Xatom, X
-        d = xdisplay.Display()
-        owner = d.get_selection_owner(Xatom.PRIMARY)
-        owner_id = owner.id if owner and owner != X.NONE else 0
-        d.close()
-        return owner_id
-    except Exception:
-        return 0
-
-
 class X11SelectionAdapter(ISelectionAdapter):
     """Selection adapter for X11 — reads PRIMARY selection and tracks freshness.
 
@@ -86,6 +84,7 @@ class X11SelectionAdapter(ISelectionAdapter):
 
     PASTE_DELAY = 0.02
     RESTORE_DELAY = 0.05
+    PASTE_TIMEOUT = 0.5
     EXPAND_SELECTION_DELAY = 0.05
     MAX_LAYOUT_WORD_PROBE_CHARS = 64
 
@@ -102,6 +101,9 @@ class X11SelectionAdapter(ISelectionAdapter):
         self.RESTORE_DELAY = float(
             timing.get("restore_delay", type(self).RESTORE_DELAY)
         )
+        self.PASTE_TIMEOUT = float(
+            timing.get("paste_timeout", type(self).PASTE_TIMEOUT)
+        )
         self.EXPAND_SELECTION_DELAY = float(
             timing.get(
                 "expand_selection_delay",
@@ -117,9 +119,12 @@ class X11SelectionAdapter(ISelectionAdapter):
 
     def get_selection(self) -> SelectionInfo:
         text = self._system.get_clipboard(selection="primary")
-        owner_id = _get_selection_owner_id()
+        owner_id = self._system.get_selection_owner("primary")
         return SelectionInfo(text=text, owner_id=owner_id, timestamp=time.time())
 
+    def watch_owner_changes(self, callback: Callable[[int], None]) -> bool:
+        return self._system.watch_selection_owner("primary", callback)
+
     def has_fresh_selection(self) -> bool:
         """Determine whether there is a *fresh* selection.
 
@@ -150,13 +155,18 @@ class X11SelectionAdapter(ISelectionAdapter):
         """Replace the current selection by setting clipboard and pasting.
 
         Sequence: save clipboard → set clipboard → Ctrl+V → restore clipboard.
+        The clipboard is restored as soon as the target app has read it when
+        the system adapter can tell (in-process ownership), otherwise after
+        ``RESTORE_DELAY``. Reads before Ctrl+V (clipboard managers copying
+        the new owner) do not count as the paste.
         """
         try:
             old_clip = self._system.get_clipboard(selection="clipboard")
             self._system.set_clipboard(new_text, selection="clipboard")
             time.sleep(self.PASTE_DELAY)
+            pasted_at = time.monotonic()
             self._system.send_key_sequence("ctrl+v")
-            time.sleep(self.RESTORE_DELAY)
+            self._wait_paste_consumed(pasted_at)
             # Restore the original clipboard
             if old_clip is not None:
                 self._system.set_clipboard(old_clip, selection="clipboard")
@@ -164,6 +174,23 @@ class X11SelectionAdapter(ISelectionAdapter):
         except Exception:
             return False
 
+    def _wait_paste_consumed(self, pasted_at: float) -> None:
+        served = self._system.wait_clipboard_served(
+            "clipboard", timeout=self.PASTE_TIMEOUT, since=pasted_at,
+        )
+        if served is None:
+            time.sleep(self.RESTORE_DELAY)
+        elif served:
+            logger.debug(
+                "Вставка: буфер прочитан через %.1f мс",
+                (time.monotonic() - pasted_at) * 1000,
+            )
+        else:
+            logger.debug(
+                "Вставка: буфер не прочитан за %.0f мс, восстанавливаю",
+                self.PASTE_TIMEOUT * 1000,
+            )
+
     def expand_selection_to_word(self) -> SelectionInfo:
         """Expand the current selection to the surrounding word via Ctrl+Shift+Left."""
         try:
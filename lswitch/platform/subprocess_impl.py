@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import subprocess
 
+from lswitch.input.signal_fd import child_argv
 from lswitch.platform.system_adapter import CommandResult, ISystemAdapter
 
 
@@ -15,7 +16,9 @@ class SubprocessSystemAdapter(ISystemAdapter):
 
     def run_command(self, args: list[str], timeout: float = 1.0) -> CommandResult:
         try:
-            r = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+            r = subprocess.run(
+                child_argv(args), capture_output=True, text=True, timeout=timeout,
+            )
             return CommandResult(stdout=r.stdout, stderr=r.stderr, returncode=r.returncode)
         except subprocess.TimeoutExpired:
             return CommandResult(stdout="", stderr="timeout", returncode=-1)
@@ -34,8 +37,21 @@ class SubprocessSystemAdapter(ISystemAdapter):
     def set_clipboard(self, text: str, selection: str = "clipboard") -> None:
         try:
             subprocess.run(
-                ["xclip", "-i", "-selection", selection],
+                child_argv(["xclip", "-i", "-selection", selection]),
                 input=text, text=True, timeout=1.0,
             )
         except Exception:
             pass
+
+    def get_selection_owner(self, selection: str = "primary") -> int:
+        """Query the owner over a one-shot Xlib connection, or return 0."""
+        try:
+            from Xlib import display as xdisplay, X
+            d = xdisplay.Display()
+            try:
+                owner = d.get_selection_owner(d.intern_atom(selection.upper()))
+                return owner.id if owner and owner != X.NONE else 0
+            finally:
+                d.close()
+        except Exception:
+            return 0
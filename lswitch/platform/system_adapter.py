@@ -29,3 +29,34 @@ class ISystemAdapter(ABC):
 
     @abstractmethod
     def set_clipboard(self, text: str, selection: str = "clipboard") -> None: ...
+
+    def get_selection_owner(self, selection: str = "primary") -> int:
+        """Window ID owning *selection*, or 0 when unknown."""
+        return 0
+
+    def watch_selection_owner(self, selection: str, callback) -> bool:
+        """Call ``callback(owner_id)`` on owner changes; False if unsupported."""
+        return False
+
+    def clipboard_generation(self, selection: str = "clipboard") -> int | None:
+        """Counter bumped on every change of *selection*; None if not observed."""
+        return None
+
+    def wait_clipboard_change(
+        self, selection: str, generation: int, timeout: float,
+    ) -> bool:
+        """Wait until clipboard_generation() moves past *generation*."""
+        return False
+
+    def wait_clipboard_served(
+        self, selection: str = "clipboard", timeout: float = 0.5,
+        since: float | None = None,
+    ) -> bool | None:
+        """Wait until the text from the last set_clipboard() was read.
+
+        Only reads at or after *since* (``time.monotonic()``) count when it
+        is given. Returns None when the adapter cannot observe reads (the
+        caller then falls back to a fixed delay), else whether it happened
+        in time.
+        """
+        return None
@@ -7,15 +7,20 @@ paths fail fast with actionable errors.
 
 from __future__ import annotations
 
+import base64
+import binascii
 from dataclasses import dataclass
 import logging
+import os
 import re
 import shutil
 import subprocess
+import threading
 import time
 from typing import Callable, Optional
 
 from lswitch.input.virtual_keyboard import VirtualKeyboard
+from lswitch.intelligence.persistence import load_json, save_json
 from lswitch.platform.main_thread import MainThreadInvoker
 from lswitch.platform.selection_adapter import (
     ISelectionAdapter,
@@ -30,6 +35,9 @@ from lswitch.platform.xkb_adapter import IXKBAdapter, LayoutInfo
 
 logger = logging.getLogger(__name__)
 
+# Where KdeLayoutBackend remembers the layout switch method that works
+KDE_LAYOUT_STATE_PATH = os.path.expanduser("~/.config/lswitch/kde_layout.json")
+
 
 class WaylandBackendNotImplementedError(NotImplementedError):
     """Raised when a Wayland adapter path is not implemented yet."""
@@ -52,6 +60,163 @@ class DbusUInt32:
             raise ValueError("D-Bus uint32 value is out of range")
 
 
+@dataclass
+class SwitchMethodTiming:
+    """Latency of one KDE layout switch method, shown by ``--diagnose-wayland``."""
+
+    calls: int = 0
+    failures: int = 0
+    total: float = 0.0
+    last: float = 0.0
+
+    def record(self, elapsed: float, ok: bool) -> None:
+        self.calls += 1
+        self.failures += 0 if ok else 1
+        self.total += elapsed
+        self.last = elapsed
+
+    def format(self) -> str:
+        mean = self.total / self.calls if self.calls else 0.0
+        detail = f"{mean * 1000:.1f} ms avg, last {self.last * 1000:.1f} ms, {self.calls} calls"
+        if self.failures:
+            detail += f", {self.failures} failed"
+        return detail
+
+
+class WlPasteWatcher:
+    """Long-lived ``wl-paste --watch`` helper for one selection.
+
+    wl-paste runs a tiny shell command on every change of the selection,
+    which writes the new content to our pipe as one base64 line. A reader
+    thread keeps the latest text, bumps :attr:`generation` and wakes
+    :meth:`wait_change` callers and listeners, so reads are served from
+    memory instead of forking ``wl-paste`` each time.
+
+    :attr:`text` is None while the content is unknown: before the first
+    line, after our own writes (until wl-paste reports them), for content
+    that is not UTF-8 or larger than ``MAX_TEXT_BYTES``, and once the
+    helper has exited. Callers then fall back to a one-shot read. After
+    :meth:`invalidate` only the line carrying our own text makes the cache
+    valid again, so a late report of an older change cannot pass for it.
+    """
+
+    MAX_TEXT_BYTES = 1 << 20
+
+    def __init__(
+        self,
+        selection: str,
+        popen: Callable[..., subprocess.Popen] | None = None,
+    ) -> None:
+        self.selection = selection
+        self._popen = popen or subprocess.Popen
+        self._proc: subprocess.Popen | None = None
+        self._thread: threading.Thread | None = None
+        self._cond = threading.Condition()
+        self._listeners: list[Callable[[str], None]] = []
+        self.text: str | None = None
+        self.generation = 0
+        self._expected: str | None = None
+
+    def start(self) -> bool:
+        report = f"head -c {self.MAX_TEXT_BYTES + 1} | base64 -w0; echo"
+        args = ["wl-paste", "--watch", "sh", "-c", report]
+        if self.selection == "primary":
+            args.insert(1, "--primary")
+        try:
+            self._proc = self._popen(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exc:
+            logger.debug("wl-paste --watch (%s) failed to start: %s", self.selection, exc)
+            self._proc = None
+            return False
+        self._thread = threading.Thread(
+            target=self._read,
+            args=(self._proc.stdout,),
+            daemon=True,
+            name=f"lswitch-wl-watch-{self.selection}",
+        )
+        self._thread.start()
+        return True
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def cached(self) -> str | None:
+        """Current text, or None when it is unknown."""
+        with self._cond:
+            return self.text if self.alive else None
+
+    def invalidate(self, expected: str) -> None:
+        """Forget the cached text; we are about to set it to *expected*."""
+        with self._cond:
+            self.text = None
+            self._expected = expected
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        self._listeners.append(callback)
+
+    def wait_change(self, generation: int, timeout: float) -> bool:
+        """Wait until :attr:`generation` moves past *generation*."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self.generation != generation or not self.alive,
+                timeout,
+            )
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            try:
+                proc.terminate()
+                proc.wait(timeout=1.0)
+            except Exception:
+                pass
+        with self._cond:
+            self.text = None
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def _read(self, stream) -> None:
+        try:
+            for line in stream:
+                text = self._decode(line)
+                with self._cond:
+                    if self._expected is None or text == self._expected:
+                        self._expected = None
+                        self.text = text
+                    self.generation += 1
+                    self._cond.notify_all()
+                for listener in list(self._listeners):
+                    try:
+                        listener(text or "")
+                    except Exception:
+                        logger.exception("wl-paste watch listener failed")
+        except (OSError, ValueError):
+            pass
+        with self._cond:
+            self.text = None
+            self._cond.notify_all()
+        logger.debug("wl-paste --watch (%s) exited", self.selection)
+
+    def _decode(self, line: bytes) -> str | None:
+        try:
+            data = base64.b64decode(line.strip(), validate=True)
+        except (binascii.Error, ValueError):
+            return None
+        if len(data) > self.MAX_TEXT_BYTES:
+            return None
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+
 class _WaylandUnsupported:
     def __init__(self, compositor: str = "unknown", debug: bool = False) -> None:
         self.compositor = compositor or "unknown"
@@ -66,9 +231,18 @@ class _WaylandUnsupported:
 
 
 class WaylandSystemAdapter(_WaylandUnsupported, ISystemAdapter):
-    """Wayland implementation for key sequences and Qt clipboard access."""
+    """Wayland implementation for key sequences and Qt clipboard access.
+
+    After :meth:`start_clipboard_watch` clipboard and primary reads are
+    served from :class:`WlPasteWatcher` caches while the helpers run.
+    """
 
     WL_CLIPBOARD_TIMEOUT = 1.0
+    # Per-paste private text type: wl-copy offers the usual text types next
+    # to it, and seeing it in --list-types proves our helper owns the
+    # clipboard (a previous owner cannot advertise it).
+    PASTE_ONCE_MIME_PREFIX = "text/x-lswitch-paste-once-"
+    PASTE_READY_POLL_INTERVAL = 0.01
 
     def __init__(
         self,
@@ -80,6 +254,7 @@ class WaylandSystemAdapter(_WaylandUnsupported, ISystemAdapter):
         command_lookup: Callable[[str], str | None] | None = None,
         command_runner: Callable[..., subprocess.CompletedProcess[str]] | None = None,
         timing: dict | None = None,
+        command_popen: Callable[..., subprocess.Popen] | None = None,
     ) -> None:
         super().__init__(compositor=compositor, debug=debug)
         self.virtual_kb = virtual_kb
@@ -87,7 +262,11 @@ class WaylandSystemAdapter(_WaylandUnsupported, ISystemAdapter):
         self.enable_wl_clipboard = enable_wl_clipboard
         self._command_lookup = command_lookup or shutil.which
         self._command_runner = command_runner or subprocess.run
+        self._command_popen = command_popen or subprocess.Popen
         self._wl_clipboard_available: bool | None = None
+        self._watchers: dict[str, WlPasteWatcher] = {}
+        self._paste_once: dict[str, subprocess.Popen] = {}
+        self._paste_once_alive_at: dict[str, float] = {}
         timing = timing or {}
         self.WL_CLIPBOARD_TIMEOUT = float(
             timing.get("wl_clipboard_timeout", type(self).WL_CLIPBOARD_TIMEOUT)
@@ -103,6 +282,11 @@ class WaylandSystemAdapter(_WaylandUnsupported, ISystemAdapter):
         return self.virtual_kb.type_text(text, layout_name=layout_name)
 
     def get_clipboard(self, selection: str = "primary") -> str:
+        watcher = self._live_watcher(selection)
+        if watcher is not None:
+            text = watcher.cached()
+            if text is not None:
+                return text
         text = self._get_wl_clipboard(selection)
         if text is not None:
             return text
@@ -113,6 +297,7 @@ class WaylandSystemAdapter(_WaylandUnsupported, ISystemAdapter):
         )
 
     def set_clipboard(self, text: str, selection: str = "clipboard") -> None:
+        self._invalidate_watcher(selection, text)
         if self._set_wl_clipboard(text, selection):
             return
         self.main_thread.call(
@@ -128,6 +313,7 @@ class WaylandSystemAdapter(_WaylandUnsupported, ISystemAdapter):
         selection: str = "clipboard",
         mime_type: str = "text/plain;charset=utf-8",
     ) -> None:
+        self._invalidate_watcher(selection, text)
         if self._set_wl_clipboard(text, selection, mime_type=mime_type):
             return
         self.main_thread.call(
@@ -138,6 +324,190 @@ class WaylandSystemAdapter(_WaylandUnsupported, ISystemAdapter):
             timeout=1.0,
         )
 
+    # -- wl-paste --watch helpers -------------------------------------------
+
+    def start_clipboard_watch(self) -> bool:
+        """Start the clipboard and primary watchers.
+
+        Returns True when primary changes are observed, i.e. when
+        :meth:`watch_selection_owner` can notify about new selections.
+        """
+        if not self._watchers:
+            for selection in ("clipboard", "primary"):
+                if not self._can_use_wl_clipboard(selection):
+                    continue
+                watcher = WlPasteWatcher(selection, popen=self._command_popen)
+                if watcher.start():
+                    self._watchers[selection] = watcher
+            if self._watchers:
+                logger.debug("wl-paste --watch helpers: %s", ", ".join(self._watchers))
+        return "primary" in self._watchers
+
+    def clipboard_generation(self, selection: str = "clipboard") -> int | None:
+        """Change counter of *selection*, or None when it is not watched."""
+        watcher = self._live_watcher(selection)
+        return watcher.generation if watcher is not None else None
+
+    def wait_clipboard_change(
+        self, selection: str, generation: int, timeout: float,
+    ) -> bool:
+        watcher = self._live_watcher(selection)
+        if watcher is None:
+            return False
+        return watcher.wait_change(generation, timeout)
+
+    def watch_selection_owner(self, selection: str, callback) -> bool:
+        """Wayland has no owner IDs; the change counter stands in for them."""
+        watcher = self._live_watcher(selection)
+        if watcher is None:
+            return False
+        watcher.add_listener(lambda text: callback(watcher.generation if text else 0))
+        return True
+
+    # -- paste-once replacement --------------------------------------------
+
+    def set_clipboard_paste_once(
+        self,
+        text: str,
+        selection: str = "clipboard",
+        ready_timeout: float = 0.12,
+    ) -> bool:
+        """Serve *text* through ``wl-copy --foreground --paste-once``.
+
+        The helper exits after the first read, which
+        :meth:`wait_clipboard_served` reports as the paste being consumed.
+        Our own watcher would be that first read, so it is paused until
+        then. Returns True once the helper owns the selection; False when
+        wl-clipboard is unavailable, the helper is not visible within
+        *ready_timeout* or something else consumed the text before Ctrl+V
+        could be sent (the helper is stopped then).
+        """
+        if not self._can_use_wl_clipboard(selection):
+            return False
+        normalized = self._normalize_clipboard_selection(selection)
+        self._finish_paste_once(normalized)
+        watcher = self._watchers.get(normalized)
+        if watcher is not None:
+            watcher.close()
+        marker = f"{self.PASTE_ONCE_MIME_PREFIX}{time.monotonic_ns()}"
+        args = self._wl_clipboard_args("wl-copy", selection, mime_type=marker)
+        args[1:1] = ["--foreground", "--paste-once"]
+        try:
+            proc = self._command_popen(
+                args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            proc.stdin.write(text.encode("utf-8"))
+            proc.stdin.close()
+        except (OSError, ValueError) as exc:
+            logger.debug("wl-copy --paste-once failed to start: %s", exc)
+            self._resume_watcher(normalized)
+            return False
+        self._paste_once[normalized] = proc
+        if self._wait_paste_once_ready(proc, selection, marker, ready_timeout):
+            return True
+        self._finish_paste_once(normalized)
+        return False
+
+    def paste_once_pending(self, selection: str = "clipboard") -> bool:
+        """Whether the paste-once helper still waits for its single read."""
+        normalized = self._normalize_clipboard_selection(selection)
+        proc = self._paste_once.get(normalized)
+        if proc is None or proc.poll() is not None:
+            return False
+        self._paste_once_alive_at[normalized] = time.monotonic()
+        return True
+
+    def wait_clipboard_served(
+        self, selection: str = "clipboard", timeout: float = 0.5,
+        since: float | None = None,
+    ) -> bool | None:
+        """Wait for the paste-once helper to exit; None without one.
+
+        With *since* only an exit after it counts: a helper already gone
+        and last seen alive before *since* was read by someone else
+        (a clipboard manager), so None is returned like without a helper.
+        """
+        normalized = self._normalize_clipboard_selection(selection)
+        proc = self._paste_once.get(normalized)
+        if proc is None:
+            return None
+        if (
+            since is not None
+            and proc.poll() is not None
+            and self._paste_once_alive_at.get(normalized, 0.0) < since
+        ):
+            logger.debug("wl-copy --paste-once was read before Ctrl+V")
+            self._finish_paste_once(normalized)
+            return None
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        return self._finish_paste_once(normalized)
+
+    def _wait_paste_once_ready(
+        self, proc: subprocess.Popen, selection: str, marker: str, timeout: float,
+    ) -> bool:
+        """Poll ``wl-paste --list-types`` (which reads no data) for *marker*."""
+        deadline = time.monotonic() + timeout
+        while proc.poll() is None:
+            result = self._run_wl_command(
+                self._wl_clipboard_args("wl-paste", selection) + ["--list-types"],
+                timeout=self.WL_CLIPBOARD_TIMEOUT,
+            )
+            if marker in result.stdout.split():
+                return True
+            if time.monotonic() >= deadline:
+                # The previous owner may still hold the clipboard: Ctrl+V
+                # now would paste it over the selection.
+                logger.debug("wl-copy --paste-once not visible after %.0f ms", timeout * 1000)
+                return False
+            time.sleep(self.PASTE_READY_POLL_INTERVAL)
+        logger.debug("wl-copy --paste-once consumed before Ctrl+V (clipboard manager?)")
+        return False
+
+    def _finish_paste_once(self, selection: str) -> bool:
+        """Stop the paste-once helper; True when it exited after a read."""
+        proc = self._paste_once.pop(selection, None)
+        self._paste_once_alive_at.pop(selection, None)
+        if proc is None:
+            return False
+        served = proc.poll() == 0
+        if not served:
+            try:
+                proc.terminate()
+                proc.wait(timeout=1.0)
+            except Exception:
+                pass
+        self._resume_watcher(selection)
+        return served
+
+    def _resume_watcher(self, selection: str) -> None:
+        watcher = self._watchers.get(selection)
+        if watcher is not None and not watcher.alive:
+            watcher.start()
+
+    def close(self) -> None:
+        for selection in list(self._paste_once):
+            self._finish_paste_once(selection)
+        watchers, self._watchers = self._watchers, {}
+        for watcher in watchers.values():
+            watcher.close()
+
+    def _live_watcher(self, selection: str) -> WlPasteWatcher | None:
+        watcher = self._watchers.get(self._normalize_clipboard_selection(selection))
+        if watcher is None or not watcher.alive:
+            return None
+        return watcher
+
+    def _invalidate_watcher(self, selection: str, text: str) -> None:
+        watcher = self._watchers.get(self._normalize_clipboard_selection(selection))
+        if watcher is not None:
+            watcher.invalidate(text)
+
     def _get_clipboard_on_main_thread(self, selection: str) -> str:
         clipboard, mode = self._qt_clipboard_and_mode(selection)
         return clipboard.text(mode)
@@ -313,6 +683,7 @@ class WaylandSelectionAdapter(_WaylandUnsupported, ISelectionAdapter):
     COPY_RETRY_DELAY = 0.1
     PASTE_DELAY = 0.12
     RESTORE_DELAY = 0.15
+    PASTE_TIMEOUT = 0.5
     EXPAND_SELECTION_DELAY = 0.2
     MAX_LAYOUT_WORD_PROBE_CHARS = 64
     COPY_SENTINEL_PREFIX = "__LSWITCH_COPY_SENTINEL__"
@@ -348,6 +719,9 @@ class WaylandSelectionAdapter(_WaylandUnsupported, ISelectionAdapter):
         self.RESTORE_DELAY = float(
             timing.get("restore_delay", type(self).RESTORE_DELAY)
         )
+        self.PASTE_TIMEOUT = float(
+            timing.get("paste_timeout", type(self).PASTE_TIMEOUT)
+        )
         self.EXPAND_SELECTION_DELAY = float(
             timing.get(
                 "expand_selection_delay",
@@ -388,6 +762,10 @@ class WaylandSelectionAdapter(_WaylandUnsupported, ISelectionAdapter):
             logger.log(5, "Wayland passive primary selection read %d chars", len(text))
         return SelectionInfo(text=text, owner_id=0, timestamp=time.time())
 
+    def watch_owner_changes(self, callback: Callable[[int], None]) -> bool:
+        """Notify about primary changes through the system's wl-paste watcher."""
+        return self.system.watch_selection_owner("primary", callback)
+
     def has_fresh_selection(self) -> bool:
         info = self.get_selection()
         if not info.text:
@@ -407,10 +785,20 @@ class WaylandSelectionAdapter(_WaylandUnsupported, ISelectionAdapter):
         if old_clipboard is None:
             old_clipboard = self.system.get_clipboard(selection="clipboard")
         try:
-            self.system.set_clipboard(new_text, selection="clipboard")
-            time.sleep(self.PASTE_DELAY)
+            paste_once = self._set_paste_once(new_text)
+            if not paste_once:
+                self.system.set_clipboard(new_text, selection="clipboard")
+                time.sleep(self.PASTE_DELAY)
+            pasted_at = time.monotonic()
+            if paste_once and not self._paste_once_pending():
+                # A clipboard manager took the single read: offer the text
+                # again and restore after the fixed delay.
+                logger.debug("Вставка: текст прочитан до Ctrl+V, предлагаю повторно")
+                self.system.set_clipboard(new_text, selection="clipboard")
+                time.sleep(self.PASTE_DELAY)
+                pasted_at = time.monotonic()
             self.system.send_key_sequence("ctrl+v")
-            time.sleep(self.RESTORE_DELAY)
+            self._wait_paste_consumed(pasted_at)
             self.system.set_clipboard(old_clipboard, selection="clipboard")
             return True
         except Exception as exc:
@@ -419,6 +807,40 @@ class WaylandSelectionAdapter(_WaylandUnsupported, ISelectionAdapter):
         finally:
             self._saved_clipboard = None
 
+    def _set_paste_once(self, text: str) -> bool:
+        """Offer *text* for exactly one paste; PASTE_DELAY bounds the setup."""
+        setter = getattr(self.system, "set_clipboard_paste_once", None)
+        if not callable(setter):
+            return False
+        try:
+            return bool(setter(text, selection="clipboard", ready_timeout=self.PASTE_DELAY))
+        except Exception as exc:
+            logger.debug("Wayland paste-once clipboard failed: %s", exc)
+            return False
+
+    def _paste_once_pending(self) -> bool:
+        checker = getattr(self.system, "paste_once_pending", None)
+        return checker("clipboard") if callable(checker) else True
+
+    def _wait_paste_consumed(self, pasted_at: float) -> None:
+        waiter = getattr(self.system, "wait_clipboard_served", None)
+        served = (
+            waiter("clipboard", timeout=self.PASTE_TIMEOUT, since=pasted_at)
+            if callable(waiter) else None
+        )
+        if served is None:
+            time.sleep(self.RESTORE_DELAY)
+        elif served:
+            logger.debug(
+                "Вставка: буфер прочитан через %.1f мс",
+                (time.monotonic() - pasted_at) * 1000,
+            )
+        else:
+            logger.debug(
+                "Вставка: буфер не прочитан за %.0f мс, восстанавливаю",
+                self.PASTE_TIMEOUT * 1000,
+            )
+
     def prefers_direct_replacement(self) -> bool:
         return self.strategy == "primary_selection"
 
@@ -514,13 +936,25 @@ class WaylandSelectionAdapter(_WaylandUnsupported, ISelectionAdapter):
         return SelectionInfo(text="", owner_id=0, timestamp=time.time())
 
     def _wait_for_clipboard_copy(self, sentinel: str) -> str:
+        """Wait for the copy shortcut to replace *sentinel* in the clipboard.
+
+        With a clipboard watcher the wait sleeps until wl-paste reports a
+        change; otherwise the clipboard is polled every COPY_POLL_INTERVAL.
+        """
+        generation_of = getattr(self.system, "clipboard_generation", None)
         deadline = time.time() + self.COPY_WAIT_TIMEOUT
-        while time.time() < deadline:
+        while True:
+            generation = generation_of("clipboard") if callable(generation_of) else None
             current = self.system.get_clipboard(selection="clipboard")
             if current and current != sentinel:
                 return current
-            time.sleep(self.COPY_POLL_INTERVAL)
-        return ""
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return ""
+            if generation is None:
+                time.sleep(min(self.COPY_POLL_INTERVAL, remaining))
+            else:
+                self.system.wait_clipboard_change("clipboard", generation, remaining)
 
     def _copy_selection_to_clipboard(self, sentinel: str) -> str:
         for sequence in self.COPY_SHORTCUTS:
@@ -562,15 +996,31 @@ class WaylandSelectionAdapter(_WaylandUnsupported, ISelectionAdapter):
 
 
 class KdeKeyboardDbusClient:
-    """Small QtDBus wrapper for KDE keyboard layout service."""
+    """Small QtDBus wrapper for KDE keyboard layout service.
+
+    ``QDBusInterface`` objects introspect the service when created, so one
+    per interface is kept and reused; they live on the Qt main thread like
+    every call made through them.
+    """
 
     SERVICE = "org.kde.keyboard"
     PATH = "/Layouts"
     INTERFACE = "org.kde.KeyboardLayouts"
     INTROSPECTABLE_INTERFACE = "org.freedesktop.DBus.Introspectable"
+    SIGNALS = ("layoutChanged", "layoutListChanged")
+    # Identical queued requests for these share one D-Bus round trip
+    READ_ONLY_METHODS = frozenset({"getLayout", "getLayoutsList", "Introspect"})
+    # Error replies after which a cached interface is recreated
+    STALE_INTERFACE_ERRORS = frozenset({
+        "org.freedesktop.DBus.Error.ServiceUnknown",
+        "org.freedesktop.DBus.Error.UnknownObject",
+        "org.freedesktop.DBus.Error.Disconnected",
+    })
 
     def __init__(self, main_thread: MainThreadInvoker) -> None:
         self.main_thread = main_thread
+        self._interfaces: dict[str, object] = {}
+        self._signal_receiver = None
 
     def call(self, method: str, *args):
         return self.call_interface(self.INTERFACE, method, *args)
@@ -582,19 +1032,53 @@ class KdeKeyboardDbusClient:
             method,
             *args,
             timeout=1.0,
+            coalesce=method in self.READ_ONLY_METHODS,
+            label=f"{type(self).__name__}.{method}",
         )
 
     def introspect(self) -> str:
         return self.call_interface(self.INTROSPECTABLE_INTERFACE, "Introspect")
 
-    def _call_on_main_thread(self, interface: str, method: str, *args):
+    def subscribe(self, callback: Callable[[str, list], None]) -> bool:
+        """Deliver ``org.kde.KeyboardLayouts`` signals as *callback(member, args)*.
+
+        *callback* runs on the Qt main thread. Returns False when QtDBus
+        refused one of the matches.
+        """
+        return self.main_thread.call(self._subscribe_on_main_thread, callback, timeout=1.0)
+
+    def _subscribe_on_main_thread(self, callback: Callable[[str, list], None]) -> bool:
         try:
-            from PyQt6.QtDBus import QDBusConnection, QDBusInterface, QDBusMessage
+            from PyQt6.QtCore import QObject, pyqtSlot
+            from PyQt6.QtDBus import QDBusConnection, QDBusMessage
         except ImportError as exc:
             raise WaylandLayoutBackendError(
                 "PyQt6.QtDBus is required for KDE Wayland layout backend"
             ) from exc
 
+        class _SignalReceiver(QObject):
+            @pyqtSlot(QDBusMessage)
+            def deliver(self, message) -> None:
+                callback(message.member(), list(message.arguments()))
+
+        receiver = _SignalReceiver()
+        bus = QDBusConnection.sessionBus()
+        connected = [
+            bus.connect(self.SERVICE, self.PATH, self.INTERFACE, name, receiver.deliver)
+            for name in self.SIGNALS
+        ]
+        if not all(connected):
+            return False
+        self._signal_receiver = receiver
+        return True
+
+    def _interface(self, interface: str):
+        iface = self._interfaces.get(interface)
+        if iface is not None:
+            return iface
+
+        from PyQt6.QtDBus import QDBusConnection, QDBusInterface
+
         iface = QDBusInterface(
             self.SERVICE,
             self.PATH,
@@ -609,9 +1093,22 @@ class KdeKeyboardDbusClient:
                 f"{self.SERVICE} {self.PATH} {interface}"
                 + (f" ({message})" if message else "")
             )
+        self._interfaces[interface] = iface
+        return iface
+
+    def _call_on_main_thread(self, interface: str, method: str, *args):
+        try:
+            from PyQt6.QtDBus import QDBusMessage
+        except ImportError as exc:
+            raise WaylandLayoutBackendError(
+                "PyQt6.QtDBus is required for KDE Wayland layout backend"
+            ) from exc
 
+        iface = self._interface(interface)
         reply = iface.call(method, *(self._qtdbus_argument(arg) for arg in args))
         if reply.type() == QDBusMessage.MessageType.ErrorMessage:
+            if reply.errorName() in self.STALE_INTERFACE_ERRORS:
+                self._interfaces.pop(interface, None)
             raise WaylandLayoutBackendError(
                 f"KDE keyboard D-Bus method {method!r} failed: {reply.errorMessage()}"
             )
@@ -645,13 +1142,40 @@ class KdeKeyboardDbusClient:
 
 
 class KdeLayoutBackend:
-    """KDE Plasma keyboard layout backend using ``org.kde.KeyboardLayouts``."""
+    """KDE Plasma keyboard layout backend using ``org.kde.KeyboardLayouts``.
+
+    After :meth:`watch` the ``layoutChanged``/``layoutListChanged`` signals
+    keep the current index and the layout list up to date, so
+    :meth:`get_current_layout` answers from the cache instead of blocking
+    the caller on a Qt main-thread D-Bus call.
+
+    Plasma versions accept different ``setLayout`` argument shapes. The
+    first one that works is remembered, tried first on later switches and,
+    with *state_path*, kept across restarts for the same
+    ``KDE_SESSION_VERSION``. A remembered method that fails is forgotten
+    and the full list is probed again. ``switch_timings`` holds per-method
+    latency.
+    """
+
+    NEXT_CYCLE_METHOD = "switchToNextLayout"
 
-    def __init__(self, dbus_client, debug: bool = False) -> None:
+    def __init__(
+        self,
+        dbus_client,
+        debug: bool = False,
+        state_path: str | None = None,
+    ) -> None:
         self.dbus = dbus_client
         self.debug = debug
+        self.state_path = state_path
+        self._preferred_method: str | None = None
+        self._state_loaded = False
+        self.switch_timings: dict[str, SwitchMethodTiming] = {}
         self._layouts: list[LayoutInfo] | None = None
         self._raw_layouts: list = []
+        self._current_index: int | None = None
+        self._watching = False
+        self._on_change: Callable[[], None] | None = None
         self.last_switch_method: str | None = None
 
     def validate(self) -> None:
@@ -661,6 +1185,38 @@ class KdeLayoutBackend:
     def invalidate_cache(self) -> None:
         self._layouts = None
         self._raw_layouts = []
+        self._current_index = None
+
+    def watch(self, callback: Callable[[], None] | None = None) -> bool:
+        """Follow KDE layout signals; *callback* runs after each change.
+
+        Returns False when the D-Bus client cannot subscribe; the backend
+        then keeps asking KDE for the current layout on every call.
+        """
+        self._on_change = callback
+        if self._watching:
+            return True
+        subscribe = getattr(self.dbus, "subscribe", None)
+        if subscribe is None:
+            return False
+        try:
+            self._watching = bool(subscribe(self._on_signal))
+        except Exception as exc:
+            logger.debug("KDE keyboard layout signals unavailable: %s", exc)
+        return self._watching
+
+    def _on_signal(self, member: str, args: list) -> None:
+        """``org.kde.KeyboardLayouts`` signal (Qt main thread)."""
+        if member == "layoutChanged":
+            index = args[0] if args else None
+            self._current_index = (
+                index if isinstance(index, int) and index >= 0 else None
+            )
+        elif member == "layoutListChanged":
+            self.invalidate_cache()
+        callback = self._on_change
+        if callback is not None:
+            callback()
 
     def get_layouts(self) -> list[LayoutInfo]:
         if self._layouts is not None:
@@ -689,10 +1245,17 @@ class KdeLayoutBackend:
 
     def get_current_layout(self) -> LayoutInfo:
         layouts = self.get_layouts()
-        raw_current = self.dbus.call("getLayout")
-        index = self._current_index_from_raw(raw_current, layouts)
+        index = self._current_index
+        if index is None or index >= len(layouts):
+            index = self._read_current_index(layouts)
+            if self._watching:
+                self._current_index = index
         return layouts[index]
 
+    def _read_current_index(self, layouts: list[LayoutInfo]) -> int:
+        raw_current = self.dbus.call("getLayout")
+        return self._current_index_from_raw(raw_current, layouts)
+
     def switch_layout(self, target: Optional[LayoutInfo] = None) -> LayoutInfo:
         layouts = self.get_layouts()
         if target is None:
@@ -776,21 +1339,86 @@ class KdeLayoutBackend:
             f"KDE current layout {raw_current!r} is not in configured layouts"
         )
 
+    # -- switch method memo --------------------------------------------------
+
+    @property
+    def preferred_switch_method(self) -> str | None:
+        """Switch method that worked last time (loaded from *state_path*)."""
+        if not self._state_loaded:
+            self._state_loaded = True
+            if self.state_path:
+                state = load_json(self.state_path)
+                method = state.get("switch_method")
+                if (
+                    isinstance(method, str)
+                    and state.get("kde_session_version") == self._session_version()
+                ):
+                    self._preferred_method = method
+        return self._preferred_method
+
+    def _remember_switch_method(self, method: str | None) -> None:
+        if method == self.preferred_switch_method:
+            return
+        self._preferred_method = method
+        if method is None:
+            logger.debug("KDE: remembered layout switch method no longer works")
+        else:
+            logger.debug("KDE: layout switch method %s remembered", method)
+        if not self.state_path:
+            return
+        try:
+            save_json(self.state_path, {
+                "kde_session_version": self._session_version(),
+                "switch_method": method,
+            })
+        except OSError as exc:
+            logger.debug("KDE: could not save %s: %s", self.state_path, exc)
+
+    @staticmethod
+    def _session_version() -> str:
+        return os.environ.get("KDE_SESSION_VERSION", "")
+
+    def _timed_call(self, label: str, method: str, *args):
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = self.dbus.call(method, *args)
+            ok = True
+            return result
+        finally:
+            timing = self.switch_timings.get(label)
+            if timing is None:
+                timing = self.switch_timings[label] = SwitchMethodTiming()
+            timing.record(time.perf_counter() - started, ok)
+
     def _set_layout(self, new_index: int, layout: LayoutInfo) -> None:
         self.last_switch_method = None
-        attempts = self._set_layout_attempts(new_index, layout)
+        preferred = self.preferred_switch_method
         failures: list[str] = []
+        cycle_first = preferred == self.NEXT_CYCLE_METHOD
+        if cycle_first and self._switch_layout_by_next_cycle(new_index, failures):
+            return
+
+        attempts = self._set_layout_attempts(new_index, layout)
+        if preferred is not None:
+            attempts.sort(key=lambda attempt: attempt[0] != preferred)
         for label, args in attempts:
             try:
-                result = self.dbus.call("setLayout", *args)
+                result = self._timed_call(label, "setLayout", *args)
                 if result is False:
                     raise WaylandLayoutBackendError(f"{label} returned false")
-                self.last_switch_method = label
-                return
             except Exception as exc:
                 failures.append(f"{label}: {exc}")
+                if label == preferred:
+                    self._remember_switch_method(None)
+                continue
+            self.last_switch_method = label
+            self._remember_switch_method(label)
+            if self._watching:
+                self._current_index = new_index
+            return
 
-        if self._switch_layout_by_next_cycle(new_index, failures):
+        if not cycle_first and self._switch_layout_by_next_cycle(new_index, failures):
             return
 
         raise WaylandLayoutBackendError(
@@ -805,25 +1433,29 @@ class KdeLayoutBackend:
     ) -> bool:
         layouts = self.get_layouts()
         try:
-            current = self.get_current_layout()
-            steps = (new_index - current.index) % len(layouts)
+            steps = (new_index - self._read_current_index(layouts)) % len(layouts)
             if steps == 0:
                 self.last_switch_method = "already-current"
                 return True
 
             for _ in range(steps):
-                self.dbus.call("switchToNextLayout")
+                self._timed_call(self.NEXT_CYCLE_METHOD, "switchToNextLayout")
 
-            updated = self.get_current_layout()
-            if updated.index != new_index:
+            updated = self._read_current_index(layouts)
+            if updated != new_index:
                 raise WaylandLayoutBackendError(
                     "switchToNextLayout did not reach requested layout: "
-                    f"expected index {new_index}, got {updated.index}"
+                    f"expected index {new_index}, got {updated}"
                 )
+            if self._watching:
+                self._current_index = updated
             self.last_switch_method = f"switchToNextLayout x{steps}"
+            self._remember_switch_method(self.NEXT_CYCLE_METHOD)
             return True
         except Exception as exc:
             failures.append(f"switchToNextLayout: {exc}")
+            if self.preferred_switch_method == self.NEXT_CYCLE_METHOD:
+                self._remember_switch_method(None)
             return False
 
     def _set_layout_attempts(
@@ -883,6 +1515,7 @@ class WaylandLayoutAdapter(_WaylandUnsupported, IXKBAdapter):
             self.backend = KdeLayoutBackend(
                 KdeKeyboardDbusClient(main_thread=main_thread),
                 debug=debug,
+                state_path=KDE_LAYOUT_STATE_PATH,
             )
         if self.backend is not None and validate_backend:
             self.backend.validate()
@@ -897,6 +1530,14 @@ class WaylandLayoutAdapter(_WaylandUnsupported, IXKBAdapter):
             raise self._unsupported("get_current_layout")
         return self.backend.get_current_layout()
 
+    def watch_layout_changes(self, callback: Callable[[], None]) -> None:
+        # KDE signals arrive on the Qt main thread and call *callback*
+        # there; nothing is left for the evdev selector to serve.
+        watch = getattr(self.backend, "watch", None)
+        if callable(watch):
+            watch(callback)
+        return None
+
     def switch_layout(self, target: Optional[LayoutInfo] = None) -> LayoutInfo:
         if self.backend is None:
             raise self._unsupported("switch_layout")
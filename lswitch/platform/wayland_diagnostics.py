@@ -47,8 +47,13 @@ def run_wayland_diagnostics(
     dbus_client_factory: Callable[[object], object] | None = None,
     qt_app_factory: Callable[[], object] | None = None,
     invoker_factory: Callable[[object], object] | None = None,
+    state_path: str | None = None,
 ) -> DiagnosticReport:
-    """Probe Wayland/KDE runtime state without starting the daemon."""
+    """Probe Wayland/KDE runtime state without starting the daemon.
+
+    *state_path* is the daemon's switch method memo; the switch test
+    updates it like a real switch would.
+    """
     report = DiagnosticReport()
 
     session_type = detect_session_type(env)
@@ -123,7 +128,7 @@ def run_wayland_diagnostics(
         return report
 
     try:
-        backend = KdeLayoutBackend(dbus_client)
+        backend = KdeLayoutBackend(dbus_client, state_path=state_path)
         layouts = backend.get_layouts()
         current = backend.get_current_layout()
         report.add("ok", "parsed layouts", _format_layouts(layouts))
@@ -136,8 +141,16 @@ def run_wayland_diagnostics(
         report.add("fail", "parsed KDE layouts", str(exc))
         return report
 
+    report.add(
+        "info",
+        "remembered switch method",
+        backend.preferred_switch_method or "none",
+    )
+
     if switch_test:
         _run_switch_test(report, backend, current)
+        for method, timing in backend.switch_timings.items():
+            report.add("info", f"switch latency {method}", timing.format())
     else:
         report.add("info", "switch test", "skipped; pass --diagnose-wayland-switch-test")
 
@@ -0,0 +1,481 @@
+"""In-process X11 selection access (python-xlib).
+
+``X11SelectionClient`` keeps one display connection and a hidden 1×1
+window for the life of the process:
+
+* reads send ``ConvertSelection`` to that window and wait for the
+  ``SelectionNotify`` (INCR transfers included);
+* writes make the window the selection owner and answer
+  ``SelectionRequest`` events from the client's own thread, so the text
+  stays available after ``set`` returns;
+* owner lookups reuse the same connection, and XFixes owner-change
+  notifications arrive on it instead of being polled for.
+
+``X11SystemAdapter`` plugs the client into ``SubprocessSystemAdapter``.
+The xclip-based methods stay as the fallback when python-xlib or the
+display is unavailable, the connection drops, or a write is too large
+to serve in one property change.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from lswitch.platform.subprocess_impl import SubprocessSystemAdapter
+
+logger = logging.getLogger(__name__)
+
+_TEXT_TARGETS = ("UTF8_STRING", "text/plain;charset=utf-8", "TEXT")
+
+
+class X11SelectionClient:
+    """PRIMARY/CLIPBOARD reads and ownership over one Xlib connection.
+
+    Parameters:
+        display: ``Xlib.display.Display`` (opened after ``Xlib.threaded``).
+        window:  Hidden window created with ``PropertyChangeMask``.
+        atoms:   Interned atoms by name (see :meth:`open`).
+    """
+
+    ATOM_NAMES = (
+        "PRIMARY", "CLIPBOARD", "UTF8_STRING", "STRING", "TEXT", "TARGETS",
+        "INCR", "ATOM", "text/plain;charset=utf-8",
+        "LSWITCH_SELECTION", "LSWITCH_WAKE",
+    )
+
+    def __init__(self, display, window, atoms: dict[str, int]):
+        from Xlib import X
+        from Xlib.error import ConnectionClosedError
+
+        self._X = X
+        self._connection_errors = (ConnectionClosedError, OSError)
+        self._display = display
+        self._window = window
+        self._atoms = atoms
+        self._owned: dict[int, bytes] = {}       # selection atom -> served data
+        self._served: dict[int, threading.Event] = {}   # set once a paste read it
+        self._served_at: dict[int, float] = {}           # monotonic time of that read
+        self._read_lock = threading.Lock()
+        self._replies: queue.Queue = queue.Queue()
+        self._reading = False
+        self._closed = False
+        self._owner_watchers: dict[int, Callable[[int], None]] = {}
+        self._xfixes_event: Optional[int] = None
+        # Largest property a single ChangeProperty can carry (header slack).
+        self.max_inline = (display.display.info.max_request_length << 2) - 64
+        self._thread = threading.Thread(
+            target=self._serve, name="lswitch-selection", daemon=True,
+        )
+        self._thread.start()
+
+    @classmethod
+    def open(cls, display_name: Optional[str] = None) -> Optional["X11SelectionClient"]:
+        """Connect to the X server, or return None (no python-xlib/display)."""
+        try:
+            import Xlib.threaded  # noqa: F401 — must precede Display()
+            from Xlib import X, display as xdisplay
+
+            dpy = xdisplay.Display(display_name)
+        except Exception as exc:
+            logger.debug("In-process X11 selection unavailable: %s", exc)
+            return None
+        try:
+            atoms = {name: dpy.intern_atom(name) for name in cls.ATOM_NAMES}
+            window = dpy.screen().root.create_window(
+                -10, -10, 1, 1, 0, X.CopyFromParent,
+                event_mask=X.PropertyChangeMask,
+            )
+            return cls(dpy, window, atoms)
+        except Exception as exc:
+            logger.debug("X11 selection window setup failed: %s", exc)
+            dpy.close()
+            return None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # -- reads -------------------------------------------------------------
+
+    def read(self, selection: str = "primary", timeout: float = 0.3) -> str:
+        """Return the text of *selection*; ``""`` when empty or refused.
+
+        Raises ConnectionError when the X connection is gone.
+        """
+        atom = self._atoms[selection.upper()]
+        owned = self._owned.get(atom)
+        if owned is not None:
+            return owned.decode("utf-8", "replace")
+        try:
+            with self._read_lock:
+                text = self._convert(atom, self._atoms["UTF8_STRING"], timeout)
+                if text is None:
+                    text = self._convert(atom, self._atoms["STRING"], timeout)
+                return text or ""
+        except self._connection_errors as exc:
+            self._closed = True
+            raise ConnectionError(str(exc)) from exc
+        except Exception as exc:
+            logger.debug("Selection read failed: %s", exc)
+            return ""
+
+    def _convert(self, selection: int, target: int, timeout: float) -> Optional[str]:
+        """One ConvertSelection round; None when the owner refused *target*.
+
+        A silent owner yields ``""`` so the caller does not wait twice.
+        """
+        X, window = self._X, self._window
+        prop = self._atoms["LSWITCH_SELECTION"]
+        self._drain_replies()
+        window.convert_selection(selection, target, prop, X.CurrentTime)
+        self._display.flush()
+        notify = self._wait_reply("notify", timeout)
+        if notify is None:
+            return ""
+        if notify.property == X.NONE:
+            return None
+
+        reply = window.get_full_property(prop, X.AnyPropertyType, sizehint=4096)
+        if reply is None:
+            return None
+        if reply.property_type != self._atoms["INCR"]:
+            window.delete_property(prop)
+            self._display.flush()
+            return self._decode(reply.property_type, reply.value)
+
+        # INCR: every delete asks the owner for the next chunk; an empty
+        # chunk ends the transfer.
+        chunks: list[bytes] = []
+        prop_type = self._atoms["UTF8_STRING"]
+        self._reading = True
+        try:
+            window.delete_property(prop)
+            self._display.flush()
+            while True:
+                if self._wait_reply("property", timeout) is None:
+                    return ""
+                part = window.get_full_property(prop, X.AnyPropertyType, sizehint=65536)
+                window.delete_property(prop)
+                self._display.flush()
+                if part is None or not part.value:
+                    break
+                prop_type = part.property_type
+                chunks.append(_as_bytes(part.value))
+        finally:
+            self._reading = False
+        return self._decode(prop_type, b"".join(chunks))
+
+    def _decode(self, prop_type: int, value) -> str:
+        data = _as_bytes(value)
+        if prop_type == self._atoms["STRING"]:
+            return data.decode("latin-1")
+        return data.decode("utf-8", "replace")
+
+    def _wait_reply(self, kind: str, timeout: float):
+        try:
+            while True:
+                got_kind, event = self._replies.get(timeout=timeout)
+                if got_kind == kind:
+                    return event
+        except queue.Empty:
+            return None
+
+    def _drain_replies(self) -> None:
+        try:
+            while True:
+                self._replies.get_nowait()
+        except queue.Empty:
+            pass
+
+    # -- ownership ---------------------------------------------------------
+
+    def owner(self, selection: str = "primary") -> int:
+        """Window ID currently owning *selection*, or 0."""
+        owner = self._display.get_selection_owner(self._atoms[selection.upper()])
+        return getattr(owner, "id", owner) or 0
+
+    def set(self, text: str, selection: str = "clipboard") -> bool:
+        """Own *selection* with *text*; False if the server did not grant it."""
+        atom = self._atoms[selection.upper()]
+        self._owned[atom] = text.encode("utf-8")
+        self._served[atom] = threading.Event()
+        self._served_at.pop(atom, None)
+        self._window.set_selection_owner(atom, self._X.CurrentTime)
+        if self.owner(selection) != self._window.id:
+            self._owned.pop(atom, None)
+            return False
+        return True
+
+    def owned_text(self, selection: str = "clipboard") -> Optional[str]:
+        """Text this client still serves for *selection*, or None."""
+        data = self._owned.get(self._atoms[selection.upper()])
+        return None if data is None else data.decode("utf-8")
+
+    def wait_served(
+        self, selection: str, timeout: float, since: float | None = None,
+    ) -> bool:
+        """Wait until a client has read the text set by the last :meth:`set`.
+
+        TARGETS queries do not count, only a served text conversion. With
+        *since* (a ``time.monotonic()`` value) reads answered before it are
+        ignored, e.g. a clipboard manager copying the text before Ctrl+V.
+        """
+        atom = self._atoms[selection.upper()]
+        served = self._served.get(atom)
+        if served is None:
+            return False
+        if since is None:
+            return served.wait(timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            # Clear before checking: a read recorded after the check sets
+            # the event again, so the wait below cannot miss it.
+            served.clear()
+            stamp = self._served_at.get(atom)
+            if stamp is not None and stamp >= since:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not served.wait(remaining):
+                stamp = self._served_at.get(atom)
+                return stamp is not None and stamp >= since
+
+    def watch_owner(self, selection: str, callback: Callable[[int], None]) -> bool:
+        """Call ``callback(owner_id)`` whenever *selection* is (re)claimed.
+
+        Uses XFixesSelectSelectionInput; the callback runs on the client
+        thread with 0 when the owner went away. Returns False when the
+        server has no XFixes.
+        """
+        from Xlib.ext import xfixes
+
+        display = self._display
+        atom = self._atoms[selection.upper()]
+        try:
+            if not display.has_extension("XFIXES"):
+                return False
+            display.xfixes_query_version()
+            self._xfixes_event = (
+                display.query_extension("XFIXES").first_event
+                + xfixes.XFixesSelectionNotify
+            )
+            self._owner_watchers[atom] = callback
+            display.xfixes_select_selection_input(
+                self._window, atom,
+                xfixes.XFixesSetSelectionOwnerNotifyMask
+                | xfixes.XFixesSelectionWindowDestroyNotifyMask
+                | xfixes.XFixesSelectionClientCloseNotifyMask,
+            )
+            display.flush()
+        except Exception as exc:
+            self._owner_watchers.pop(atom, None)
+            logger.debug("XFixes selection input unavailable: %s", exc)
+            return False
+        return True
+
+    # -- event thread ------------------------------------------------------
+
+    def _serve(self) -> None:
+        display = self._display
+        while not self._closed:
+            try:
+                event = display.next_event()
+            except Exception as exc:
+                if not self._closed:
+                    logger.warning("X11 selection connection lost: %s", exc)
+                    self._closed = True
+                break
+            try:
+                self._dispatch(event)
+            except Exception as exc:
+                logger.debug("Selection event %s not handled: %s", event.type, exc)
+
+    def _dispatch(self, event) -> None:
+        X = self._X
+        if event.type == X.SelectionRequest:
+            self._answer(event)
+        elif event.type == X.SelectionNotify:
+            self._replies.put(("notify", event))
+        elif event.type == X.PropertyNotify:
+            if (
+                self._reading
+                and event.state == X.PropertyNewValue
+                and event.atom == self._atoms["LSWITCH_SELECTION"]
+            ):
+                self._replies.put(("property", event))
+        elif event.type == X.SelectionClear:
+            self._owned.pop(event.atom, None)
+        elif event.type == self._xfixes_event:
+            callback = self._owner_watchers.get(event.selection)
+            if callback is not None:
+                owner = event.owner if event.sub_code == 0 else 0   # SetSelectionOwner
+                callback(getattr(owner, "id", owner) or 0)
+
+    def _answer(self, request) -> None:
+        """Serve a SelectionRequest for a selection we own."""
+        from Xlib.protocol import event as xevent
+
+        X, atoms = self._X, self._atoms
+        data = self._owned.get(request.selection)
+        target = request.target
+        # Obsolete clients pass None as property; ICCCM says use the target.
+        prop = request.property or target
+        requestor = request.requestor
+        served = False
+
+        if data is None:
+            prop = X.NONE
+        elif target == atoms["TARGETS"]:
+            offered = [atoms["TARGETS"], atoms["STRING"]]
+            offered += [atoms[name] for name in _TEXT_TARGETS]
+            requestor.change_property(prop, atoms["ATOM"], 32, offered)
+        elif target in (atoms[name] for name in _TEXT_TARGETS):
+            requestor.change_property(prop, atoms["UTF8_STRING"], 8, data)
+            served = True
+        elif target == atoms["STRING"]:
+            latin = data.decode("utf-8").encode("latin-1", "replace")
+            requestor.change_property(prop, atoms["STRING"], 8, latin)
+            served = True
+        else:
+            prop = X.NONE
+
+        requestor.send_event(xevent.SelectionNotify(
+            time=request.time,
+            requestor=requestor.id,
+            selection=request.selection,
+            target=target,
+            property=prop,
+        ))
+        self._display.flush()
+        if served and request.selection in self._served:
+            self._served_at[request.selection] = time.monotonic()
+            self._served[request.selection].set()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        from Xlib.protocol import event as xevent
+
+        try:
+            # Wake next_event() so the thread sees _closed.
+            self._window.send_event(xevent.ClientMessage(
+                window=self._window.id,
+                client_type=self._atoms["LSWITCH_WAKE"],
+                data=(32, [0, 0, 0, 0, 0]),
+            ))
+            self._display.flush()
+            self._thread.join(timeout=1.0)
+            self._display.close()
+        except Exception:
+            pass
+
+
+def _as_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("latin-1")
+    return bytes(value)
+
+
+class X11SystemAdapter(SubprocessSystemAdapter):
+    """SubprocessSystemAdapter whose selection-path calls stay in-process.
+
+    *client* is an open :class:`X11SelectionClient`; with None (or once the
+    connection is lost) clipboard calls go through the xclip fallback.
+    Key sequences are sent through *virtual_kb* (UInput) like on Wayland;
+    xdotool is used only without a virtual keyboard.
+    """
+
+    def __init__(
+        self,
+        debug: bool = False,
+        client: Optional[X11SelectionClient] = None,
+        virtual_kb=None,
+    ) -> None:
+        super().__init__(debug=debug)
+        self._client = client
+        self._virtual_kb = virtual_kb
+        self._in_process: set[str] = set()   # selections last set via the client
+
+    def _live_client(self) -> Optional[X11SelectionClient]:
+        client = self._client
+        if client is not None and client.closed:
+            logger.warning("X11 selection client closed, falling back to xclip")
+            self._client = client = None
+        return client
+
+    def send_key_sequence(self, sequence: str, timeout: float = 0.3) -> None:
+        virtual_kb = self._virtual_kb
+        if virtual_kb is not None and virtual_kb.available:
+            try:
+                virtual_kb.send_combo(sequence)
+                return
+            except ValueError as exc:
+                logger.debug("send_combo cannot express %r: %s", sequence, exc)
+        super().send_key_sequence(sequence, timeout=timeout)
+
+    def get_clipboard(self, selection: str = "primary") -> str:
+        client = self._live_client()
+        if client is not None:
+            try:
+                return client.read(selection, timeout=0.3)
+            except ConnectionError:
+                self._client = None
+        return super().get_clipboard(selection)
+
+    def set_clipboard(self, text: str, selection: str = "clipboard") -> None:
+        client = self._live_client()
+        if client is not None and len(text.encode("utf-8")) <= client.max_inline:
+            try:
+                if client.set(text, selection):
+                    self._in_process.add(selection)
+                    return
+            except Exception as exc:
+                logger.debug("In-process %s ownership failed: %s", selection, exc)
+        self._in_process.discard(selection)
+        super().set_clipboard(text, selection)
+
+    def wait_clipboard_served(
+        self, selection: str = "clipboard", timeout: float = 0.5,
+        since: float | None = None,
+    ):
+        client = self._live_client()
+        if client is None or selection not in self._in_process:
+            return None
+        return client.wait_served(selection, timeout, since)
+
+    def get_selection_owner(self, selection: str = "primary") -> int:
+        client = self._live_client()
+        if client is not None:
+            try:
+                return client.owner(selection)
+            except Exception:
+                return 0
+        return super().get_selection_owner(selection)
+
+    def watch_selection_owner(self, selection: str, callback) -> bool:
+        client = self._live_client()
+        return client is not None and client.watch_owner(selection, callback)
+
+    def close(self) -> None:
+        """Close the client, handing owned selections over to xclip.
+
+        The selection dies with our X connection; xclip forks a persistent
+        owner, so the user's (restored) clipboard outlives LSwitch.
+        """
+        client = self._client
+        if client is None:
+            return
+        if not client.closed:
+            for selection in sorted(self._in_process):
+                text = client.owned_text(selection)
+                if text is not None:
+                    super().set_clipboard(text, selection)
+        self._in_process.clear()
+        client.close()
+        self._client = None
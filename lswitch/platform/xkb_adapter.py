@@ -4,12 +4,24 @@ from __future__ import annotations
 
 import ctypes
 import ctypes.util
+import logging
 import os
 import re
 import subprocess
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Optional
+
+from lswitch.input.signal_fd import child_argv
+from lswitch.platform.xkb_keymap import KeymapTable, keysym_to_char
+
+logger = logging.getLogger(__name__)
+
+_CINNAMON = ("org.Cinnamon", "/org/Cinnamon", "org.Cinnamon")
+_NO_SERVICE = {
+    "org.freedesktop.DBus.Error.ServiceUnknown",
+    "org.freedesktop.DBus.Error.NameHasNoOwner",
+}
 
 
 @dataclass
@@ -32,6 +44,18 @@ class IXKBAdapter(ABC):
     @abstractmethod
     def keycode_to_char(self, keycode: int, layout: LayoutInfo, shift: bool = False) -> str: ...
 
+    def watch_layout_changes(self, callback: Callable[[], None]) -> Optional[Any]:
+        """Start push notifications of layout changes.
+
+        Returns an object with ``fileno()`` and ``process()`` for the event
+        loop to serve (``process`` calls *callback* after a change), or
+        None when there is nothing to serve: the backend either cannot
+        notify (callers then keep polling :meth:`get_current_layout`) or
+        calls *callback* from its own thread, as the KDE Wayland backend
+        does from Qt.
+        """
+        return None
+
 
 # ---------------------------------------------------------------------------
 # Cyrillic keysym name → character map
@@ -69,6 +93,11 @@ class X11XKBAdapter(IXKBAdapter):
 
     Uses libX11 directly: XkbGetState, XkbLockGroup, XkbKeycodeToKeysym.
     Falls back to setxkbmap for layout discovery.
+
+    After :meth:`watch_layout_changes` the current group is cached from
+    XKB notifications and :meth:`get_current_layout` makes no X request.
+    :meth:`keycode_to_char` and :meth:`char_to_key` read a
+    :class:`KeymapTable` snapshot that is rebuilt after keymap changes.
     """
 
     XKB_USE_CORE_KBD = 0x0100
@@ -79,6 +108,14 @@ class X11XKBAdapter(IXKBAdapter):
         self._xkb_available = self._libX11 is not None
         self._layouts: list[LayoutInfo] | None = None
         self._dpy = None  # cached Display*
+        self._listener = None  # XkbEventListener, see watch_layout_changes()
+        self._group: Optional[int] = None  # cached effective group
+        self._on_layout_changed: Optional[Callable[[], None]] = None
+        self._keymap: Optional[KeymapTable] = None  # built on first lookup
+        # Session bus for Cinnamon calls; None = not connected yet
+        self._bus = None
+        self._bus_failed = False
+        self._cinnamon_present = True   # until the bus says otherwise
         # X11 must be initialised for multi-thread use before any Xlib call.
         # switch_layout() is called from the evdev background thread.
         if self._xkb_available:
@@ -135,6 +172,24 @@ class X11XKBAdapter(IXKBAdapter):
             lib.XKeysymToString.argtypes = [ctypes.c_ulong]
             lib.XKeysymToString.restype = ctypes.c_char_p
 
+            # XKB notifications (XkbEventListener)
+            lib.XkbQueryExtension.argtypes = [ctypes.c_void_p] + [ctypes.POINTER(ctypes.c_int)] * 5
+            lib.XkbQueryExtension.restype = ctypes.c_int
+            lib.XkbSelectEvents.argtypes = [
+                ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint,
+            ]
+            lib.XkbSelectEvents.restype = ctypes.c_int
+            lib.XkbSelectEventDetails.argtypes = [
+                ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_ulong, ctypes.c_ulong,
+            ]
+            lib.XkbSelectEventDetails.restype = ctypes.c_int
+            lib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+            lib.XConnectionNumber.restype = ctypes.c_int
+            lib.XPending.argtypes = [ctypes.c_void_p]
+            lib.XPending.restype = ctypes.c_int
+            lib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+            lib.XNextEvent.restype = ctypes.c_int
+
             return lib
         except Exception:
             return None
@@ -150,6 +205,15 @@ class X11XKBAdapter(IXKBAdapter):
 
     def close(self) -> None:
         """Close the cached X display connection if open."""
+        bus = getattr(self, "_bus", None)
+        if bus is not None:
+            bus.close()
+            self._bus = None
+        listener = getattr(self, "_listener", None)
+        if listener is not None:
+            listener.close()
+            self._listener = None
+            self._group = None
         dpy = getattr(self, "_dpy", None)
         if dpy is not None and getattr(self, "_xkb_available", False):
             self._libX11.XCloseDisplay(dpy)
@@ -162,7 +226,7 @@ class X11XKBAdapter(IXKBAdapter):
         """Get layout list from ``setxkbmap -query``. Returns e.g. ['us', 'ru']."""
         try:
             r = subprocess.run(
-                ["setxkbmap", "-query"],
+                child_argv(["setxkbmap", "-query"]),
                 capture_output=True, text=True, timeout=2,
             )
             for line in r.stdout.splitlines():
@@ -173,18 +237,99 @@ class X11XKBAdapter(IXKBAdapter):
             pass
         return []
 
+    # -- Cinnamon (D-Bus) ---------------------------------------------------
+
+    def _session_bus(self):
+        """Return the persistent session-bus connection, or None.
+
+        Connects on first use and subscribes to Cinnamon's signals and to
+        org.Cinnamon ownership changes, so the cached layout list follows
+        input-source edits and a restarted shell.
+        """
+        bus = self._bus
+        if bus is not None and not bus.closed:
+            return bus
+        if self._bus_failed:
+            return None
+        from lswitch.platform.dbus_client import BUS_NAME, DBusConnection, DBusError
+
+        try:
+            bus = DBusConnection.session(timeout=1.0)
+            bus.subscribe(self._on_cinnamon_signal, path=_CINNAMON[1], interface=_CINNAMON[2])
+            bus.subscribe(
+                self._on_cinnamon_owner_changed,
+                sender=BUS_NAME, interface=BUS_NAME,
+                member="NameOwnerChanged", arg0=_CINNAMON[0],
+            )
+        except (OSError, DBusError) as exc:
+            logger.debug("Session bus unavailable, using gdbus: %s", exc)
+            self._bus_failed = True
+            return None
+        self._bus = bus
+        return bus
+
+    def _on_cinnamon_signal(self, msg) -> None:
+        if "InputSource" in (msg.member or ""):
+            self._layouts = None
+
+    def _on_cinnamon_owner_changed(self, msg) -> None:
+        if msg.body and msg.body[0] == _CINNAMON[0]:
+            self._cinnamon_present = bool(msg.body[2])
+            self._layouts = None
+
+    def _cinnamon_call(self, member: str, signature: str = "", args: tuple = ()):
+        """Call org.Cinnamon in-process. Returns the reply body, or None if
+        Cinnamon is not running; raises LookupError without a session bus."""
+        from lswitch.platform.dbus_client import DBusError
+
+        bus = self._session_bus()
+        if bus is None:
+            raise LookupError("no session bus")
+        if not self._cinnamon_present:
+            return None
+        try:
+            return bus.call(*_CINNAMON, member, signature, args, timeout=3.0)
+        except DBusError as exc:
+            if exc.name in _NO_SERVICE:
+                self._cinnamon_present = False
+            logger.debug("Cinnamon %s failed: %s", member, exc)
+            return None
+
     def _cinnamon_get_sources(self) -> list[tuple] | None:
         """Query Cinnamon D-Bus GetInputSources.
 
         Returns list of (cinnamon_index, xkb_name, is_active) or None if
         Cinnamon D-Bus is unavailable.
         """
+        try:
+            reply = self._cinnamon_call("GetInputSources")
+        except LookupError:
+            return self._gdbus_get_sources()
+        if not reply:
+            return None
+        # Each entry: ('xkb', 'name', index, 'Display (name)', ..., active)
+        sources = [
+            (entry[2], entry[1], bool(entry[-1]))
+            for entry in reply[0]
+            if len(entry) >= 4 and entry[0] == "xkb"
+        ]
+        return sources or None
+
+    def _cinnamon_activate(self, index: int) -> bool:
+        """Switch layout via Cinnamon D-Bus ActivateInputSourceIndex."""
+        try:
+            return self._cinnamon_call("ActivateInputSourceIndex", "i", (index,)) is not None
+        except LookupError:
+            return self._gdbus_activate(index)
+
+    def _gdbus_get_sources(self) -> list[tuple] | None:
+        """GetInputSources through the ``gdbus`` CLI (no session socket)."""
         try:
             r = subprocess.run(
-                ["gdbus", "call", "--session",
-                 "--dest", "org.Cinnamon",
-                 "--object-path", "/org/Cinnamon",
-                 "--method", "org.Cinnamon.GetInputSources"],
+                child_argv(["gdbus", "call", "--session",
+                            "--dest", "org.Cinnamon",
+                            "--object-path", "/org/Cinnamon",
+                            "--method", "org.Cinnamon.GetInputSources"]),
                 capture_output=True, text=True, timeout=3,
             )
             if r.returncode != 0 or not r.stdout.strip():
@@ -205,15 +350,15 @@ class X11XKBAdapter(IXKBAdapter):
         except Exception:
             return None
 
-    def _cinnamon_activate(self, index: int) -> bool:
-        """Switch layout via Cinnamon D-Bus ActivateInputSourceIndex."""
+    def _gdbus_activate(self, index: int) -> bool:
+        """ActivateInputSourceIndex through the ``gdbus`` CLI."""
         try:
             r = subprocess.run(
-                ["gdbus", "call", "--session",
-                 "--dest", "org.Cinnamon",
-                 "--object-path", "/org/Cinnamon",
-                 "--method", "org.Cinnamon.ActivateInputSourceIndex",
-                 str(index)],
+                child_argv(["gdbus", "call", "--session",
+                            "--dest", "org.Cinnamon",
+                            "--object-path", "/org/Cinnamon",
+                            "--method", "org.Cinnamon.ActivateInputSourceIndex",
+                            str(index)]),
                 capture_output=True, text=True, timeout=3,
             )
             return r.returncode == 0
@@ -225,8 +370,32 @@ class X11XKBAdapter(IXKBAdapter):
         """'us' → 'en', other names stay as-is."""
         return "en" if xkb.lower() == "us" else xkb.lower()
 
+    def _on_xkb_change(self, group: int, keymap_changed: bool) -> None:
+        """XkbEventListener callback (event loop thread)."""
+        if keymap_changed:
+            # Layout list and symbols may differ; rebuilt lazily on next use.
+            self._layouts = None
+            self._keymap = None
+        self._group = group
+        callback = self._on_layout_changed
+        if callback is not None:
+            callback()
+
     # -- IXKBAdapter -------------------------------------------------------
 
+    def watch_layout_changes(self, callback: Callable[[], None]) -> Optional[Any]:
+        if not self._xkb_available:
+            return None
+        if self._listener is None:
+            from lswitch.platform.xkb_listener import XkbEventListener
+
+            self._listener = XkbEventListener.open(self._libX11, self._on_xkb_change)
+            if self._listener is None:
+                return None
+            self._group = self._listener.group
+        self._on_layout_changed = callback
+        return self._listener
+
     def get_layouts(self) -> list[LayoutInfo]:
         if self._layouts is not None:
             return self._layouts
@@ -262,6 +431,9 @@ class X11XKBAdapter(IXKBAdapter):
 
     def get_current_layout(self) -> LayoutInfo:
         layouts = self.get_layouts()
+        group = self._group
+        if group is not None:
+            return layouts[group] if group < len(layouts) else layouts[0]
         if not self._xkb_available:
             return layouts[0]
 
@@ -285,6 +457,10 @@ class X11XKBAdapter(IXKBAdapter):
             new_index = (current.index + 1) % len(layouts)
 
         new_layout = layouts[new_index] if new_index < len(layouts) else layouts[0]
+        if self._group is not None:
+            # Reads right after the switch must not see the old group; the
+            # StateNotify that follows confirms (or corrects) it.
+            self._group = new_layout.index
 
         # Try Cinnamon D-Bus first — it's the only method that survives the WM
         # immediately reverting XkbLockGroup via XkbStateNotify.
@@ -306,43 +482,56 @@ class X11XKBAdapter(IXKBAdapter):
         return new_layout
 
     def keycode_to_char(self, keycode: int, layout: LayoutInfo, shift: bool = False) -> str:
-        def _fallback_char() -> str:
-            if layout.name == "en" or layout.xkb_name == "us":
-                try:
-                    from lswitch.input.key_mapper import keycode_to_char
-                    return keycode_to_char(keycode, shift=shift)
-                except Exception:
-                    return ""
-            return ""
-
-        if not self._xkb_available:
-            return _fallback_char()
+        table = self._keymap_table()
+        if table is not None:
+            ch = table.char(keycode, layout.index, shift)
+            if ch:
+                return ch
+        if layout.name == "en" or layout.xkb_name == "us":
+            try:
+                from lswitch.input.key_mapper import keycode_to_char
+                return keycode_to_char(keycode, shift=shift)
+            except Exception:
+                return ""
+        return ""
 
+    def char_to_key(self, ch: str, layout_name: str) -> Optional[tuple[int, bool]]:
+        """Return ``(evdev keycode, shifted)`` typing *ch* on *layout_name*."""
+        table = self._keymap_table()
+        if table is None:
+            return None
+        for layout in self.get_layouts():
+            if layout_name in (layout.name, layout.xkb_name):
+                return table.key_for(ch, layout.index)
+        return None
+
+    def _keymap_table(self) -> Optional[KeymapTable]:
+        table = self._keymap
+        if table is not None or not self._xkb_available:
+            return table
         dpy = self._get_display()
         if not dpy:
-            return _fallback_char()
-        x11_keycode = keycode + 8  # evdev → X11 offset
-        group = layout.index
-        level = 1 if shift else 0
-        keysym = self._libX11.XkbKeycodeToKeysym(dpy, x11_keycode, group, level)
-        if keysym == 0:
-            return _fallback_char()
-        # Printable ASCII keysyms (0x20–0x7E) have the same value as their
-        # Unicode/ASCII code point.  Return them directly so that keys like
-        # comma (keysym 0x2C → ','), period, semicolon etc. are recognised
-        # correctly — XKeysymToString returns the word "comma" for 0x2C, not
-        # the single character, which would cause the word-boundary scan in
-        # _extract_last_word_events to silently skip past them.
-        if 0x20 <= keysym <= 0x7E:
-            return chr(keysym)
+            return None
+        lib = self._libX11
+        groups = max((layout.index + 1 for layout in self.get_layouts()), default=1)
+        table = self._keymap = KeymapTable.build(
+            lambda keycode, group, level: lib.XkbKeycodeToKeysym(dpy, keycode, group, level),
+            groups,
+            self._keysym_to_char,
+        )
+        return table
+
+    def _keysym_to_char(self, keysym: int) -> str:
+        return keysym_to_char(keysym, self._keysym_name_to_char)
+
+    def _keysym_name_to_char(self, keysym: int) -> str:
+        """Legacy keysyms without libxkbcommon: resolve via the keysym name."""
         raw = self._libX11.XKeysymToString(keysym)
         if not raw:
             return ""
         name = raw.decode("utf-8")
-        # Single ASCII character (fallback, should be caught above)
         if len(name) == 1:
             return name
-        # Cyrillic keysym names
         if name.startswith("Cyrillic_"):
             return _CYRILLIC_MAP.get(name[9:], "")
-        return _fallback_char()
+        return ""
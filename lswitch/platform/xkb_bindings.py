@@ -30,3 +30,36 @@ class XkbStateRec(ctypes.Structure):
 
 
 XKB_USE_CORE_KBD = 0x0100
+
+
+# XkbSelectEvents / XkbSelectEventDetails
+XKB_NEW_KEYBOARD_NOTIFY = 0
+XKB_MAP_NOTIFY = 1
+XKB_STATE_NOTIFY = 2
+XKB_NEW_KEYBOARD_NOTIFY_MASK = 1 << XKB_NEW_KEYBOARD_NOTIFY
+XKB_MAP_NOTIFY_MASK = 1 << XKB_MAP_NOTIFY
+XKB_GROUP_STATE_MASK = 1 << 4      # StateNotify detail: effective group changed
+
+
+class XkbStateNotifyEvent(ctypes.Structure):
+    """Leading fields of XkbStateNotifyEvent (shared with XkbAnyEvent)."""
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("serial", ctypes.c_ulong),
+        ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("time", ctypes.c_ulong),
+        ("xkb_type", ctypes.c_int),
+        ("device", ctypes.c_int),
+        ("changed", ctypes.c_uint),
+        ("group", ctypes.c_int),
+    ]
+
+
+class XEvent(ctypes.Union):
+    """XEvent storage: 24 longs, as declared in Xlib.h."""
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("xkb_state", XkbStateNotifyEvent),
+        ("pad", ctypes.c_long * 24),
+    ]
@@ -0,0 +1,100 @@
+"""KeymapTable — snapshot of the XKB keymap as a dense character table.
+
+The table is filled once per keymap with one ``XkbKeycodeToKeysym`` call
+per (keycode, group, level) and then answers both directions without
+touching X: ``char(keycode, group, shifted)`` is a list index and
+``key_for(ch, group)`` a dict lookup. :class:`X11XKBAdapter` drops the
+snapshot on XKB keymap notifications and rebuilds it on next use.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+from typing import Callable, Optional
+
+# Keycodes are evdev codes (X11 keycode - 8); X11 keycodes stop at 255.
+KEYCODES = 248
+GROUPS = 4          # XkbNumKbdGroups
+LEVELS = 2          # base, Shift
+
+
+def _load_xkbcommon():
+    try:
+        path = ctypes.util.find_library("xkbcommon")
+        if not path:
+            return None
+        lib = ctypes.cdll.LoadLibrary(path)
+        lib.xkb_keysym_to_utf32.argtypes = [ctypes.c_uint32]
+        lib.xkb_keysym_to_utf32.restype = ctypes.c_uint32
+        return lib
+    except (OSError, AttributeError):
+        return None
+
+
+_xkbcommon = _load_xkbcommon()
+
+
+def keysym_to_char(keysym: int, by_name: Optional[Callable[[int], str]] = None) -> str:
+    """Return the character a keysym types, or ``""`` for non-text keysyms.
+
+    Uses libxkbcommon's table when available. Without it, Latin-1 and
+    Unicode-range keysyms are converted directly and legacy keysyms go
+    through *by_name* (keysym → character via the keysym's name).
+    """
+    if keysym == 0:
+        return ""
+    if _xkbcommon is not None:
+        code = _xkbcommon.xkb_keysym_to_utf32(keysym)
+        return chr(code) if code >= 0x20 and code != 0x7F else ""
+    if 0x20 <= keysym <= 0x7E or 0xA0 <= keysym <= 0xFF:
+        return chr(keysym)
+    if 0x01000100 <= keysym <= 0x0110FFFF:
+        return chr(keysym - 0x01000000)
+    return by_name(keysym) if by_name is not None else ""
+
+
+class KeymapTable:
+    """Characters indexed by [keycode][group][level], plus the reverse map."""
+
+    __slots__ = ("groups", "_chars", "_keys")
+
+    def __init__(self, chars: list[str], groups: int):
+        self.groups = groups
+        self._chars = chars
+        # per group: char -> (keycode, shifted); unshifted keys win
+        self._keys: list[dict[str, tuple[int, bool]]] = [{} for _ in range(GROUPS)]
+        for level in range(LEVELS):
+            for keycode in range(KEYCODES):
+                for group in range(groups):
+                    ch = chars[(keycode * GROUPS + group) * LEVELS + level]
+                    if ch:
+                        self._keys[group].setdefault(ch, (keycode, bool(level)))
+
+    @classmethod
+    def build(
+        cls,
+        keysym_at: Callable[[int, int, int], int],
+        groups: int,
+        to_char: Callable[[int], str] = keysym_to_char,
+    ) -> "KeymapTable":
+        """Snapshot *groups* groups; ``keysym_at(x11_keycode, group, level)``."""
+        groups = max(1, min(groups, GROUPS))
+        chars = [""] * (KEYCODES * GROUPS * LEVELS)
+        for keycode in range(KEYCODES):
+            for group in range(groups):
+                base = (keycode * GROUPS + group) * LEVELS
+                for level in range(LEVELS):
+                    chars[base + level] = to_char(keysym_at(keycode + 8, group, level))
+        return cls(chars, groups)
+
+    def char(self, keycode: int, group: int, shifted: bool = False) -> str:
+        if not 0 <= keycode < KEYCODES or not 0 <= group < self.groups:
+            return ""
+        return self._chars[(keycode * GROUPS + group) * LEVELS + shifted]
+
+    def key_for(self, ch: str, group: int) -> Optional[tuple[int, bool]]:
+        """Return ``(keycode, shifted)`` that types *ch* in *group*, or None."""
+        if not 0 <= group < self.groups:
+            return None
+        return self._keys[group].get(ch)
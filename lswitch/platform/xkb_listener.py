@@ -0,0 +1,128 @@
+"""XkbEventListener — XKB layout-group notifications on a dedicated display.
+
+The listener owns its own X connection (the adapter's connection is used
+from the conversion thread) and only selects the notifications LSwitch
+needs: StateNotify restricted to effective-group changes, so modifier
+presses do not wake it, plus NewKeyboardNotify/MapNotify for keymap
+replacements and edits (``setxkbmap``, a different keyboard plugged in).
+
+It exposes :meth:`fileno` and :meth:`process`, so it can be served by
+``DeviceManager.add_watch`` instead of a thread of its own.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import logging
+from typing import Callable, Optional
+
+from lswitch.platform.xkb_bindings import (
+    XEvent,
+    XKB_GROUP_STATE_MASK,
+    XKB_MAP_NOTIFY,
+    XKB_MAP_NOTIFY_MASK,
+    XKB_NEW_KEYBOARD_NOTIFY,
+    XKB_NEW_KEYBOARD_NOTIFY_MASK,
+    XKB_STATE_NOTIFY,
+    XKB_USE_CORE_KBD,
+    XkbStateRec,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class XkbEventListener:
+    """Tracks the effective XKB group from server notifications.
+
+    Parameters:
+        lib:       libX11 handle configured by ``X11XKBAdapter._load_libx11``.
+        dpy:       Display* owned by the listener.
+        event_base: XKB extension event code (from ``XkbQueryExtension``).
+        on_change: Called as ``on_change(group, keymap_changed)`` from
+                   :meth:`process` whenever the group or keymap changed.
+    """
+
+    def __init__(
+        self,
+        lib,
+        dpy: int,
+        event_base: int,
+        on_change: Callable[[int, bool], None],
+    ):
+        self._lib = lib
+        self._dpy = dpy
+        self._event_base = event_base
+        self._on_change = on_change
+        self._event = XEvent()
+        self.group = self._query_group()
+
+    @classmethod
+    def open(
+        cls, lib, on_change: Callable[[int, bool], None],
+    ) -> Optional["XkbEventListener"]:
+        """Open a display connection and select XKB events, or return None."""
+        dpy = lib.XOpenDisplay(None)
+        if not dpy:
+            return None
+        opcode, event_base, error_base = ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        major, minor = ctypes.c_int(1), ctypes.c_int(0)
+        try:
+            ok = lib.XkbQueryExtension(
+                dpy, ctypes.byref(opcode), ctypes.byref(event_base),
+                ctypes.byref(error_base), ctypes.byref(major), ctypes.byref(minor),
+            )
+            if ok:
+                keymap_mask = XKB_NEW_KEYBOARD_NOTIFY_MASK | XKB_MAP_NOTIFY_MASK
+                ok = lib.XkbSelectEvents(
+                    dpy, XKB_USE_CORE_KBD, keymap_mask, keymap_mask,
+                ) and lib.XkbSelectEventDetails(
+                    dpy, XKB_USE_CORE_KBD, XKB_STATE_NOTIFY,
+                    XKB_GROUP_STATE_MASK, XKB_GROUP_STATE_MASK,
+                )
+        except Exception as exc:
+            logger.debug("XKB event selection failed: %s", exc)
+            ok = False
+        if not ok:
+            lib.XCloseDisplay(dpy)
+            return None
+        listener = cls(lib, dpy, event_base.value, on_change)
+        lib.XFlush(dpy)
+        return listener
+
+    def _query_group(self) -> int:
+        state = XkbStateRec()
+        if self._lib.XkbGetState(self._dpy, XKB_USE_CORE_KBD, ctypes.byref(state)) == 0:
+            return state.group
+        return 0
+
+    def fileno(self) -> int:
+        if not self._dpy:
+            raise ValueError("listener is closed")
+        return self._lib.XConnectionNumber(self._dpy)
+
+    def process(self) -> None:
+        """Drain pending X events; call ``on_change`` once if anything changed."""
+        if not self._dpy:
+            return
+        lib, dpy, event = self._lib, self._dpy, self._event
+        group = self.group
+        keymap_changed = False
+        while lib.XPending(dpy) > 0:
+            lib.XNextEvent(dpy, ctypes.byref(event))
+            if event.type != self._event_base:
+                continue
+            xkb_type = event.xkb_state.xkb_type
+            if xkb_type == XKB_STATE_NOTIFY:
+                group = event.xkb_state.group
+            elif xkb_type in (XKB_NEW_KEYBOARD_NOTIFY, XKB_MAP_NOTIFY):
+                keymap_changed = True
+        if keymap_changed:
+            group = self._query_group()
+        if group != self.group or keymap_changed:
+            self.group = group
+            self._on_change(group, keymap_changed)
+
+    def close(self) -> None:
+        dpy, self._dpy = self._dpy, None
+        if dpy:
+            self._lib.XCloseDisplay(dpy)
@@ -467,7 +467,7 @@ class DebugMonitorWindow(QWidget):
 
         marker_time = marker.get('time', 0)
         if marker_time > 0:
-            age = time.time() - marker_time
+            age = time.monotonic() - marker_time
             self._marker_age_label.setText(f"Age: {age:.1f}s")
         else:
             self._marker_age_label.setText("Age: unknown")
@@ -1,11 +1,25 @@
-"""Qt main-thread bridge used by platform adapters."""
+"""Qt main-thread bridge used by platform adapters.
+
+Worker threads hand callables to the Qt thread through
+:class:`QtMainThreadInvoker`. ``submit()`` returns a future, ``call()``
+waits for it. Requests queue up and travel to the Qt thread in one queued
+hop per batch: whatever is pending when the Qt thread gets to run is
+executed together, and ``with invoker.batch():`` sends a group explicitly.
+Identical idempotent requests (``coalesce=True``) that are still waiting
+share one execution. How long each call waited for the Qt thread is kept
+in :attr:`QtMainThreadInvoker.latency`, per function or per ``label``.
+"""
 
 from __future__ import annotations
 
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 import sys
 import threading
-from dataclasses import dataclass
-from typing import Any, Callable, TypeVar
+import time
+from typing import Any, Callable, Hashable, Iterator, TypeVar
 
 
 T = TypeVar("T")
@@ -16,9 +30,65 @@ class _CallRequest:
     func: Callable[..., Any]
     args: tuple[Any, ...]
     kwargs: dict[str, Any]
-    done: threading.Event
-    result: Any = None
-    error: BaseException | None = None
+    key: Hashable | None = None
+    label: str | None = None
+    future: Future = field(default_factory=Future)
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class QueueLatency:
+    """How long calls of one function (or label) waited for the Qt main thread."""
+
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def record(self, waited: float) -> None:
+        self.calls += 1
+        self.total += waited
+        self.max = max(self.max, waited)
+
+    def format(self) -> str:
+        mean = self.total / self.calls if self.calls else 0.0
+        return f"{mean * 1000:.1f} ms avg, max {self.max * 1000:.1f} ms, {self.calls} calls"
+
+
+def _call_name(func: Callable[..., Any]) -> str:
+    return getattr(func, "__qualname__", None) or repr(func)
+
+
+def _coalesce_key(func, args, kwargs) -> Hashable | None:
+    key = (func, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _run_into(future: Future, func, args, kwargs) -> None:
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as exc:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+def _chain(source: Future, target: Future) -> None:
+    """Complete *target* with the outcome of *source*."""
+    def _copy(done: Future) -> None:
+        if done.cancelled():
+            target.cancel()
+            return
+        error = done.exception()
+        if error is not None:
+            target.set_exception(error)
+        else:
+            target.set_result(done.result())
+
+    source.add_done_callback(_copy)
 
 
 def ensure_qt_application(argv: list[str] | None = None):
@@ -42,55 +112,150 @@ def ensure_qt_core_application(argv: list[str] | None = None):
 
 
 class QtMainThreadInvoker:
-    """Synchronous queued-call bridge into Qt's main thread."""
+    """Queued-call bridge into Qt's main thread."""
 
     def __init__(self, app=None):
         from PyQt6.QtCore import QCoreApplication, QObject, Qt, pyqtSignal, pyqtSlot
 
+        invoker = self
+
         class _BridgeObject(QObject):
-            call_requested = pyqtSignal(object)
+            batch_requested = pyqtSignal()
 
-            @pyqtSlot(object)
-            def execute(self, request: _CallRequest) -> None:
-                try:
-                    request.result = request.func(*request.args, **request.kwargs)
-                except BaseException as exc:
-                    request.error = exc
-                finally:
-                    request.done.set()
+            @pyqtSlot()
+            def execute(self) -> None:
+                invoker._run_pending()
 
         self._qt = QCoreApplication.instance() if app is None else app
         if self._qt is None:
             raise RuntimeError("QtMainThreadInvoker requires an active Qt application")
 
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pending: list[_CallRequest] = []
+        self._by_key: dict[Hashable, _CallRequest] = {}
+        self._scheduled = False
+        self.latency: dict[str, QueueLatency] = {}
+        self.hops = 0
+        self.coalesced = 0
+
         self._bridge = _BridgeObject()
         self._bridge.moveToThread(self._qt.thread())
-        self._bridge.call_requested.connect(
+        self._bridge.batch_requested.connect(
             self._bridge.execute,
             Qt.ConnectionType.QueuedConnection,
         )
 
-    def call(
+    def _on_qt_thread(self) -> bool:
+        from PyQt6.QtCore import QThread
+
+        return QThread.currentThread() == self._qt.thread()
+
+    def submit(
         self,
         func: Callable[..., T],
         *args: Any,
-        timeout: float | None = None,
+        coalesce: bool = False,
+        label: str | None = None,
         **kwargs: Any,
-    ) -> T:
-        from PyQt6.QtCore import QThread
+    ) -> "Future[T]":
+        """Queue ``func(*args, **kwargs)`` for the Qt thread and return its future.
 
-        if QThread.currentThread() == self._qt.thread():
-            return func(*args, **kwargs)
+        With *coalesce* an identical request that is still queued is reused
+        instead of running *func* again; only use it for idempotent reads.
+        *label* names the call in :attr:`latency` (default: the function's
+        qualified name), for dispatchers shared by different requests.
+        On the Qt thread itself the call runs immediately.
+        """
+        if self._on_qt_thread():
+            future: Future = Future()
+            _run_into(future, func, args, kwargs)
+            return future
 
         request = _CallRequest(
             func=func,
             args=args,
             kwargs=kwargs,
-            done=threading.Event(),
+            key=_coalesce_key(func, args, kwargs) if coalesce else None,
+            label=label,
         )
-        self._bridge.call_requested.emit(request)
-        if not request.done.wait(timeout):
-            raise TimeoutError("Timed out waiting for Qt main-thread call")
-        if request.error is not None:
-            raise request.error
-        return request.result
+        held = getattr(self._local, "batch", None)
+        if held is not None:
+            held.append(request)
+        else:
+            self._enqueue([request])
+        return request.future
+
+    def call(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: float | None = None,
+        coalesce: bool = False,
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> T:
+        future = self.submit(func, *args, coalesce=coalesce, label=label, **kwargs)
+        try:
+            return future.result(timeout)
+        except FuturesTimeoutError:
+            if future.done():
+                raise
+            raise TimeoutError("Timed out waiting for Qt main-thread call") from None
+
+    @contextmanager
+    def batch(self) -> Iterator["QtMainThreadInvoker"]:
+        """Send the submit() calls made in this block in one queued hop.
+
+        Futures of the held calls complete only after the block exits, so
+        do not wait on them inside it.
+        """
+        if getattr(self._local, "batch", None) is not None:
+            yield self
+            return
+        self._local.batch = held = []
+        try:
+            yield self
+        finally:
+            self._local.batch = None
+            if held:
+                self._enqueue(held)
+
+    def latency_summary(self) -> str:
+        with self._lock:
+            latency = {name: stats.format() for name, stats in self.latency.items()}
+            hops, coalesced = self.hops, self.coalesced
+        detail = "; ".join(f"{name} {stats}" for name, stats in sorted(latency.items()))
+        return f"{hops} hops, {coalesced} coalesced" + (f"; {detail}" if detail else "")
+
+    def _enqueue(self, requests: list[_CallRequest]) -> None:
+        schedule = False
+        with self._lock:
+            for request in requests:
+                twin = self._by_key.get(request.key) if request.key is not None else None
+                if twin is not None:
+                    self.coalesced += 1
+                    _chain(twin.future, request.future)
+                    continue
+                if request.key is not None:
+                    self._by_key[request.key] = request
+                self._pending.append(request)
+            if self._pending and not self._scheduled:
+                self._scheduled = schedule = True
+        if schedule:
+            self._bridge.batch_requested.emit()
+
+    def _run_pending(self) -> None:
+        """Qt-thread slot: run everything queued so far."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._by_key.clear()
+            self._scheduled = False
+            self.hops += 1
+        for request in batch:
+            waited = time.monotonic() - request.queued_at
+            name = request.label or _call_name(request.func)
+            with self._lock:
+                self.latency.setdefault(name, QueueLatency()).record(waited)
+            if request.future.set_running_or_notify_cancel():
+                _run_into(request.future, request.func, request.args, request.kwargs)
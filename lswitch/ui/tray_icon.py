@@ -10,10 +10,10 @@ from lswitch.core.events import Event, EventType
 from lswitch.i18n import t
 
 # TODO: EventBus handlers are called synchronously from the publisher thread.
-# If EventBus.publish() is called from a non-GUI thread, Qt widgets must be
-# updated via QMetaObject.invokeMethod(widget, Qt.ConnectionType.QueuedConnection, ...) to
-# ensure thread-safety.  Currently the bus is synchronous and single-threaded,
-# but this should be revisited if async publishing is added.
+# LAYOUT_CHANGED is published on the Qt thread (LSwitchApp._publish_layout_changed);
+# any other event that updates widgets from a non-GUI thread must go through
+# QMetaObject.invokeMethod(widget, Qt.ConnectionType.QueuedConnection, ...) or
+# the app's QtMainThreadInvoker to stay thread-safe.
 
 
 def create_simple_icon(size: int = 64) -> QIcon:
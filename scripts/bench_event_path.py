@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: накладные расходы на одно событие evdev → EventManager → EventBus.
+
+Использование:
+    python3 scripts/bench_event_path.py [N]
+
+Сравнивает:
+  A) прежний путь — новые KeyEventData + Event на каждое событие,
+     копия списка обработчиков в EventBus.publish, Enum.__hash__;
+  B) текущий EventManager.handle_raw_event — переиспользуемые объекты
+     и кортежи обработчиков.
+Обработчики пустые, поэтому измеряется только цена доставки события.
+"""
+
+import os
+import sys
+import time
+import timeit
+from collections import defaultdict
+from enum import Enum
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lswitch.core.event_bus import EventBus  # noqa: E402
+from lswitch.core.event_manager import MOUSE_BUTTONS, EventManager  # noqa: E402
+from lswitch.core.events import Event, EventType, KeyEventData  # noqa: E402
+
+
+class _LegacyBus:
+    # EventType used to hash by member name (Enum.__hash__); keyed the same way here.
+    def __init__(self):
+        self._handlers = defaultdict(list)
+
+    def subscribe(self, event_type, handler):
+        self._handlers[Enum.__hash__(event_type)].append(handler)
+
+    def publish(self, event):
+        for handler in list(self._handlers.get(Enum.__hash__(event.type), [])):
+            try:
+                handler(event)
+            except Exception:
+                pass
+
+
+class _LegacyManager:
+    def __init__(self, bus):
+        self.bus = bus
+
+    def handle_raw_event(self, event, device_name=""):
+        if getattr(event, "type", None) != 1:
+            return
+        code = event.code
+        value = event.value
+        if code in MOUSE_BUTTONS:
+            return
+        data = KeyEventData(code=code, value=value, device_name=device_name)
+        ts = time.time()
+        if value == 1:
+            self.bus.publish(Event(EventType.KEY_PRESS, data, ts))
+        elif value == 0:
+            self.bus.publish(Event(EventType.KEY_RELEASE, data, ts))
+        elif value == 2:
+            self.bus.publish(Event(EventType.KEY_REPEAT, data, ts))
+
+
+def _make(manager_cls, bus_cls):
+    bus = bus_cls()
+    for event_type in (EventType.KEY_PRESS, EventType.KEY_RELEASE, EventType.KEY_REPEAT):
+        for _ in range(3):
+            bus.subscribe(event_type, lambda e: None)
+    return manager_cls(bus)
+
+
+def _bench(manager, events, n):
+    handle = manager.handle_raw_event
+
+    def run():
+        for ev in events:
+            handle(ev, "kbd")
+
+    best = min(timeit.repeat(run, number=n, repeat=5))
+    return best / (n * len(events)) * 1e9
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Kernel-stamped like real evdev events (CLOCK_MONOTONIC), so the
+    # current manager takes its event_time() path rather than the fallback.
+    sec, usec = divmod(int(time.monotonic() * 1_000_000), 1_000_000)
+    events = [
+        SimpleNamespace(type=1, code=30, value=1, sec=sec, usec=usec),
+        SimpleNamespace(type=1, code=30, value=0, sec=sec, usec=usec),
+        SimpleNamespace(type=1, code=14, value=2, sec=sec, usec=usec),
+        SimpleNamespace(type=0, code=0, value=0, sec=sec, usec=usec),   # SYN_REPORT — filtered
+    ]
+    legacy = _bench(_make(_LegacyManager, _LegacyBus), events, n)
+    current = _bench(_make(EventManager, EventBus), events, n)
+    print(f"legacy : {legacy:7.1f} ns/event")
+    print(f"current: {current:7.1f} ns/event")
+    print(f"factor : {legacy / current:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import logging
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -143,7 +144,7 @@ class TestDoConversion:
         app.state_manager.context.state = State.CONVERTING
         app._do_conversion()
         app.conversion_engine.convert.assert_called_once_with(
-            app.state_manager.context, selection_valid=False,
+            app.state_manager.context, selection_valid=False, snapshot=ANY,
         )
 
     def test_does_not_call_convert_when_idle(self):
@@ -211,12 +212,173 @@ class TestStop:
         app.stop()
         app.virtual_kb.close.assert_called_once()
 
+    def test_stop_logs_main_thread_queue_latency(self, caplog):
+        app = _make_app()
+        app._ui_thread = MagicMock()
+        app._ui_thread.latency_summary.return_value = "2 hops, 1 coalesced"
+
+        with caplog.at_level(logging.DEBUG, logger="lswitch.app"):
+            app.stop()
+            app.stop()
+
+        assert caplog.text.count("Очередь Qt: 2 hops, 1 coalesced") == 1
+
     def test_stop_idempotent(self):
         app = _make_app()
         app.stop()
         app.stop()  # second call must not raise
 
 
+class TestEventQueue:
+    """Reader thread drains devices into the ring; handlers run elsewhere."""
+
+    def test_reader_feeds_handler_in_order(self):
+        app = _make_app()
+        dev = MagicMock()
+        dev.name = "kbd"
+        batches = [[(dev, "e1"), (dev, "e2")], [(dev, "e3")]]
+
+        def fake_get_events(timeout=0.1):
+            if batches:
+                return iter(batches.pop(0))
+            app._running = False
+            return iter(())
+
+        app.device_manager.get_events.side_effect = fake_get_events
+        app._running = True
+        reader = app._start_evdev_reader()
+        app._handle_queued_events()
+        reader.join(timeout=2.0)
+
+        calls = [c.args for c in app.event_manager.handle_raw_event.call_args_list]
+        assert calls == [("e1", "kbd"), ("e2", "kbd"), ("e3", "kbd")]
+        assert app.event_queue_stats["total"] == 3
+        assert app.event_queue_stats["overflow"] == 0
+
+    def test_sighup_queues_reload_on_handler_thread(self):
+        import signal
+        from lswitch.input.event_ring import EventRing
+
+        app = _make_app()
+        app._event_ring = EventRing(4)
+        app._signal_fd = MagicMock()
+        app._signal_fd.read.return_value = [signal.SIGHUP]
+        app._reload_config = MagicMock()
+
+        app._on_signal_fd()
+
+        app._reload_config.assert_not_called()
+        assert app._event_ring.get(timeout=0) == (None, app._reload_config)
+
+    def test_sigterm_requests_stop_and_wakes_reader(self):
+        import signal
+
+        app = _make_app()
+        app._running = True
+        app._signal_fd = MagicMock()
+        app._signal_fd.read.return_value = [signal.SIGTERM]
+
+        app._on_signal_fd()
+
+        assert app._running is False
+        app.device_manager.wake.assert_called_once()
+
+    def test_control_items_run_on_handler(self):
+        from lswitch.input.event_ring import EventRing
+
+        app = _make_app()
+        app._event_ring = EventRing(4)
+        call = MagicMock()
+        app._event_ring.put(None, call)
+        app._event_ring.close()
+        app._handle_queued_events()
+        call.assert_called_once_with()
+        app.event_manager.handle_raw_event.assert_not_called()
+
+    def test_stats_empty_before_run(self):
+        assert _make_app().event_queue_stats == {}
+
+
+class TestLayoutChanged:
+    """XKB notifications end up as LAYOUT_CHANGED on the bus."""
+
+    def test_watcher_is_served_by_device_selector(self):
+        app = _make_app()
+        watcher = MagicMock()
+        app.xkb = MagicMock()
+        app.xkb.watch_layout_changes.return_value = watcher
+
+        app._watch_layout_changes()
+
+        app.xkb.watch_layout_changes.assert_called_once_with(app._on_layout_changed)
+        app.device_manager.add_watch.assert_called_once_with(watcher, watcher.process)
+
+    def test_no_watch_without_notifications(self):
+        app = _make_app()   # MockXKBAdapter inherits the no-op default
+        app._watch_layout_changes()
+        app.device_manager.add_watch.assert_not_called()
+
+    def test_notification_is_published_on_handler_thread(self):
+        from lswitch.core.events import EventType
+        from lswitch.input.event_ring import EventRing
+
+        app = _make_app()
+        app._event_ring = EventRing(4)
+        received = []
+        app.event_bus.subscribe(EventType.LAYOUT_CHANGED, lambda e: received.append(e.data))
+        app.xkb.switch_layout()     # → ru
+
+        app._on_layout_changed()
+        assert received == []
+
+        app._event_ring.close()
+        app._handle_queued_events()
+        assert received == ["ru"]
+
+    def test_ui_publish_does_not_wait_for_the_qt_thread(self):
+        app = _make_app()
+        app._ui_thread = MagicMock()
+
+        app._publish_layout_changed()
+
+        app._ui_thread.call.assert_not_called()
+        func, event = app._ui_thread.submit.call_args.args
+        assert func == app.event_bus.publish
+        assert event.data == "en"
+
+
+class TestSelectionOwnerWatch:
+    """Selection freshness comes from owner notifications when available."""
+
+    def test_owner_notifications_replace_poller(self):
+        app = _make_app()
+        app.selection = MagicMock()
+        app.selection.watch_owner_changes.return_value = True
+
+        app._watch_selection_owner()
+
+        app.selection.watch_owner_changes.assert_called_once_with(
+            app._on_selection_owner_changed
+        )
+        assert app._selection_poller is None
+        app.selection.get_selection.assert_not_called()
+
+    def test_falls_back_to_poller(self):
+        app = _make_app()   # MockSelectionAdapter inherits the False default
+        with patch("lswitch.app._SelectionPollerThread") as poller_cls:
+            app._watch_selection_owner()
+        poller_cls.return_value.start.assert_called_once()
+        assert app._selection_poller is poller_cls.return_value
+
+    def test_owner_change_marks_selection_fresh(self):
+        app = _make_app()
+        app._selection_valid = False
+        app._on_selection_owner_changed(0)
+        assert app._selection_valid is False
+        app._on_selection_owner_changed(0x3a00007)
+        assert app._selection_valid is True
+
+
 # ------------------------------------------------------------------
 # Helpers for event callbacks tests
 # ------------------------------------------------------------------
@@ -277,6 +439,22 @@ class TestOnKeyPress:
         assert len(app.state_manager.context.event_buffer) == 1
         assert app.state_manager.context.event_buffer[0].code == KEY_A
 
+    def test_overflowing_buffer_never_deletes_more_than_it_replays(self):
+        from lswitch.core.modes import KEY_BACKSPACE, RetypeMode
+
+        app = _wired_app()
+        ctx = app.state_manager.context
+        capacity = ctx.event_buffer.capacity
+        for _ in range(capacity + 100):      # one long run, no word boundary
+            app._on_key_press(_make_event(EventType.KEY_PRESS, KEY_A))
+
+        assert ctx.chars_in_buffer == len(ctx.event_buffer) == capacity
+
+        vk = MagicMock()
+        RetypeMode(vk, MagicMock(), MagicMock()).execute(ctx)
+        vk.tap_key.assert_called_once_with(KEY_BACKSPACE, capacity)
+        assert len(vk.replay_events.call_args.args[0]) == capacity
+
     def test_resets_backspace_repeats(self):
         """Regular key press → backspace_repeats = 0."""
         app = _wired_app()
@@ -290,6 +468,16 @@ class TestOnKeyPress:
 # _on_key_release tests
 # ------------------------------------------------------------------
 
+    def test_buffer_not_decoded_when_trace_disabled(self, caplog):
+        """Buffer traces are lazy: no O(buffer) decode per keystroke."""
+        app = _wired_app()
+        app._decode_buffer = MagicMock(return_value="")
+        with caplog.at_level(logging.DEBUG, logger="lswitch.app"):
+            app._on_key_press(_make_event(EventType.KEY_PRESS, KEY_A))
+            app._on_key_press(_make_event(EventType.KEY_PRESS, KEY_BACKSPACE))
+        app._decode_buffer.assert_not_called()
+
+
 class TestOnKeyRelease:
     def test_deferred_auto_space_on_release(self):
         """If _pending_auto_space is True, space release injects virtual space."""
@@ -503,7 +503,7 @@ class TestUndoAutoConversion:
             'word': 'gp',
             'direction': 'en_to_ru',
             'lang': 'en',
-            'time': time.time(),
+            'time': time.monotonic(),
             'word_events': word_events,
             'converted_len': 2
         }
@@ -544,7 +544,7 @@ class TestUndoAutoConversion:
             'word': 'gp',
             'direction': 'en_to_ru',
             'lang': 'en',
-            'time': time.time(),
+            'time': time.monotonic(),
             'word_events': [],
             'converted_len': 2
         }
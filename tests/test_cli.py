@@ -52,7 +52,7 @@ class TestMainDiagnostics:
     def test_diagnose_wayland_prints_report_and_exits_zero(self, monkeypatch, capsys):
         calls = []
 
-        def fake_diagnostic(*, switch_test=False):
+        def fake_diagnostic(*, switch_test=False, state_path=None):
             calls.append(switch_test)
             return types.SimpleNamespace(ok=True, to_text=lambda: "[ok] probe")
 
@@ -69,10 +69,30 @@ class TestMainDiagnostics:
         assert calls == [False]
         assert "[ok] probe" in capsys.readouterr().out
 
+    def test_diagnose_wayland_uses_daemon_switch_memo(self, monkeypatch):
+        from lswitch.platform.wayland import KDE_LAYOUT_STATE_PATH
+
+        paths = []
+
+        def fake_diagnostic(*, switch_test=False, state_path=None):
+            paths.append(state_path)
+            return types.SimpleNamespace(ok=True, to_text=lambda: "")
+
+        monkeypatch.setattr("sys.argv", ["lswitch", "--diagnose-wayland"])
+        monkeypatch.setattr(
+            "lswitch.platform.wayland_diagnostics.run_wayland_diagnostics",
+            fake_diagnostic,
+        )
+
+        with pytest.raises(SystemExit):
+            main()
+
+        assert paths == [KDE_LAYOUT_STATE_PATH]
+
     def test_diagnose_wayland_switch_test_passes_flag(self, monkeypatch):
         calls = []
 
-        def fake_diagnostic(*, switch_test=False):
+        def fake_diagnostic(*, switch_test=False, state_path=None):
             calls.append(switch_test)
             return types.SimpleNamespace(ok=True, to_text=lambda: "")
 
@@ -92,7 +112,7 @@ class TestMainDiagnostics:
         monkeypatch.setattr("sys.argv", ["lswitch", "--diagnose-wayland"])
         monkeypatch.setattr(
             "lswitch.platform.wayland_diagnostics.run_wayland_diagnostics",
-            lambda *, switch_test=False: types.SimpleNamespace(ok=False, to_text=lambda: "fail"),
+            lambda *, switch_test=False, state_path=None: types.SimpleNamespace(ok=False, to_text=lambda: "fail"),
         )
 
         with pytest.raises(SystemExit) as exc_info:
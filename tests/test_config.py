@@ -35,6 +35,7 @@ class TestDefaultConfig:
         'user_dict_enabled',
         'user_dict_min_weight',
         'wayland_selection_strategy',
+        'grab_input_during_conversion',
         'timing',
         'x11_selection_timing',
         'wayland_timing',
@@ -0,0 +1,268 @@
+"""Tests for lswitch.platform.dbus_client against an in-process stand-in bus."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from lswitch.platform.dbus_client import (
+    ERROR,
+    METHOD_CALL,
+    METHOD_RETURN,
+    SIGNAL,
+    DBusConnection,
+    DBusError,
+    Message,
+    session_bus_addresses,
+    split_signature,
+)
+from lswitch.platform.xkb_adapter import X11XKBAdapter
+
+
+class FakeBus:
+    """Speaks just enough D-Bus on one end of a socketpair.
+
+    ``methods`` maps member name → ``(signature, body)`` or a DBusError to
+    send back; every received call is recorded in ``calls``.
+    """
+
+    def __init__(self, methods: dict | None = None):
+        self.methods = {
+            "Hello": ("s", (":1.42",)),
+            "AddMatch": ("", ()),
+            **(methods or {}),
+        }
+        self.calls: list[Message] = []
+        self.client, self._server = socket.socketpair()
+        self._serial = 1000
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        sock = self._server
+        data = b""
+        while b"BEGIN\r\n" not in data:
+            chunk = sock.recv(4096)
+            if not chunk:
+                return
+            data += chunk
+            if b"AUTH EXTERNAL" in data and b"OK" not in data:
+                sock.sendall(b"OK 0123456789abcdef0123456789abcdef\r\n")
+                data += b"OK"
+        buf = data.split(b"BEGIN\r\n", 1)[1]
+        while True:
+            parsed = Message.decode(buf)
+            if parsed is None:
+                try:
+                    chunk = sock.recv(65536)
+                except OSError:
+                    return
+                if not chunk:
+                    return
+                buf += chunk
+                continue
+            msg, used = parsed
+            buf = buf[used:]
+            if msg.type == METHOD_CALL:
+                self.calls.append(msg)
+                self._reply(msg)
+
+    def _reply(self, call: Message) -> None:
+        result = self.methods.get(call.member, DBusError("org.freedesktop.DBus.Error.UnknownMethod"))
+        if isinstance(result, DBusError):
+            reply = Message(ERROR, {4: result.name, 5: call.serial, 8: "s"}, ("nope",))
+        else:
+            signature, body = result
+            fields = {5: call.serial}
+            if signature:
+                fields[8] = signature
+            reply = Message(METHOD_RETURN, fields, body)
+        try:
+            self.send(reply)
+        except OSError:
+            pass                # closed by the test
+
+    def send(self, msg: Message) -> None:
+        self._serial += 1
+        msg.serial = self._serial
+        self._server.sendall(msg.encode())
+
+    def emit(self, path: str, interface: str, member: str, signature: str = "", body=()) -> None:
+        fields = {1: path, 2: interface, 3: member, 7: ":1.1"}
+        if signature:
+            fields[8] = signature
+        self.send(Message(SIGNAL, fields, body))
+
+    def connect(self) -> DBusConnection:
+        return DBusConnection(self.client, timeout=1.0)
+
+    def close(self) -> None:
+        self._server.close()
+
+
+def _wait_for(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestMarshalling:
+    def test_split_signature(self):
+        assert split_signature("sa{sv}(ii)aai") == ["s", "a{sv}", "(ii)", "aai"]
+
+    def test_round_trip_nested_values(self):
+        signature = "ya{sv}a(sib)asdb"
+        body = (
+            7,
+            {"name": ("s", "ru"), "index": ("u", 1)},
+            [("xkb", 0, True), ("ibus", -3, False)],
+            ["us", "ru", ""],
+            1.5,
+            True,
+        )
+        msg = Message(METHOD_CALL, {1: "/a", 3: "M", 8: signature}, body, serial=5)
+        decoded, used = Message.decode(msg.encode() + b"trailing")
+        assert used == len(msg.encode())
+        assert decoded.serial == 5
+        assert decoded.body == (
+            7,
+            {"name": "ru", "index": 1},
+            [("xkb", 0, True), ("ibus", -3, False)],
+            ["us", "ru", ""],
+            1.5,
+            True,
+        )
+
+    def test_incomplete_message_returns_none(self):
+        data = Message(METHOD_CALL, {1: "/a", 3: "M", 8: "s"}, ("x" * 50,)).encode()
+        assert Message.decode(data[:-1]) is None
+
+    def test_session_addresses(self):
+        env = {
+            "DBUS_SESSION_BUS_ADDRESS": "tcp:host=x;unix:abstract=/tmp/dbus-%41b,guid=1;unix:path=/run/bus",
+            "XDG_RUNTIME_DIR": "/run/user/1000",
+        }
+        assert list(session_bus_addresses(env)) == [
+            "\0/tmp/dbus-Ab", "/run/bus", "/run/user/1000/bus",
+        ]
+
+
+class TestConnection:
+    def test_hello_and_method_call(self):
+        bus = FakeBus({"Echo": ("si", ("ok", 3))})
+        conn = bus.connect()
+        try:
+            assert conn.unique_name == ":1.42"
+            assert conn.call("org.Test", "/t", "org.Test", "Echo", "i", (3,)) == ("ok", 3)
+            echo = bus.calls[-1]
+            assert (echo.path, echo.member, echo.body) == ("/t", "Echo", (3,))
+        finally:
+            conn.close()
+            bus.close()
+
+    def test_error_reply_raises(self):
+        bus = FakeBus()
+        conn = bus.connect()
+        try:
+            with pytest.raises(DBusError) as info:
+                conn.call("org.Test", "/t", "org.Test", "Missing")
+            assert info.value.name == "org.freedesktop.DBus.Error.UnknownMethod"
+        finally:
+            conn.close()
+            bus.close()
+
+    def test_signal_subscription(self):
+        bus = FakeBus()
+        conn = bus.connect()
+        received = []
+        try:
+            conn.subscribe(received.append, path="/org/Cinnamon", interface="org.Cinnamon")
+            assert "interface='org.Cinnamon'" in bus.calls[-1].body[0]
+            bus.emit("/org/Other", "org.Cinnamon", "Ignored")
+            bus.emit("/org/Cinnamon", "org.Cinnamon", "InputSourcesChanged")
+            assert _wait_for(lambda: received)
+            assert [m.member for m in received] == ["InputSourcesChanged"]
+        finally:
+            conn.close()
+            bus.close()
+
+    def test_closed_bus_fails_pending_call(self):
+        bus = FakeBus({"Slow": DBusError("x")})
+        conn = bus.connect()
+        bus.close()
+        with pytest.raises(DBusError):
+            conn.call("org.Test", "/t", "org.Test", "Slow", timeout=1.0)
+        assert conn.closed
+        conn.close()
+
+
+class TestCinnamonOverDBus:
+    SOURCES = ("a(ssisb)", ([
+        ("xkb", "us", 0, "English (US)", False),
+        ("xkb", "ru", 1, "Russian", True),
+    ],))
+
+    def _adapter(self, bus: FakeBus) -> X11XKBAdapter:
+        with patch.object(X11XKBAdapter, "_load_libx11", return_value=None):
+            adapter = X11XKBAdapter()
+        conn = bus.connect()
+        patcher = patch(
+            "lswitch.platform.dbus_client.DBusConnection.session", return_value=conn,
+        )
+        patcher.start()
+        self._patchers = [patcher]
+        return adapter
+
+    def teardown_method(self):
+        for patcher in getattr(self, "_patchers", []):
+            patcher.stop()
+
+    def test_layouts_and_switch_without_subprocess(self):
+        bus = FakeBus({
+            "GetInputSources": self.SOURCES,
+            "ActivateInputSourceIndex": ("", ()),
+        })
+        adapter = self._adapter(bus)
+        with patch("lswitch.platform.xkb_adapter.subprocess.run") as run:
+            layouts = adapter.get_layouts()
+            adapter.switch_layout(target=layouts[1])
+        run.assert_not_called()
+        assert [(l.name, l.index) for l in layouts] == [("en", 0), ("ru", 1)]
+        assert bus.calls[-1].member == "ActivateInputSourceIndex"
+        assert bus.calls[-1].body == (1,)
+        adapter.close()
+        bus.close()
+
+    def test_input_sources_signal_drops_layout_cache(self):
+        bus = FakeBus({"GetInputSources": self.SOURCES})
+        adapter = self._adapter(bus)
+        adapter.get_layouts()
+        bus.emit("/org/Cinnamon", "org.Cinnamon", "InputSourcesChanged")
+        assert _wait_for(lambda: adapter._layouts is None)
+        adapter.close()
+        bus.close()
+
+    def test_missing_cinnamon_is_remembered(self):
+        bus = FakeBus({
+            "GetInputSources": DBusError("org.freedesktop.DBus.Error.ServiceUnknown"),
+        })
+        adapter = self._adapter(bus)
+        assert adapter._cinnamon_get_sources() is None
+        calls = len(bus.calls)
+        assert adapter._cinnamon_activate(0) is False
+        assert len(bus.calls) == calls      # no further round trips
+
+        bus.emit(
+            "/org/freedesktop/DBus", "org.freedesktop.DBus", "NameOwnerChanged",
+            "sss", ("org.Cinnamon", "", ":1.7"),
+        )
+        assert _wait_for(lambda: adapter._cinnamon_present)
+        adapter.close()
+        bus.close()
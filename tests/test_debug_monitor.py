@@ -399,7 +399,7 @@ class DebugMonitorWindowMock:
             return
         marker_time = marker.get('time', 0)
         if marker_time > 0:
-            age = time.time() - marker_time
+            age = time.monotonic() - marker_time
             self._marker_age_label.setText(f"Age: {age:.1f}s")
         else:
             self._marker_age_label.setText("Age: unknown")
@@ -596,7 +596,7 @@ class TestAutoMarker:
             'word': 'test',
             'direction': 'en_to_ru',
             'lang': 'en',
-            'time': time.time() - 5.0,
+            'time': time.monotonic() - 5.0,
         }
         window = DebugMonitorWindowMock(app=mock_app, event_bus=event_bus)
         window._update_marker_age()
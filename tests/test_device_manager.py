@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import selectors
+import struct
 import sys
 import types
 from unittest.mock import MagicMock, PropertyMock, patch, call
@@ -30,7 +31,7 @@ _fake_evdev.list_devices = MagicMock(return_value=[])
 sys.modules.setdefault("evdev", _fake_evdev)
 sys.modules.setdefault("evdev.ecodes", _fake_ecodes)
 
-from lswitch.input.device_manager import DeviceManager  # noqa: E402
+from lswitch.input.device_manager import EVIOCSCLOCKID, DeviceManager  # noqa: E402
 
 
 # ---------------------------------------------------------------------------
@@ -280,3 +281,402 @@ class TestDeviceCount:
         dm.devices["a"] = MagicMock()
         dm.devices["b"] = MagicMock()
         assert dm.device_count == 2
+
+
+class TestInputIsolation:
+    def _make_grabbing_dm(self, dev):
+        dm = DeviceManager(grab_during_conversion=True)
+        dm.selector = MagicMock()
+        with patch.object(_fake_evdev, "InputDevice", return_value=dev):
+            dm._try_add_device(dev.path)
+        return dm
+
+    @staticmethod
+    def _key_event(code, value, sec=0, usec=0):
+        return MagicMock(type=_fake_ecodes.EV_KEY, code=code, value=value, sec=sec, usec=usec)
+
+    def test_disabled_by_default(self):
+        dev = _make_device(path="/dev/input/event0")
+        dm = DeviceManager()
+        dm.selector = MagicMock()
+        with patch.object(_fake_evdev, "InputDevice", return_value=dev):
+            dm._try_add_device(dev.path)
+
+        assert dm.begin_isolation() == 0
+        dev.grab.assert_not_called()
+
+    def test_grabs_keyboards_only(self):
+        kbd = _make_device(path="/dev/input/event0")
+        mouse = _make_device(
+            name="Mouse", path="/dev/input/event1", has_key_a=False, has_btn_left=True,
+        )
+        dm = self._make_grabbing_dm(kbd)
+        with patch.object(_fake_evdev, "InputDevice", return_value=mouse):
+            dm._try_add_device(mouse.path)
+        kbd.active_keys.return_value = []
+
+        assert dm.begin_isolation() == 1
+        assert dm.is_isolated
+        kbd.grab.assert_called_once()
+        mouse.grab.assert_not_called()
+
+    def test_skips_keyboard_with_held_key(self):
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dev.active_keys.return_value = [57]  # Space still held
+
+        assert dm.begin_isolation() == 0
+        dev.grab.assert_not_called()
+
+    def test_end_reinjects_queued_keys_in_order_and_releases_held(self):
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dev.active_keys.return_value = []
+        dm.begin_isolation()
+
+        events = [
+            self._key_event(30, 1),
+            self._key_event(30, 2),   # auto-repeat is not re-injected
+            self._key_event(30, 0),
+            self._key_event(48, 1),   # still held when the grab ends
+        ]
+        dev.read.side_effect = [events, BlockingIOError()]
+        reinject = MagicMock()
+
+        assert dm.end_isolation(reinject) == 4
+        reinject.assert_called_once_with([(30, 1), (30, 0), (48, 1), (48, 0)])
+        dev.ungrab.assert_called_once()
+        assert not dm.is_isolated
+
+        dm.selector.select.return_value = []
+        assert list(dm.get_events(timeout=0)) == [(dev, ev) for ev in events]
+
+    def test_events_from_before_grab_are_not_reinjected(self):
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dev.active_keys.return_value = []
+        with patch("lswitch.input.device_manager.time.time", return_value=1000.0):
+            dm.begin_isolation()
+
+        early = self._key_event(30, 0, sec=999, usec=500000)
+        late = self._key_event(31, 1, sec=1000, usec=100)
+        dev.read.side_effect = [[early, late], BlockingIOError()]
+        reinject = MagicMock()
+
+        dm.end_isolation(reinject)
+        reinject.assert_called_once_with([(31, 1), (31, 0)])
+
+    def test_context_manager_releases_on_error(self):
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dev.active_keys.return_value = []
+
+        with pytest.raises(RuntimeError):
+            with dm.isolated_input(MagicMock()):
+                raise RuntimeError("conversion failed")
+
+        dev.ungrab.assert_called_once()
+        assert not dm.is_isolated
+
+    def test_events_read_while_grabbed_are_reinjected(self):
+        """A reader thread may consume grabbed events via get_events()."""
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dev.active_keys.return_value = []
+        dm.begin_isolation()
+
+        key = MagicMock()
+        key.fileobj = dev
+        dm.selector.select.return_value = [(key, None)]
+        dev.read.return_value = [self._key_event(30, 1), self._key_event(30, 0)]
+        assert len(list(dm.get_events(timeout=0))) == 2
+
+        dev.read.side_effect = BlockingIOError()
+        reinject = MagicMock()
+        dm.end_isolation(reinject)
+        reinject.assert_called_once_with([(30, 1), (30, 0)])
+
+    def test_keys_read_during_end_isolation_go_to_that_isolation(self):
+        """end_isolation() racing a reader must not leak keys into the next one."""
+        import threading
+        import time
+
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dev.active_keys.return_value = []
+        dm.begin_isolation()
+
+        key = MagicMock()
+        key.fileobj = dev
+        dm.selector.select.return_value = [(key, None)]
+        reading = threading.Event()
+        reads = []
+
+        def read():
+            reads.append(True)
+            if len(reads) > 1:
+                raise BlockingIOError()
+            reading.set()
+            time.sleep(0.05)     # end_isolation() runs meanwhile
+            return [self._key_event(30, 1), self._key_event(30, 0)]
+
+        dev.read.side_effect = read
+        reinject = MagicMock()
+        ender = threading.Thread(
+            target=lambda: (reading.wait(1.0), dm.end_isolation(reinject)),
+        )
+        ender.start()
+        assert len(list(dm.get_events(timeout=0))) == 2
+        ender.join(1.0)
+
+        reinject.assert_called_once_with([(30, 1), (30, 0)])
+        later = MagicMock()
+        dm.end_isolation(later)
+        later.assert_not_called()
+
+    def test_drained_events_wake_the_reader_and_come_first(self):
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dm.wake = MagicMock()
+        dev.active_keys.return_value = []
+        dm.begin_isolation()
+
+        key = MagicMock()
+        key.fileobj = dev
+        drained = [self._key_event(30, 1), self._key_event(30, 0)]
+        newer = [self._key_event(31, 1)]
+        dev.read.side_effect = [drained, BlockingIOError(), newer]
+
+        def select(timeout=None):
+            dm.end_isolation(MagicMock())    # runs while the reader is blocked
+            dm.wake.assert_called_once()
+            return [(key, None)]
+
+        dm.selector.select.side_effect = select
+        assert list(dm.get_events(timeout=None)) == [
+            (dev, ev) for ev in drained + newer
+        ]
+
+    def test_end_isolation_between_select_and_read_keeps_device(self):
+        """A drained fd reads EAGAIN: no events, not a device error."""
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._make_grabbing_dm(dev)
+        dev.active_keys.return_value = []
+        dm.begin_isolation()
+
+        key = MagicMock()
+        key.fileobj = dev
+        events = [self._key_event(30, 1), self._key_event(30, 0)]
+        dev.read.side_effect = [events, BlockingIOError(), BlockingIOError()]
+        reinject = MagicMock()
+
+        def select(timeout=None):
+            dm.end_isolation(reinject)       # handler thread wins the race
+            return [(key, None)]
+
+        dm.selector.select.side_effect = select
+        assert list(dm.get_events(timeout=0)) == [(dev, ev) for ev in events]
+        assert dev.path in dm.devices
+        reinject.assert_called_once_with([(30, 1), (30, 0)])
+
+
+class TestEventMask:
+    @staticmethod
+    def _unpack(request):
+        import ctypes
+        import struct
+        ev_type, size, addr = struct.unpack("IIQ", request)
+        return ev_type, ctypes.string_at(addr, size)
+
+    def _add(self, dev, ioctl, clock_calls=None):
+        def dispatch(fd, req, arg):
+            if req == EVIOCSCLOCKID:
+                if clock_calls is not None:
+                    clock_calls.append((fd, struct.unpack("i", arg)[0]))
+                return None
+            return ioctl(fd, req, arg)
+
+        dm = DeviceManager()
+        dm.selector = MagicMock()
+        with patch.object(_fake_evdev, "InputDevice", return_value=dev), \
+             patch("lswitch.input.device_manager.fcntl.ioctl", side_effect=dispatch):
+            dm._try_add_device(dev.path)
+        return dm
+
+    def test_switches_device_clock_to_monotonic(self):
+        clock_calls = []
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._add(dev, lambda fd, req, arg: None, clock_calls)
+
+        assert clock_calls == [(42, 1)]     # CLOCK_MONOTONIC
+        dev.active_keys.return_value = []
+        dm.grab_during_conversion = True
+        with patch("lswitch.input.device_manager.time.monotonic", return_value=5.0):
+            dm.begin_isolation()
+        assert dm._grabbed == {"/dev/input/event0": 5.0}
+
+    def test_keyboard_masks_event_types_only(self):
+        calls = []
+        dev = _make_device(path="/dev/input/event0")
+        dm = self._add(dev, lambda fd, req, arg: calls.append((fd, req, self._unpack(arg))))
+
+        assert len(calls) == 1
+        fd, req, (ev_type, bits) = calls[0]
+        assert (fd, req, ev_type) == (42, 0x40104593, 0)
+        assert bits[0] == 1 << _fake_ecodes.EV_KEY
+        assert dm.event_stats()["masked_devices"] == 1
+
+    def test_mouse_masks_to_button_codes(self):
+        calls = []
+        dev = _make_device(name="Mouse", has_key_a=False, has_btn_left=True)
+        self._add(dev, lambda fd, req, arg: calls.append(self._unpack(arg)))
+
+        assert [c[0] for c in calls] == [0, _fake_ecodes.EV_KEY]
+        bits = calls[1][1]
+        enabled = [code for code in range(len(bits) * 8) if bits[code // 8] >> (code % 8) & 1]
+        assert enabled == [272, 273, 274]
+
+    def test_mouse_motion_passes_only_while_button_held(self):
+        calls = []
+        dev = _make_device(name="Mouse", has_key_a=False, has_btn_left=True)
+        dm = self._add(dev, lambda fd, req, arg: calls.append(self._unpack(arg)))
+        dev.read.return_value = [MagicMock(type=_fake_ecodes.EV_KEY, code=272, value=1)]
+        key = MagicMock()
+        key.fileobj = dev
+        dm.selector.select.return_value = [(key, selectors.EVENT_READ)]
+
+        calls.clear()
+        with patch("lswitch.input.device_manager.fcntl.ioctl",
+                   side_effect=lambda fd, req, arg: calls.append(self._unpack(arg))):
+            list(dm.get_events(timeout=0))
+            assert [c[0] for c in calls] == [0, _fake_ecodes.EV_KEY, 2, 3]
+            assert calls[0][1][0] == 0b1110     # EV_KEY | EV_REL | EV_ABS
+            assert calls[2][1] == b"\x03\x00"    # REL_X, REL_Y only
+
+            calls.clear()
+            dev.read.return_value = [MagicMock(type=_fake_ecodes.EV_KEY, code=272, value=0)]
+            list(dm.get_events(timeout=0))
+        assert [c[0] for c in calls] == [0, _fake_ecodes.EV_KEY]
+        assert calls[0][1][0] == 1 << _fake_ecodes.EV_KEY
+
+    def test_falls_back_without_kernel_support(self):
+        dev = _make_device(path="/dev/input/event0")
+
+        def unsupported(fd, req, arg):
+            raise OSError(22, "Invalid argument")
+
+        dm = self._add(dev, unsupported)
+        assert "/dev/input/event0" in dm.devices
+        assert dm.event_stats()["masked_devices"] == 0
+        assert dm.event_stats()["unmasked_devices"] == 1
+
+    def test_counts_delivered_events_by_kind(self):
+        dm = DeviceManager()
+        dm.selector = MagicMock()
+        dev = _make_device()
+        dev.read.return_value = [
+            MagicMock(type=_fake_ecodes.EV_KEY), MagicMock(type=0), MagicMock(type=2),
+        ]
+        key = MagicMock()
+        key.fileobj = dev
+        dm.selector.select.return_value = [(key, selectors.EVENT_READ)]
+
+        list(dm.get_events(timeout=0))
+        stats = dm.event_stats()
+        assert (stats["key"], stats["syn"], stats["other"]) == (1, 1, 1)
+
+
+class TestSelectorLoop:
+    def test_wake_returns_blocking_get_events(self):
+        import threading
+
+        dm = DeviceManager()
+        result = []
+        t = threading.Thread(target=lambda: result.append(list(dm.get_events(timeout=None))))
+        t.start()
+        dm.wake()
+        t.join(timeout=2.0)
+        assert not t.is_alive()
+        assert result == [[]]
+        dm.close()
+
+    def test_watch_callback_runs_when_readable(self):
+        import os
+
+        dm = DeviceManager()
+        r, w = os.pipe()
+        calls = []
+        dm.add_watch(r, lambda: calls.append(os.read(r, 16)))
+        os.write(w, b"x")
+        for _ in range(3):
+            if calls:
+                break
+            list(dm.get_events(timeout=1.0))
+        assert calls == [b"x"]
+
+        dm.remove_watch(r)
+        os.write(w, b"y")
+        list(dm.get_events(timeout=0))
+        assert calls == [b"x"]
+        dm.close()
+        os.close(r)
+        os.close(w)
+
+
+class TestDeviceProbing:
+    def test_parallel_scan_registers_in_list_order(self):
+        paths = [f"/dev/input/event{i}" for i in range(4)]
+        devs = {p: _make_device(name=f"Kbd {p}", path=p) for p in paths}
+        with patch.object(_fake_evdev, "list_devices", return_value=paths), \
+             patch.object(_fake_evdev, "InputDevice", side_effect=lambda p: devs[p]):
+            dm = DeviceManager()
+            dm.selector = MagicMock()
+            assert dm.scan_devices() == 4
+            assert list(dm.devices) == paths
+            dm.close()
+
+    def test_fingerprint_cache_skips_capabilities(self):
+        dm = DeviceManager()
+        first = _make_device()
+        assert dm._is_suitable_device(first)
+        replug = _make_device()
+        replug.info = first.info
+        replug.phys = first.phys
+        assert dm._is_suitable_device(replug)
+        replug.capabilities.assert_not_called()
+
+    def test_name_filter_applies_to_cached_fingerprint(self):
+        dm = DeviceManager()
+        dev = _make_device(name="Some Keyboard")
+        assert dm._is_suitable_device(dev)
+        dm.set_virtual_kb_name("Some Keyboard")
+        assert not dm._is_suitable_device(dev)
+
+    def test_async_add_retries_until_node_opens(self):
+        dev = _make_device(path="/dev/input/event7")
+        opener = MagicMock(side_effect=[PermissionError("not yet"), OSError("busy"), dev])
+        dm = DeviceManager()
+        dm.selector = MagicMock()
+        with patch.object(_fake_evdev, "InputDevice", opener), \
+             patch("lswitch.input.device_manager.time") as mock_time:
+            assert dm._probe_with_retry("/dev/input/event7", 1) is False  # no generation yet
+            dm._probe_generation["/dev/input/event7"] = 1
+            assert dm._probe_with_retry("/dev/input/event7", 1) is True
+        assert opener.call_count == 3
+        assert mock_time.sleep.call_count == 2
+        assert "/dev/input/event7" in dm.devices
+
+    def test_async_add_is_debounced_and_cancelled_by_remove(self):
+        dm = DeviceManager()
+        pool = MagicMock()
+        with patch.object(dm, "_probe_pool", return_value=pool):
+            dm.add_device_async("/dev/input/event8")
+            dm.add_device_async("/dev/input/event8")
+        assert pool.submit.call_count == 1
+        generation = pool.submit.call_args.args[2]
+
+        dm.remove_device("/dev/input/event8")
+        with patch.object(_fake_evdev, "InputDevice") as opener:
+            assert dm._probe_with_retry("/dev/input/event8", generation) is False
+        opener.assert_not_called()
+        assert "/dev/input/event8" not in dm._probing
@@ -41,3 +41,25 @@ def test_handler_exception_does_not_crash_bus():
 def test_no_handlers_does_not_raise():
     bus = EventBus()
     bus.publish(Event(type=EventType.DOUBLE_SHIFT, data=None, timestamp=0.0))
+
+
+def test_subscribe_during_publish_applies_to_next_event():
+    bus = EventBus()
+    late = []
+
+    def subscriber(e):
+        bus.subscribe(EventType.KEY_PRESS, late.append)
+
+    bus.subscribe(EventType.KEY_PRESS, subscriber)
+    event = Event(type=EventType.KEY_PRESS, data=None, timestamp=0.0)
+    bus.publish(event)
+    assert late == []
+    bus.unsubscribe(EventType.KEY_PRESS, subscriber)
+    bus.publish(event)
+    assert late == [event]
+
+
+def test_unsubscribe_unknown_handler_is_noop():
+    bus = EventBus()
+    bus.unsubscribe(EventType.KEY_PRESS, print)
+    assert bus._handlers[EventType.KEY_PRESS] == ()
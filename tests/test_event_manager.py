@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from types import SimpleNamespace
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from lswitch.core.event_bus import EventBus
-from lswitch.core.event_manager import EventManager, NAVIGATION_KEYS, MOUSE_BUTTONS
+from lswitch.core.event_manager import EventManager, NAVIGATION_KEYS, MOUSE_BUTTONS, event_time
 from lswitch.core.events import EventType
+from lswitch.core.state_manager import StateManager
 
 
 # ---------------------------------------------------------------------------
@@ -178,3 +179,155 @@ class TestMouseButton:
         mgr.handle_raw_event(_ev(EV_KEY, 272, 1))
 
         assert len(key_events) == 0
+
+
+class TestEventReuse:
+    def test_press_event_object_is_reused(self):
+        bus = EventBus()
+        mgr = EventManager(bus)
+        seen = []
+        bus.subscribe(EventType.KEY_PRESS, lambda e: seen.append((id(e), id(e.data), e.data.code)))
+
+        mgr.handle_raw_event(_ev(EV_KEY, 16, 1))
+        mgr.handle_raw_event(_ev(EV_KEY, 17, 1))
+
+        assert seen[0][:2] == seen[1][:2]
+        assert [s[2] for s in seen] == [16, 17]
+
+    def test_shifted_flag_reset_between_events(self):
+        bus = EventBus()
+        mgr = EventManager(bus)
+        flags = []
+
+        def handler(e):
+            flags.append(e.data.shifted)
+            e.data.shifted = True
+
+        bus.subscribe(EventType.KEY_PRESS, handler)
+        mgr.handle_raw_event(_ev(EV_KEY, 16, 1))
+        mgr.handle_raw_event(_ev(EV_KEY, 16, 1))
+        assert flags == [False, False]
+
+    def test_reentrant_event_gets_fresh_object(self):
+        bus = EventBus()
+        mgr = EventManager(bus)
+        codes = []
+
+        def on_press(e):
+            if e.data.code == 16:
+                mgr.handle_raw_event(_ev(EV_KEY, 17, 1))
+            codes.append(e.data.code)
+
+        bus.subscribe(EventType.KEY_PRESS, on_press)
+        mgr.handle_raw_event(_ev(EV_KEY, 16, 1))
+        assert codes == [17, 16]
+
+
+class TestEventTimestamps:
+    def test_kernel_timestamp_is_carried_in_key_data(self):
+        bus = EventBus()
+        mgr = EventManager(bus)
+        stamps = []
+        bus.subscribe(EventType.KEY_PRESS, lambda e: stamps.append(e.data.timestamp))
+
+        ev = SimpleNamespace(type=EV_KEY, code=16, value=1, sec=1000, usec=250000)
+        with patch("lswitch.core.event_manager.time.monotonic", return_value=1002.0):
+            mgr.handle_raw_event(ev)
+
+        assert stamps == [1000.25]
+
+    @pytest.mark.parametrize("sec", [None, 1_700_000_000, 2000])
+    def test_missing_or_implausible_stamp_falls_back_to_monotonic(self, sec):
+        now = 1002.0
+        ev = _ev(EV_KEY, 16, 1) if sec is None else SimpleNamespace(
+            type=EV_KEY, code=16, value=1, sec=sec, usec=0,
+        )
+        assert event_time(ev, now) == now
+
+
+class TestGestureTiming:
+    def test_double_shift_uses_event_time_not_handling_time(self):
+        sm = StateManager(double_click_timeout=0.3)
+        sm.on_shift_down()
+        assert sm.on_shift_up(100.0) is False
+        sm.on_shift_down()
+        # Handled late (real clock far away), but the taps were 0.2 s apart
+        assert sm.on_shift_up(100.2) is True
+
+    def test_slow_taps_are_not_double_even_if_handled_together(self):
+        sm = StateManager(double_click_timeout=0.3)
+        sm.on_shift_down()
+        sm.on_shift_up(100.0)
+        sm.on_shift_down()
+        assert sm.on_shift_up(100.5) is False
+
+
+class TestPointerGesture:
+    BTN_LEFT, BTN_RIGHT = 272, 273
+    EV_REL = 2
+
+    def _click(self, mgr, at: float, code: int = 272, motion: int = 0):
+        def ev(type_, code_, value):
+            return SimpleNamespace(type=type_, code=code_, value=value, sec=int(at), usec=0)
+
+        with patch("lswitch.core.event_manager.time.monotonic", return_value=at + 0.01):
+            mgr.handle_raw_event(ev(EV_KEY, code, 1))
+            for _ in range(motion):
+                mgr.handle_raw_event(ev(self.EV_REL, 0, 3))
+            mgr.handle_raw_event(ev(EV_KEY, code, 0))
+
+    def test_unknown_before_first_press(self):
+        assert EventManager(EventBus()).pointer_may_select() is None
+
+    def test_plain_click_cannot_select(self):
+        mgr = EventManager(EventBus())
+        self._click(mgr, 100.0, motion=1)
+        assert mgr.pointer_may_select() is False
+        assert mgr.click_count == 1
+
+    def test_held_left_press_is_undecided(self):
+        mgr = EventManager(EventBus())
+        verdicts = []
+        mgr.bus.subscribe(EventType.MOUSE_CLICK, lambda e: verdicts.append(mgr.pointer_may_select()))
+        self._click(mgr, 100.0, motion=10)
+        assert verdicts == [None]
+        assert mgr.pointer_may_select() is True
+
+    def test_drag_can_select(self):
+        mgr = EventManager(EventBus())
+        self._click(mgr, 100.0, motion=10)
+        assert mgr.pointer_motion == 10
+        assert mgr.pointer_may_select() is True
+
+    def test_motion_without_button_is_not_counted(self):
+        mgr = EventManager(EventBus())
+        mgr.handle_raw_event(_ev(self.EV_REL, 0, 5))
+        assert mgr.pointer_motion == 0
+
+    def test_double_and_triple_click(self):
+        mgr = EventManager(EventBus())
+        self._click(mgr, 100.0)
+        self._click(mgr, 100.2)
+        assert (mgr.click_count, mgr.pointer_may_select()) == (2, True)
+        self._click(mgr, 100.4)
+        assert mgr.click_count == 3
+
+    def test_slow_second_click_is_a_new_click(self):
+        mgr = EventManager(EventBus())
+        self._click(mgr, 100.0)
+        self._click(mgr, 101.0)
+        assert (mgr.click_count, mgr.pointer_may_select()) == (1, False)
+
+    def test_shift_click_can_select(self):
+        mgr = EventManager(EventBus())
+        mgr.handle_raw_event(_ev(EV_KEY, 42, 1))
+        self._click(mgr, 100.0)
+        assert mgr.pointer_may_select() is True
+        mgr.handle_raw_event(_ev(EV_KEY, 42, 0))
+        self._click(mgr, 102.0)
+        assert mgr.pointer_may_select() is False
+
+    def test_right_button_drag_cannot_select(self):
+        mgr = EventManager(EventBus())
+        self._click(mgr, 100.0, code=self.BTN_RIGHT, motion=10)
+        assert mgr.pointer_may_select() is False
@@ -0,0 +1,81 @@
+"""Tests for EventRing (reader → handler queue)."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from lswitch.input.event_ring import EventRing
+
+
+def test_fifo_order():
+    ring = EventRing(4)
+    for i in range(3):
+        assert ring.put("dev", i)
+    assert ring.depth == 3
+    assert [ring.get(timeout=0)[1] for _ in range(3)] == [0, 1, 2]
+    assert ring.depth == 0
+
+
+def test_get_times_out_when_empty():
+    ring = EventRing(2)
+    assert ring.get(timeout=0.01) is None
+
+
+def test_overflow_drops_oldest_and_counts():
+    ring = EventRing(3)
+    for i in range(5):
+        ring.put("dev", i)
+    assert ring.depth == 3
+    assert ring.overflow_count == 2
+    assert [ring.get(timeout=0)[1] for _ in range(3)] == [2, 3, 4]
+
+
+def test_put_returns_false_on_overflow():
+    ring = EventRing(1)
+    assert ring.put("dev", 1) is True
+    assert ring.put("dev", 2) is False
+
+
+def test_wraps_around_preallocated_slots():
+    ring = EventRing(2)
+    seen = []
+    for i in range(7):
+        ring.put("dev", i)
+        seen.append(ring.get(timeout=0)[1])
+    assert seen == list(range(7))
+    assert ring.overflow_count == 0
+    assert len(ring._events) == 2
+
+
+def test_stats():
+    ring = EventRing(8)
+    for i in range(5):
+        ring.put("dev", i)
+    ring.get(timeout=0)
+    assert ring.stats() == {
+        "capacity": 8, "depth": 4, "high_water": 5, "overflow": 0, "total": 5,
+    }
+
+
+def test_close_wakes_consumer_after_drain():
+    ring = EventRing(4)
+    ring.put("dev", 1)
+    ring.close()
+    assert ring.get(timeout=1.0) == ("dev", 1)
+    assert ring.get(timeout=1.0) is None
+    assert ring.closed
+
+
+def test_blocking_get_receives_from_other_thread():
+    ring = EventRing(4)
+    t = threading.Timer(0.02, ring.put, args=("dev", 42))
+    t.start()
+    assert ring.get(timeout=2.0) == ("dev", 42)
+    t.join()
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        EventRing(0)
@@ -0,0 +1,120 @@
+"""Tests for KeyBuffer (bounded event buffer with word index)."""
+
+from __future__ import annotations
+
+import pytest
+
+from lswitch.core.events import KeyEventData
+from lswitch.core.key_buffer import KeyBuffer
+from lswitch.core.states import StateContext
+
+KEY_SPACE = 57
+KEY_ENTER = 28
+KEY_A, KEY_B, KEY_C = 30, 48, 46
+
+
+def _buf(codes, capacity=16):
+    buf = KeyBuffer(capacity=capacity)
+    for code in codes:
+        buf.push(code)
+    return buf
+
+
+def _codes(events):
+    return [e.code for e in events]
+
+
+class TestSequence:
+    def test_append_and_index(self):
+        buf = KeyBuffer()
+        buf.append(KeyEventData(code=KEY_A, value=1, shifted=True))
+        buf.append(KeyEventData(code=KEY_B, value=1))
+        assert len(buf) == 2
+        assert buf[0].code == KEY_A and buf[0].shifted is True
+        assert buf[-1].code == KEY_B and buf[-1].shifted is False
+        assert buf.code_at(-1) == KEY_B
+
+    def test_pop_returns_newest(self):
+        buf = _buf([KEY_A, KEY_B])
+        assert buf.pop().code == KEY_B
+        assert _codes(buf) == [KEY_A]
+
+    def test_pop_empty_raises(self):
+        with pytest.raises(IndexError):
+            KeyBuffer().pop()
+
+    def test_compares_equal_to_list(self):
+        assert KeyBuffer() == []
+        assert _buf([KEY_A]) == [KeyEventData(code=KEY_A, value=1)]
+
+    def test_reversed_and_slice(self):
+        buf = _buf([KEY_A, KEY_B, KEY_C])
+        assert _codes(reversed(buf)) == [KEY_C, KEY_B, KEY_A]
+        assert _codes(buf[1:]) == [KEY_B, KEY_C]
+
+    def test_release_value_preserved(self):
+        buf = KeyBuffer([KeyEventData(code=KEY_A, value=0)])
+        assert buf[0].value == 0
+
+
+class TestBounded:
+    def test_drops_oldest_when_full(self):
+        buf = _buf(range(2, 12), capacity=4)
+        assert len(buf) == 4
+        assert _codes(buf) == [8, 9, 10, 11]
+
+    def test_storage_does_not_grow(self):
+        buf = KeyBuffer(capacity=8)
+        for _ in range(1000):
+            buf.push(KEY_A)
+            buf.push(KEY_SPACE)
+        assert len(buf._codes) == 8
+        assert len(buf._boundaries) <= 8
+
+
+class TestWordIndex:
+    def test_last_word(self):
+        buf = _buf([KEY_A, KEY_A, KEY_SPACE, KEY_B, KEY_C])
+        assert _codes(buf.last_word()) == [KEY_B, KEY_C]
+
+    def test_last_word_skips_trailing_boundaries(self):
+        buf = _buf([KEY_A, KEY_SPACE, KEY_B, KEY_SPACE, KEY_ENTER])
+        assert buf.last_word_span() == (2, 3)
+        assert buf.trailing_boundaries() == 2
+
+    def test_no_boundary_whole_buffer(self):
+        buf = _buf([KEY_A, KEY_B])
+        assert buf.last_word_span() == (0, 2)
+
+    def test_only_boundaries_is_empty(self):
+        buf = _buf([KEY_SPACE, KEY_SPACE])
+        assert buf.last_word() == []
+
+    def test_pop_boundary_updates_index(self):
+        buf = _buf([KEY_A, KEY_SPACE, KEY_B])
+        buf.pop()
+        buf.pop()   # the space
+        buf.push(KEY_C)
+        assert _codes(buf.last_word()) == [KEY_A, KEY_C]
+
+    def test_last_n_words(self):
+        buf = _buf([KEY_A, KEY_SPACE, KEY_B, KEY_SPACE, KEY_SPACE, KEY_C, KEY_SPACE])
+        start, stop = buf.last_words_span(2)
+        assert _codes(buf[start:stop]) == [KEY_B, KEY_SPACE, KEY_SPACE, KEY_C]
+        assert buf.last_words_span(5) == (0, 6)
+
+    def test_index_survives_wraparound(self):
+        buf = _buf([KEY_A, KEY_SPACE, KEY_B, KEY_B, KEY_SPACE, KEY_C, KEY_C], capacity=4)
+        assert _codes(buf.last_word()) == [KEY_C, KEY_C]
+        buf.pop()
+        buf.pop()
+        buf.pop()   # the space
+        # The word start was overwritten: the word begins at the oldest key.
+        assert _codes(buf.last_word()) == [KEY_B]
+
+
+def test_state_context_coerces_list():
+    ctx = StateContext()
+    ctx.event_buffer = [KeyEventData(code=KEY_A, value=1)]
+    assert isinstance(ctx.event_buffer, KeyBuffer)
+    assert ctx.event_buffer[0].code == KEY_A
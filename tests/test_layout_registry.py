@@ -0,0 +1,71 @@
+"""Tests for lswitch.core.layout_registry."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from lswitch.core.layout_registry import LayoutRegistry, lang_of
+from lswitch.core.platform_snapshot import PlatformSnapshot
+from lswitch.platform.xkb_adapter import LayoutInfo
+
+EN = LayoutInfo(name="en", index=0, xkb_name="us")
+RU = LayoutInfo(name="ru", index=1, xkb_name="ru")
+DE = LayoutInfo(name="de", index=2, xkb_name="de")
+
+
+@pytest.mark.parametrize("layout, lang", [
+    (None, "en"),
+    (EN, "en"),
+    (LayoutInfo("English (US)", 0, "us"), "en"),
+    (LayoutInfo("us", 0, "us(intl)"), "en"),
+    (RU, "ru"),
+    (LayoutInfo("Russian", 1, "ru(phonetic)"), "ru"),
+    (LayoutInfo("Россия", 1, ""), "ru"),
+    (DE, "de"),
+])
+def test_lang_of(layout, lang):
+    assert lang_of(layout) == lang
+
+
+class TestLayoutRegistry:
+    def test_for_lang_uses_index(self):
+        xkb = MagicMock()
+        xkb.get_layouts.return_value = [EN, RU, DE]
+        registry = LayoutRegistry(xkb)
+        assert registry.for_lang("ru") is RU
+        assert registry.for_lang("EN") is EN
+        assert registry.for_lang("us") is EN     # xkb name alias
+        assert registry.for_lang("de") is DE
+        assert registry.for_lang("fr") is None
+        assert registry.for_lang("") is None
+
+    def test_first_layout_of_a_language_wins(self):
+        phonetic = LayoutInfo("ru", 2, "ru(phonetic)")
+        registry = LayoutRegistry()
+        assert registry.for_lang("ru", [EN, RU, phonetic]) is RU
+
+    def test_rebuilds_only_for_a_new_list(self):
+        layouts = [EN, RU]
+        registry = LayoutRegistry()
+        registry.for_lang("ru", layouts)
+        index = registry._by_lang
+        registry.for_lang("en", layouts)
+        assert registry._by_lang is index
+
+        swapped = [LayoutInfo("ru", 0, "ru"), LayoutInfo("en", 1, "us")]
+        assert registry.for_lang("ru", swapped).index == 0
+        assert registry._by_lang is not index
+
+    def test_no_adapter(self):
+        assert LayoutRegistry().for_lang("en") is None
+
+
+def test_snapshot_resolves_through_its_cached_layouts():
+    xkb = MagicMock()
+    xkb.get_layouts.return_value = [EN, RU]
+    snap = PlatformSnapshot(xkb)
+    assert snap.layout_for_lang("ru") is RU
+    assert snap.layout_for_lang("en") is EN
+    assert xkb.get_layouts.call_count == 1
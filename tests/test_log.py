@@ -0,0 +1,35 @@
+"""Tests for lswitch.log — TRACE level and lazy log arguments."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock
+
+import lswitch.log
+from lswitch.log import lazy, trace_enabled
+
+logger = logging.getLogger("lswitch.test_log")
+
+
+def test_lazy_not_evaluated_when_level_disabled(caplog):
+    func = MagicMock(return_value="abc")
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        logger.trace("buffer=%r", lazy(func))  # type: ignore[attr-defined]
+    func.assert_not_called()
+    assert caplog.records == []
+
+
+def test_lazy_evaluated_when_emitted(caplog):
+    func = MagicMock(return_value="abc")
+    with caplog.at_level(lswitch.log.TRACE, logger=logger.name):
+        logger.trace("buffer=%r len=%s", lazy(func), lazy(len, [1, 2]))  # type: ignore[attr-defined]
+    func.assert_called_once_with()
+    assert caplog.records[0].getMessage() == "buffer='abc' len=2"
+
+
+def test_trace_enabled_follows_level():
+    logger.setLevel(logging.DEBUG)
+    assert not trace_enabled(logger)
+    logger.setLevel(lswitch.log.TRACE)
+    assert trace_enabled(logger)
+    logger.setLevel(logging.NOTSET)
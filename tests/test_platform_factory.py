@@ -94,7 +94,9 @@ class TestCreatePlatformAdapters:
         with patch(
             "lswitch.platform.platform_factory.VirtualKeyboard",
             return_value=fake_vk,
-        ) as vk_cls:
+        ) as vk_cls, patch.object(
+            WaylandSystemAdapter, "start_clipboard_watch", return_value=False,
+        ):
             adapters = create_platform_adapters(
                 debug=True,
                 main_thread=main_thread,
@@ -128,6 +130,24 @@ class TestCreatePlatformAdapters:
         assert adapters.selection_mouse_release_tracking_enabled is True
         fake_layout_backend.validate.assert_called_once()
 
+    @pytest.mark.parametrize("strategy, polling", [
+        ("auto", True),
+        ("disabled", False),
+    ])
+    def test_wayland_polls_selection_only_with_primary_watcher(self, strategy, polling):
+        with patch("lswitch.platform.platform_factory.VirtualKeyboard"), patch.object(
+            WaylandSystemAdapter, "start_clipboard_watch", return_value=True,
+        ) as start:
+            adapters = create_platform_adapters(
+                main_thread=DirectMainThreadInvoker(),
+                layout_backend=MagicMock(),
+                wayland_selection_strategy=strategy,
+                env={"XDG_SESSION_TYPE": "wayland", "XDG_CURRENT_DESKTOP": "KDE"},
+            )
+
+        start.assert_called_once_with()
+        assert adapters.selection_polling_enabled is polling
+
     def test_unknown_session_fails_clearly(self):
         with patch("lswitch.platform.platform_factory.detect_session_type", return_value="unknown"):
             with pytest.raises(RuntimeError, match="requires an active"):
@@ -162,6 +182,8 @@ class TestCreatePlatformAdapters:
         assert isinstance(adapters.selection, X11SelectionAdapter)
         assert adapters.virtual_kb is fake_vk
         assert adapters.selection.PASTE_DELAY == 0.03
+        adapters.system.send_key_sequence("ctrl+v")
+        fake_vk.send_combo.assert_called_once_with("ctrl+v")
         vk_cls.assert_called_once_with(
             debug=True,
             timing={"key_repeat_delay": 0.006},
@@ -0,0 +1,74 @@
+"""Tests for lswitch.core.platform_snapshot."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from lswitch.core.platform_snapshot import PlatformSnapshot
+from lswitch.platform.selection_adapter import SelectionInfo
+from lswitch.platform.xkb_adapter import LayoutInfo
+
+EN = LayoutInfo(name="en", index=0, xkb_name="us")
+RU = LayoutInfo(name="ru", index=1, xkb_name="ru")
+
+
+def _snapshot():
+    xkb = MagicMock()
+    xkb.get_current_layout.return_value = EN
+    xkb.get_layouts.return_value = [EN, RU]
+    xkb.switch_layout.return_value = RU
+    selection = MagicMock()
+    selection.get_selection.return_value = SelectionInfo("sel", 1, 0.0)
+    selection.expand_selection_to_word.return_value = SelectionInfo("word", 1, 0.0)
+    return PlatformSnapshot(xkb, selection), xkb, selection
+
+
+class TestPlatformSnapshot:
+    def test_reads_are_cached(self):
+        snap, xkb, selection = _snapshot()
+        for _ in range(3):
+            assert snap.current_layout() is EN
+            assert snap.layouts() == [EN, RU]
+            assert snap.get_selection().text == "sel"
+        assert xkb.get_current_layout.call_count == 1
+        assert xkb.get_layouts.call_count == 1
+        assert selection.get_selection.call_count == 1
+        assert snap.total_calls == 3
+        assert snap.hits == 6
+
+    def test_switch_updates_current_layout(self):
+        snap, xkb, _ = _snapshot()
+        snap.current_layout()
+        assert snap.switch_layout(target=RU) is RU
+        xkb.switch_layout.assert_called_once_with(target=RU)
+        assert snap.current_layout() is RU
+        assert xkb.get_current_layout.call_count == 1
+
+    def test_cycle_switch_passes_no_arguments(self):
+        snap, xkb, _ = _snapshot()
+        xkb.switch_layout.return_value = None
+        snap.switch_layout()
+        xkb.switch_layout.assert_called_once_with()
+        snap.current_layout()               # unknown after switch → re-read
+        assert xkb.get_current_layout.call_count == 1
+
+    def test_expansion_and_replacement_refresh_selection(self):
+        snap, _, selection = _snapshot()
+        assert snap.get_selection().text == "sel"
+        assert snap.expand_selection_to_word().text == "word"
+        assert snap.get_selection().text == "word"
+        snap.replace_selection("слово")
+        snap.get_selection()
+        assert selection.get_selection.call_count == 2
+
+    def test_summary(self):
+        snap, _, _ = _snapshot()
+        assert snap.summary() == "0 (-), из кэша 0"
+        snap.layouts()
+        snap.layouts()
+        assert snap.summary() == "1 (get_layouts×1), из кэша 1"
+
+    def test_without_adapters(self):
+        snap = PlatformSnapshot(None)
+        assert snap.current_layout() is None
+        assert snap.layouts() == []
@@ -6,6 +6,7 @@ import importlib
 import sys
 import threading
 import time
+import types
 from contextlib import contextmanager
 
 import pytest
@@ -42,6 +43,172 @@ def _real_qtcore():
         sys.modules.update(saved)
 
 
+class _FakeSignal:
+    def __init__(self):
+        self.emitted = 0
+        self.slot = None
+
+    def connect(self, slot, connection_type=None):
+        self.slot = slot
+
+    def emit(self):
+        self.emitted += 1
+
+
+@pytest.fixture
+def fake_qt(monkeypatch):
+    """Minimal PyQt6.QtCore; ``deliver()`` plays the queued hop."""
+    state = types.SimpleNamespace(thread="worker", app=None, bridge=None)
+
+    class QObject:
+        def moveToThread(self, thread):
+            state.bridge = self
+
+    class QCoreApplication:
+        @staticmethod
+        def instance():
+            return state.app
+
+        def thread(self):
+            return "qt"
+
+    class QThread:
+        @staticmethod
+        def currentThread():
+            return state.thread
+
+    qtcore = types.ModuleType("PyQt6.QtCore")
+    qtcore.QObject = QObject
+    qtcore.QCoreApplication = QCoreApplication
+    qtcore.QThread = QThread
+    qtcore.Qt = types.SimpleNamespace(
+        ConnectionType=types.SimpleNamespace(QueuedConnection="queued"),
+    )
+    qtcore.pyqtSignal = lambda *types_: _FakeSignal()
+    qtcore.pyqtSlot = lambda *types_: (lambda func: func)
+    monkeypatch.setitem(sys.modules, "PyQt6", types.ModuleType("PyQt6"))
+    monkeypatch.setitem(sys.modules, "PyQt6.QtCore", qtcore)
+    state.app = QCoreApplication()
+
+    def deliver():
+        state.thread = "qt"
+        try:
+            state.bridge.execute()
+        finally:
+            state.thread = "worker"
+
+    state.deliver = deliver
+    return state
+
+
+class TestQueuedBatches:
+    def _invoker(self, fake_qt):
+        from lswitch.ui.qt_bridge import QtMainThreadInvoker
+
+        return QtMainThreadInvoker(fake_qt.app)
+
+    def test_submit_returns_future_and_pending_calls_share_one_hop(self, fake_qt):
+        invoker = self._invoker(fake_qt)
+
+        first = invoker.submit(lambda: 1)
+        second = invoker.submit(lambda value: value * 2, 21)
+
+        assert not first.done()
+        assert invoker._bridge.batch_requested.emitted == 1
+        fake_qt.deliver()
+        assert first.result(0) == 1
+        assert second.result(0) == 42
+        assert invoker.hops == 1
+
+        invoker.submit(lambda: 3)
+        assert invoker._bridge.batch_requested.emitted == 2
+
+    def test_identical_coalesced_requests_run_once(self, fake_qt):
+        invoker = self._invoker(fake_qt)
+        runs = []
+
+        def get_layout(name):
+            runs.append(name)
+            return len(runs)
+
+        first = invoker.submit(get_layout, "kde", coalesce=True)
+        second = invoker.submit(get_layout, "kde", coalesce=True)
+        other = invoker.submit(get_layout, "x11", coalesce=True)
+        plain = invoker.submit(get_layout, "kde")
+        fake_qt.deliver()
+
+        assert first.result(0) == second.result(0) == 1
+        assert other.result(0) == 2
+        assert plain.result(0) == 3
+        assert runs == ["kde", "x11", "kde"]
+        assert invoker.coalesced == 1
+
+        again = invoker.submit(get_layout, "kde", coalesce=True)
+        fake_qt.deliver()
+        assert again.result(0) == 4
+
+    def test_batch_sends_its_calls_in_one_hop_on_exit(self, fake_qt):
+        invoker = self._invoker(fake_qt)
+
+        with invoker.batch():
+            futures = [invoker.submit(lambda i=i: i) for i in range(3)]
+            assert invoker._bridge.batch_requested.emitted == 0
+
+        assert invoker._bridge.batch_requested.emitted == 1
+        fake_qt.deliver()
+        assert [future.result(0) for future in futures] == [0, 1, 2]
+
+    def test_qt_thread_calls_run_immediately(self, fake_qt):
+        invoker = self._invoker(fake_qt)
+        fake_qt.thread = "qt"
+
+        assert invoker.submit(lambda: 7).result(0) == 7
+        assert invoker.call(lambda: 8) == 8
+        assert invoker._bridge.batch_requested.emitted == 0
+
+    def test_call_times_out_and_propagates_errors(self, fake_qt):
+        invoker = self._invoker(fake_qt)
+
+        with pytest.raises(TimeoutError, match="Qt main-thread"):
+            invoker.call(lambda: None, timeout=0.01)
+
+        failing = invoker.submit(lambda: (_ for _ in ()).throw(ValueError("boom")))
+        fake_qt.deliver()
+        with pytest.raises(ValueError, match="boom"):
+            failing.result(0)
+
+    def test_queue_latency_is_recorded_per_function(self, fake_qt):
+        invoker = self._invoker(fake_qt)
+
+        def publish():
+            return None
+
+        invoker.submit(publish)
+        time.sleep(0.01)
+        fake_qt.deliver()
+
+        stats = invoker.latency[publish.__qualname__]
+        assert stats.calls == 1
+        assert stats.max >= 0.01
+        assert "publish" in invoker.latency_summary()
+        assert invoker.latency_summary().startswith("1 hops, 0 coalesced")
+
+    def test_queue_latency_is_recorded_per_label(self, fake_qt):
+        invoker = self._invoker(fake_qt)
+
+        def dispatch(method):
+            return method
+
+        invoker.submit(dispatch, "getLayout", label="dbus.getLayout")
+        invoker.submit(dispatch, "setLayout", label="dbus.setLayout")
+        invoker.submit(dispatch, "getLayout", label="dbus.getLayout")
+        fake_qt.deliver()
+
+        assert {name: s.calls for name, s in invoker.latency.items()} == {
+            "dbus.getLayout": 2, "dbus.setLayout": 1,
+        }
+
+
 class TestDirectMainThreadInvoker:
     def test_call_returns_result(self):
         invoker = DirectMainThreadInvoker()
@@ -54,6 +221,14 @@ class TestDirectMainThreadInvoker:
         with pytest.raises(ValueError, match="boom"):
             invoker.call(lambda: (_ for _ in ()).throw(ValueError("boom")))
 
+    def test_submit_returns_completed_future(self):
+        invoker = DirectMainThreadInvoker()
+
+        assert invoker.submit(lambda a: a + 1, 1, coalesce=True).result(0) == 2
+        assert isinstance(
+            invoker.submit(lambda: 1 / 0).exception(0), ZeroDivisionError,
+        )
+
 
 class TestQtMainThreadInvoker:
     def test_call_from_qt_thread_runs_directly(self):
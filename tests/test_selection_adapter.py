@@ -185,6 +185,37 @@ class TestX11SelectionAdapterUnit:
         # Empty string clipboard must also be restored (not skipped)
         assert sys._clipboard["clipboard"] == ""
 
+    def test_replace_selection_restores_once_paste_is_served(self, caplog):
+        """Observed paste completion replaces the fixed RESTORE_DELAY."""
+        sys = _RecordingSystemAdapter()
+        sys._clipboard["clipboard"] = "original"
+        waits = []
+        sys.wait_clipboard_served = lambda selection, timeout, since: waits.append(
+            (selection, timeout, sys._clipboard["clipboard"])
+        ) or True
+        adapter = X11SelectionAdapter(
+            system=sys, timing={"restore_delay": 5.0, "paste_timeout": 0.3},
+        )
+
+        start = time.monotonic()
+        with caplog.at_level("DEBUG", logger="lswitch.platform.selection_adapter"):
+            assert adapter.replace_selection("new text") is True
+
+        assert time.monotonic() - start < 1.0
+        assert waits == [("clipboard", 0.3, "new text")]
+        assert sys._clipboard["clipboard"] == "original"
+        assert "буфер прочитан" in caplog.text
+
+    def test_replace_selection_unobservable_paste_sleeps_restore_delay(self, monkeypatch):
+        sys = _RecordingSystemAdapter()     # base adapter: wait → None
+        adapter = X11SelectionAdapter(system=sys, timing={"restore_delay": 0.04})
+        sleeps = []
+        monkeypatch.setattr(
+            "lswitch.platform.selection_adapter.time.sleep", sleeps.append,
+        )
+        adapter.replace_selection("x")
+        assert sleeps[-1] == 0.04
+
     def test_expand_selection_to_word(self):
         sys = _RecordingSystemAdapter()
         sys._clipboard["primary"] = "word"
@@ -243,10 +274,12 @@ class TestX11SelectionAdapterUnit:
             timing={
                 "paste_delay": 0.03,
                 "restore_delay": 0.04,
+                "paste_timeout": 0.2,
                 "expand_selection_delay": 0.06,
             },
         )
 
         assert adapter.PASTE_DELAY == 0.03
         assert adapter.RESTORE_DELAY == 0.04
+        assert adapter.PASTE_TIMEOUT == 0.2
         assert adapter.EXPAND_SELECTION_DELAY == 0.06
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import time
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -280,6 +280,113 @@ class TestMouseRelease:
         assert app._selection_valid is True
 
 
+class TestPointerGestureGate:
+    """Selection reads are skipped for gestures that cannot select text."""
+
+    def _app(self, texts, may_select):
+        app = _make_app()
+        passive = _PassiveSelection(texts)
+        app.selection = passive
+        app._platform = SimpleNamespace(selection_mouse_release_tracking_enabled=True)
+        app.event_manager = MagicMock()
+        app.event_manager.pointer_may_select.return_value = may_select
+        return app, passive
+
+    def test_plain_click_skips_both_reads(self):
+        app, passive = self._app(["word"], False)
+
+        app._on_mouse_click(_mouse_event())
+        app._on_mouse_release(_mouse_release_event())
+
+        assert passive.passive_calls == 0
+        assert app._selection_reads_skipped == 2
+        assert app._selection_valid is False
+
+    def test_drag_reads_on_release(self):
+        app, passive = self._app(["new"], False)
+        app._selection_baseline_initialized = True
+
+        app._on_mouse_click(_mouse_event())
+        app.event_manager.pointer_may_select.return_value = True
+        app._on_mouse_release(_mouse_release_event())
+
+        assert passive.passive_calls == 1
+        assert app._selection_valid is True
+        assert app._prev_sel_text == "new"
+
+    def test_reselect_after_skipped_click_is_fresh(self):
+        app, passive = self._app(["word"], False)
+        app._prev_sel_text = "word"
+        app._selection_baseline_initialized = True
+
+        # Plain click (probably deselecting "word") is not read...
+        app._on_mouse_click(_mouse_event())
+        app._on_mouse_release(_mouse_release_event())
+        # ...so selecting the same word again still counts as fresh.
+        app.event_manager.pointer_may_select.return_value = True
+        app._on_mouse_click(_mouse_event())
+
+        assert app._selection_valid is True
+        assert app._selection_baseline_unconfirmed is False
+
+
+class TestPointerGestureRealEventManager:
+    """Gate driven by raw evdev events through the real EventManager."""
+
+    BTN_LEFT, EV_KEY, EV_REL = 272, 1, 2
+
+    def _app(self, texts):
+        from lswitch.core.event_manager import EventManager
+
+        app, passive = _make_app(), _PassiveSelection(texts)
+        app.selection = passive
+        app._platform = SimpleNamespace(selection_mouse_release_tracking_enabled=True)
+        app.event_manager = EventManager(app.event_bus)
+        return app, passive
+
+    def _gesture(self, app, motion: int):
+        def ev(type_, code, value):
+            return SimpleNamespace(type=type_, code=code, value=value)
+
+        app.event_manager.handle_raw_event(ev(self.EV_KEY, self.BTN_LEFT, 1))
+        for _ in range(motion):
+            app.event_manager.handle_raw_event(ev(self.EV_REL, 0, 5))
+        app.event_manager.handle_raw_event(ev(self.EV_KEY, self.BTN_LEFT, 0))
+
+    def test_drag_with_unchanged_primary_is_not_fresh(self):
+        """Window move / scrollbar / DnD: a drag that did not select."""
+        app, passive = self._app(["word"])
+        app._prev_sel_text = "word"
+        app._selection_baseline_initialized = True
+
+        self._gesture(app, motion=10)
+
+        assert passive.passive_calls == 2       # press primes, release compares
+        assert app._selection_valid is False
+        assert app._selection_baseline_unconfirmed is False
+
+    def test_drag_selecting_new_text_is_fresh(self):
+        app, passive = self._app(["word", "new"])
+        app._prev_sel_text = "word"
+        app._selection_baseline_initialized = True
+
+        self._gesture(app, motion=10)
+
+        assert app._selection_valid is True
+        assert app._prev_sel_text == "new"
+
+    def test_plain_click_skips_release_read_and_unconfirms(self):
+        app, passive = self._app(["word"])
+        app._prev_sel_text = "word"
+        app._selection_baseline_initialized = True
+
+        self._gesture(app, motion=0)
+
+        assert passive.passive_calls == 1       # baseline primed at press only
+        assert app._selection_reads_skipped == 1
+        assert app._selection_baseline_unconfirmed is True
+
+
 class TestPollerCallback:
     """Tests for _on_poller_selection_changed — sets fresh=True, does NOT update baseline."""
 
@@ -581,7 +688,7 @@ class TestDoConversionUsesSelectionValid:
         original_convert = app.conversion_engine.convert
         convert_calls = []
 
-        def mock_convert(ctx, selection_valid=False):
+        def mock_convert(ctx, selection_valid=False, snapshot=None):
             convert_calls.append(selection_valid)
             return True
 
@@ -604,7 +711,7 @@ class TestDoConversionUsesSelectionValid:
 
         convert_calls = []
 
-        def mock_convert(ctx, selection_valid=False):
+        def mock_convert(ctx, selection_valid=False, snapshot=None):
             convert_calls.append(selection_valid)
             return True
 
@@ -651,7 +758,7 @@ class TestDoConversionUsesSelectionValid:
         app.state_manager._state = State.CONVERTING
 
         # Mock convert to raise
-        def mock_convert(ctx, selection_valid=False):
+        def mock_convert(ctx, selection_valid=False, snapshot=None):
             raise RuntimeError("conversion failed")
 
         app.conversion_engine.convert = mock_convert
@@ -676,7 +783,7 @@ class TestDoConversionUsesSelectionValid:
             text="конвертированный", owner_id=1, timestamp=time.time(),
         )
 
-        def mock_convert(ctx, selection_valid=False):
+        def mock_convert(ctx, selection_valid=False, snapshot=None):
             return True
 
         app.conversion_engine.convert = mock_convert
@@ -703,10 +810,41 @@ class TestDoConversionUsesSelectionValid:
         app.conversion_engine.convert.assert_called_once_with(
             app.state_manager.context,
             selection_valid=False,
+            snapshot=ANY,
         )
         app.selection.get_selection.assert_not_called()
         assert app._selection_valid is False
 
+    def test_selection_conversion_reads_platform_once(self, caplog):
+        """Learning and SelectionMode share one selection/layout read."""
+        from lswitch.platform.xkb_adapter import LayoutInfo
+
+        app = _make_app()
+        app._platform = SimpleNamespace(
+            selection_polling_enabled=False,
+            selection_mouse_release_tracking_enabled=False,
+        )
+        app.user_dict = MagicMock()
+        app._selection_valid = True
+        app.state_manager.context.state = State.CONVERTING
+        app.selection.get_selection.return_value = SelectionInfo(
+            text="ghbdtn", owner_id=7, timestamp=0.0,
+        )
+        app.selection.replace_selection.return_value = True
+        app.xkb.get_layouts.return_value = [
+            LayoutInfo(name="en", index=0, xkb_name="us"),
+            LayoutInfo(name="ru", index=1, xkb_name="ru"),
+        ]
+
+        with caplog.at_level("DEBUG", logger="lswitch.app"):
+            app._do_conversion()
+
+        app.selection.replace_selection.assert_called_once_with("привет")
+        assert app.selection.get_selection.call_count == 1
+        assert app.xkb.get_layouts.call_count == 1
+        assert "вызовов платформы 4 (get_layouts×1, get_selection×1, " \
+            "replace_selection×1, switch_layout×1), из кэша 1" in caplog.text
+
     def test_do_conversion_uses_passive_baseline_reader_when_available(self):
         app = _make_app()
         passive = _PassiveSelection(["passive baseline"])
@@ -743,7 +881,7 @@ class TestDoConversionUsesSelectionValid:
 
         convert_calls = []
 
-        def mock_convert(ctx, selection_valid=False):
+        def mock_convert(ctx, selection_valid=False, snapshot=None):
             convert_calls.append(selection_valid)
             return True
 
@@ -774,7 +912,7 @@ class TestStickyRetypeBuffer:
         app.state_manager.context.state = State.CONVERTING
         app.state_manager._state = State.CONVERTING
 
-        def mock_convert(context, selection_valid=False):
+        def mock_convert(context, selection_valid=False, snapshot=None):
             return True
 
         app.conversion_engine.convert = mock_convert
@@ -806,7 +944,7 @@ class TestStickyRetypeBuffer:
 
         convert_calls = []
 
-        def mock_convert(context, selection_valid=False):
+        def mock_convert(context, selection_valid=False, snapshot=None):
             # At this point context should have restored events
             convert_calls.append(context.chars_in_buffer)
             return True
@@ -899,7 +1037,7 @@ class TestStickyRetypeBuffer:
         app.state_manager.context.state = State.CONVERTING
         app.state_manager._state = State.CONVERTING
 
-        def mock_convert(context, selection_valid=False):
+        def mock_convert(context, selection_valid=False, snapshot=None):
             return True
 
         app.conversion_engine.convert = mock_convert
@@ -0,0 +1,75 @@
+"""Tests for lswitch.input.signal_fd (Linux signalfd via ctypes)."""
+
+from __future__ import annotations
+
+import os
+import select
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from lswitch.input import signal_fd
+from lswitch.input.signal_fd import SignalFD, child_argv
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="signalfd is Linux-only")
+
+
+def test_signal_is_read_from_fd():
+    sfd = SignalFD.open([signal.SIGUSR1])
+    if sfd is None:
+        pytest.skip("signalfd unavailable")
+    try:
+        assert signal.SIGUSR1 in signal.pthread_sigmask(signal.SIG_BLOCK, [])
+        os.kill(os.getpid(), signal.SIGUSR1)
+        ready, _, _ = select.select([sfd], [], [], 1.0)
+        assert ready == [sfd]
+        assert sfd.read() == [signal.SIGUSR1]
+        assert sfd.read() == []
+    finally:
+        sfd.close()
+    assert signal.SIGUSR1 not in signal.pthread_sigmask(signal.SIG_BLOCK, [])
+
+
+def test_close_is_idempotent():
+    sfd = SignalFD.open([signal.SIGUSR2])
+    if sfd is None:
+        pytest.skip("signalfd unavailable")
+    sfd.close()
+    sfd.close()
+
+
+def _child_blocked_mask(argv=lambda args: args) -> int:
+    out = subprocess.run(
+        argv(["grep", "^SigBlk:", "/proc/self/status"]),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return int(out.split()[1], 16)
+
+
+def test_children_do_not_inherit_the_blocked_mask():
+    assert child_argv(["true"]) == ["true"]
+    sfd = SignalFD.open([signal.SIGTERM])
+    if sfd is None:
+        pytest.skip("signalfd unavailable")
+    try:
+        if not signal_fd._env_resets_signals():
+            pytest.skip("env --default-signal unavailable")
+        sigterm = 1 << (signal.SIGTERM - 1)
+        assert _child_blocked_mask() & sigterm              # the leak
+        assert not _child_blocked_mask(child_argv) & sigterm
+    finally:
+        sfd.close()
+    assert child_argv(["true"]) == ["true"]
+
+
+def test_commands_run_unwrapped_without_env_support(monkeypatch):
+    monkeypatch.setattr(signal_fd, "_blocked", frozenset({signal.SIGTERM}))
+    monkeypatch.setattr(signal_fd, "_env_default_signal", False)
+    assert child_argv(["xclip", "-o"]) == ["xclip", "-o"]
+
+    monkeypatch.setattr(signal_fd, "_env_default_signal", True)
+    assert child_argv(["xclip", "-o"]) == [
+        "env", f"--default-signal={int(signal.SIGTERM)}", "--", "xclip", "-o",
+    ]
@@ -131,9 +131,7 @@ class TestUdevMonitorCallbacks:
         mock_monitor.poll = fake_poll
 
         with patch.object(_fake_pyudev, "Context", return_value=MagicMock()), \
-             patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor), \
-             patch("lswitch.input.udev_monitor.time") as mock_time:
-            mock_time.sleep = MagicMock()  # skip real sleep
+             patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor):
             mon._running = True
             mon._run()
 
@@ -184,9 +182,7 @@ class TestUdevMonitorCallbacks:
         mock_monitor.poll = fake_poll
 
         with patch.object(_fake_pyudev, "Context", return_value=MagicMock()), \
-             patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor), \
-             patch("lswitch.input.udev_monitor.time") as mock_time:
-            mock_time.sleep = MagicMock()
+             patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor):
             mon._running = True
             mon._run()
 
@@ -238,8 +234,37 @@ class TestUdevMonitorCallbacks:
         mock_monitor.poll = fake_poll
 
         with patch.object(_fake_pyudev, "Context", return_value=MagicMock()), \
-             patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor), \
-             patch("lswitch.input.udev_monitor.time") as mock_time:
-            mock_time.sleep = MagicMock()
+             patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor):
             mon._running = True
             mon._run()  # should not raise
+
+
+class TestUdevMonitorAttach:
+    def test_attach_registers_monitor_with_device_manager(self):
+        mon = UdevMonitor()
+        dm = MagicMock()
+        mock_monitor = MagicMock()
+        with patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor):
+            assert mon.attach(dm) is True
+        dm.add_watch.assert_called_once_with(mock_monitor, mon._on_readable)
+        assert mon.is_running
+        assert mon._thread is None
+
+        mon.stop()
+        dm.remove_watch.assert_called_once_with(mock_monitor)
+        assert not mon.is_running
+
+    def test_readable_drains_all_pending_events(self):
+        removed: list[str] = []
+        mon = UdevMonitor(on_removed=removed.append)
+        mock_monitor = MagicMock()
+        mock_monitor.poll.side_effect = [
+            _make_udev_device("remove", "/dev/input/event3"),
+            _make_udev_device("remove", "/dev/input/event4"),
+            None,
+        ]
+        with patch.object(_fake_pyudev.Monitor, "from_netlink", return_value=mock_monitor):
+            mon.attach(MagicMock())
+        mon._on_readable()
+        assert removed == ["/dev/input/event3", "/dev/input/event4"]
+        mock_monitor.poll.assert_called_with(timeout=0)
@@ -33,7 +33,11 @@ if not hasattr(_evdev_mod.ecodes, "EV_KEY"):
 if not hasattr(_evdev_mod, "UInput"):
     _evdev_mod.UInput = MagicMock
 
-from lswitch.input.virtual_keyboard import VirtualKeyboard  # noqa: E402
+from lswitch.input.virtual_keyboard import (  # noqa: E402
+    KeyTransaction,
+    Pacing,
+    VirtualKeyboard,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -318,6 +322,139 @@ class TestTypeText:
 
             assert vk.type_text("🙂", layout_name="en") is False
 
+    def test_type_text_prefers_live_keymap_lookup(self):
+        mock_uinput = MagicMock()
+        with patch.object(_evdev_mod, "UInput", return_value=mock_uinput):
+            vk = VirtualKeyboard()
+            keymap = {("ß", "de"): (12, False)}
+            vk.set_char_lookup(lambda ch, layout: keymap.get((ch, layout)))
+
+            assert vk.type_text("ßa", layout_name="de") is True
+
+            writes = [(c.args[1], c.args[2]) for c in mock_uinput.write.call_args_list]
+            assert writes == [(12, 1), (12, 0), (30, 1), (30, 0)]   # 'a' via US fallback
+
+
+def _read_key_events(read_fd: int) -> list[tuple[int, int, int]]:
+    import os
+    import struct
+
+    record = struct.Struct("@llHHi")
+    data = os.read(read_fd, 65536)
+    return [
+        (etype, code, value)
+        for _sec, _usec, etype, code, value in record.iter_unpack(data)
+    ]
+
+
+class TestKeyTransaction:
+    def _vk_with_pipe(self):
+        import os
+
+        read_fd, write_fd = os.pipe()
+        mock_uinput = MagicMock()
+        mock_uinput.fd = write_fd
+        with patch.object(_evdev_mod, "UInput", return_value=mock_uinput):
+            vk = VirtualKeyboard()
+        return vk, mock_uinput, read_fd, write_fd
+
+    def test_unpaced_transaction_uses_single_write(self):
+        import os
+
+        vk, mock_uinput, read_fd, write_fd = self._vk_with_pipe()
+        try:
+            with patch("lswitch.input.virtual_keyboard.os.write", wraps=os.write) as writer, \
+                    patch("lswitch.input.virtual_keyboard.time.sleep") as sleeper:
+                tx = vk.transaction(Pacing())
+                tx.tap(14, n_times=3).replay([MagicMock(code=30, value=1, shifted=True)])
+                assert tx.write_count == 1
+                tx.commit()
+
+            assert writer.call_count == 1
+            sleeper.assert_not_called()
+            mock_uinput.write.assert_not_called()
+            events = _read_key_events(read_fd)
+            keys = [(code, value) for etype, code, value in events if etype == 1]
+            assert keys == [
+                (14, 1), (14, 0), (14, 1), (14, 0), (14, 1), (14, 0),
+                (42, 1), (30, 1), (30, 0), (42, 0),
+            ]
+            # Every key transition is its own SYN_REPORT frame.
+            assert [etype for etype, _code, _value in events] == [1, 0] * 10
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_pacing_splits_writes_only_at_pauses(self):
+        import os
+
+        vk, _mock_uinput, read_fd, write_fd = self._vk_with_pipe()
+        try:
+            with patch("lswitch.input.virtual_keyboard.os.write", wraps=os.write) as writer, \
+                    patch("lswitch.input.virtual_keyboard.time.sleep") as sleeper:
+                vk.transaction(Pacing(press_delay=0.0, tap_delay=0.002)).tap(30, n_times=3).commit()
+
+            assert writer.call_count == 3
+            assert sleeper.call_args_list == [call(0.002), call(0.002)]
+            keys = [(code, value) for etype, code, value in _read_key_events(read_fd) if etype == 1]
+            assert keys == [(30, 1), (30, 0)] * 3
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_call_step_runs_between_batches(self):
+        import os
+
+        vk, _mock_uinput, read_fd, write_fd = self._vk_with_pipe()
+        order: list[str] = []
+        try:
+            def fake_write(fd, data):
+                order.append("write")
+                return len(data)
+
+            with patch("lswitch.input.virtual_keyboard.os.write", side_effect=fake_write):
+                tx = vk.transaction(Pacing())
+                tx.tap(14, n_times=2).call(lambda: order.append("switch")).tap(30)
+                tx.commit()
+
+            assert order == ["write", "switch", "write"]
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_default_transaction_is_one_write(self):
+        import os
+
+        vk, _mock_uinput, read_fd, write_fd = self._vk_with_pipe()
+        try:
+            with patch("lswitch.input.virtual_keyboard.os.write", wraps=os.write) as writer, \
+                    patch("lswitch.input.virtual_keyboard.time.sleep") as sleeper:
+                tx = vk.transaction()
+                tx.tap(14, n_times=5).combo([29, 47])
+                assert tx.write_count == 1
+                tx.commit()
+
+            assert writer.call_count == 1
+            sleeper.assert_not_called()
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_default_pacing_follows_timing(self):
+        with patch.object(_evdev_mod, "UInput", return_value=MagicMock()):
+            vk = VirtualKeyboard(timing={"key_press_delay": 0.0, "key_repeat_delay": 0.003})
+
+        assert vk.pacing == Pacing(press_delay=0.0, tap_delay=0.003)
+        assert isinstance(vk.transaction(), KeyTransaction)
+
+    def test_commit_without_uinput_still_runs_calls(self):
+        with patch.object(_evdev_mod, "UInput", side_effect=Exception("no access")):
+            vk = VirtualKeyboard()
+
+        called = []
+        vk.transaction().tap(30).call(lambda: called.append(True)).commit()
+        assert called == [True]
+
 
 class TestWriteWithNoUInput:
     def test_write_does_not_crash_when_uinput_is_none(self):
@@ -338,9 +475,11 @@ class TestClose:
         with patch.object(_evdev_mod, "UInput", return_value=mock_uinput):
             vk = VirtualKeyboard()
 
+        assert vk.available is True
         vk.close()
         mock_uinput.close.assert_called_once()
         assert vk._uinput is None
+        assert vk.available is False
 
     def test_close_when_already_none(self):
         """close() when _uinput is None should not crash."""
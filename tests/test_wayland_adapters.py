@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import base64
 import importlib
+import os
 import subprocess
 import sys
+import threading
+import time
 import types
 from contextlib import contextmanager
 from unittest.mock import MagicMock
@@ -21,6 +25,7 @@ from lswitch.platform.wayland import (
     WaylandSystemAdapter,
     WaylandLayoutAdapter,
     WaylandLayoutBackendError,
+    WlPasteWatcher,
 )
 from lswitch.platform.xkb_adapter import LayoutInfo
 
@@ -309,6 +314,299 @@ class TestWaylandSystemAdapter:
         assert adapter.get_clipboard(selection="clipboard") == "qt"
 
 
+class _FakeWatchProcess:
+    """``wl-paste --watch`` stand-in: lines written by push() reach stdout."""
+
+    def __init__(self, args):
+        self.args = args
+        read_fd, self._write_fd = os.pipe()
+        self.stdout = os.fdopen(read_fd, "rb")
+        self.returncode = None
+
+    def push(self, text: str) -> None:
+        os.write(self._write_fd, base64.b64encode(text.encode("utf-8")) + b"\n")
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self) -> None:
+        if self.returncode is None:
+            self.returncode = -15
+            os.close(self._write_fd)
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class TestWlPasteWatch:
+    def _make(self, runner=None):
+        procs: dict[str, _FakeWatchProcess] = {}
+        calls = []
+
+        def popen(args, **kwargs):
+            proc = _FakeWatchProcess(args)
+            procs["primary" if "--primary" in args else "clipboard"] = proc
+            return proc
+
+        def default_runner(args, **kwargs):
+            calls.append(args)
+            return subprocess.CompletedProcess(args, 0, stdout="forked", stderr="")
+
+        adapter = WaylandSystemAdapter(
+            virtual_kb=MagicMock(),
+            main_thread=DirectMainThreadInvoker(),
+            compositor="kde",
+            command_lookup=lambda command: f"/usr/bin/{command}",
+            command_runner=runner or default_runner,
+            command_popen=popen,
+        )
+        return adapter, procs, calls
+
+    @staticmethod
+    def _push(adapter, proc, selection, text):
+        generation = adapter.clipboard_generation(selection)
+        proc.push(text)
+        assert adapter.wait_clipboard_change(selection, generation, 1.0)
+
+    def test_starts_one_helper_per_selection(self):
+        adapter, procs, _ = self._make()
+
+        assert adapter.start_clipboard_watch() is True
+        assert procs["clipboard"].args[:3] == ["wl-paste", "--watch", "sh"]
+        assert procs["primary"].args[:2] == ["wl-paste", "--primary"]
+        adapter.close()
+        assert procs["primary"].returncode is not None
+        assert adapter.clipboard_generation("primary") is None
+
+    def test_no_helpers_without_wl_clipboard(self):
+        adapter = WaylandSystemAdapter(
+            virtual_kb=MagicMock(),
+            main_thread=DirectMainThreadInvoker(),
+            enable_wl_clipboard=False,
+            command_popen=MagicMock(side_effect=AssertionError("spawned")),
+        )
+
+        assert adapter.start_clipboard_watch() is False
+        assert adapter.watch_selection_owner("primary", MagicMock()) is False
+
+    def test_reads_are_served_from_the_cache(self):
+        adapter, procs, calls = self._make()
+        adapter.start_clipboard_watch()
+
+        assert adapter.get_clipboard("primary") == "forked"   # nothing reported yet
+        self._push(adapter, procs["primary"], "primary", "привет")
+
+        assert adapter.get_clipboard("primary") == "привет"
+        assert adapter.get_clipboard("selection") == "привет"
+        assert len(calls) == 1
+        adapter.close()
+
+    def test_own_write_is_trusted_only_once_reported(self):
+        adapter, procs, calls = self._make()
+        adapter.start_clipboard_watch()
+        self._push(adapter, procs["clipboard"], "clipboard", "old")
+
+        adapter.set_clipboard("new", selection="clipboard")
+        self._push(adapter, procs["clipboard"], "clipboard", "older")   # late report
+        assert adapter.get_clipboard("clipboard") == "forked"
+        self._push(adapter, procs["clipboard"], "clipboard", "new")
+        assert adapter.get_clipboard("clipboard") == "new"
+        assert [args[0] for args in calls] == ["wl-copy", "wl-paste"]
+        adapter.close()
+
+    def test_oversized_or_binary_content_is_not_cached(self, monkeypatch):
+        monkeypatch.setattr(WlPasteWatcher, "MAX_TEXT_BYTES", 4)
+        adapter, procs, _ = self._make()
+        adapter.start_clipboard_watch()
+
+        self._push(adapter, procs["clipboard"], "clipboard", "too long")
+        assert adapter.get_clipboard("clipboard") == "forked"
+        adapter.close()
+
+    def test_primary_changes_notify_with_generation(self):
+        adapter, procs, _ = self._make()
+        adapter.start_clipboard_watch()
+        seen = []
+        done = threading.Event()
+
+        def callback(owner_id):
+            seen.append(owner_id)
+            done.set()
+
+        assert adapter.watch_selection_owner("primary", callback) is True
+        procs["primary"].push("word")
+        assert done.wait(1.0)
+        assert seen == [1]
+        adapter.close()
+
+    def test_helper_exit_falls_back_to_one_shot_reads(self):
+        adapter, procs, calls = self._make()
+        adapter.start_clipboard_watch()
+        self._push(adapter, procs["primary"], "primary", "cached")
+
+        procs["primary"].terminate()
+
+        assert adapter.get_clipboard("primary") == "forked"
+        assert adapter.clipboard_generation("primary") is None
+        adapter.close()
+
+
+class _FakePasteOnceProcess:
+    """``wl-copy --foreground --paste-once`` stand-in."""
+
+    def __init__(self, args):
+        self.args = args
+        self.stdin = MagicMock()
+        self.returncode = None
+        self.terminated = False
+
+    def consume(self) -> None:
+        self.returncode = 0
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if self.returncode is None and not self.terminated:
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.returncode = -15
+
+
+class TestWaylandPasteOnce:
+    PREFIX = WaylandSystemAdapter.PASTE_ONCE_MIME_PREFIX
+    # What wl-copy advertises next to a text/* --type.
+    TEXT_TYPES = "text/plain;charset=utf-8\ntext/plain\nTEXT\nSTRING\nUTF8_STRING"
+
+    def _make(self, offered=True, consume_on_list=False):
+        procs = []
+        listed = []
+
+        def popen(args, **kwargs):
+            proc = (
+                _FakeWatchProcess(args) if args[0] == "wl-paste"
+                else _FakePasteOnceProcess(args)
+            )
+            procs.append(proc)
+            return proc
+
+        def runner(args, **kwargs):
+            listed.append(args)
+            helper = procs[-1]
+            if consume_on_list:
+                helper.consume()
+            # A previous owner offering plain text alone must not pass.
+            types = "text/plain;charset=utf-8"
+            if offered:
+                types = f"{helper.args[-1]}\n{self.TEXT_TYPES}"
+            return subprocess.CompletedProcess(args, 0, stdout=f"{types}\n", stderr="")
+
+        adapter = WaylandSystemAdapter(
+            virtual_kb=MagicMock(),
+            main_thread=DirectMainThreadInvoker(),
+            compositor="kde",
+            command_lookup=lambda command: f"/usr/bin/{command}",
+            command_runner=runner,
+            command_popen=popen,
+        )
+        adapter.PASTE_READY_POLL_INTERVAL = 0.0
+        return adapter, procs, listed
+
+    def test_served_once_the_helper_exits(self):
+        adapter, procs, listed = self._make()
+
+        assert adapter.set_clipboard_paste_once("привет") is True
+        helper = procs[0]
+        assert helper.args[:4] == ["wl-copy", "--foreground", "--paste-once", "--type"]
+        assert helper.args[4].startswith(self.PREFIX)
+        helper.stdin.write.assert_called_once_with("привет".encode("utf-8"))
+        assert listed == [["wl-paste", "--no-newline", "--list-types"]]
+
+        helper.consume()
+        assert adapter.wait_clipboard_served("clipboard", timeout=0.5) is True
+        assert adapter.wait_clipboard_served("clipboard", timeout=0.5) is None
+
+    def test_read_before_ctrl_v_is_not_the_paste(self):
+        adapter, procs, _ = self._make()
+        adapter.set_clipboard_paste_once("text")
+        procs[0].consume()                          # clipboard manager
+
+        assert adapter.paste_once_pending("clipboard") is False
+        assert adapter.wait_clipboard_served("clipboard", since=time.monotonic()) is None
+        assert adapter.wait_clipboard_served("clipboard") is None
+
+    def test_exit_after_ctrl_v_is_the_paste(self):
+        adapter, procs, _ = self._make()
+        adapter.set_clipboard_paste_once("text")
+        pasted_at = time.monotonic()
+
+        assert adapter.paste_once_pending("clipboard") is True
+        procs[0].consume()                          # the application
+        assert adapter.wait_clipboard_served("clipboard", since=pasted_at) is True
+
+    def test_unread_helper_is_stopped_after_the_timeout(self):
+        adapter, procs, _ = self._make()
+        adapter.set_clipboard_paste_once("text")
+
+        assert adapter.wait_clipboard_served("clipboard", timeout=0.01) is False
+        assert procs[0].terminated is True
+
+    def test_consumed_before_ctrl_v_reports_failure(self):
+        adapter, procs, _ = self._make(offered=False, consume_on_list=True)
+
+        assert adapter.set_clipboard_paste_once("text") is False
+        assert adapter.wait_clipboard_served("clipboard") is None
+
+    def test_ready_timeout_gives_up_the_helper(self):
+        adapter, procs, listed = self._make(offered=False)
+
+        assert adapter.set_clipboard_paste_once("text", ready_timeout=0.0) is False
+        assert len(listed) == 1
+        assert procs[0].terminated is True
+        assert adapter.wait_clipboard_served("clipboard") is None
+
+    def test_previous_text_owner_is_not_taken_for_the_helper(self):
+        adapter, procs, listed = self._make(offered=False)
+
+        assert adapter.set_clipboard_paste_once("text", ready_timeout=0.02) is False
+        assert len(listed) > 1
+
+    def test_each_paste_gets_its_own_marker(self):
+        adapter, procs, _ = self._make()
+        adapter.set_clipboard_paste_once("a")
+        adapter.set_clipboard_paste_once("b")
+
+        assert procs[0].args[-1] != procs[1].args[-1]
+
+    def test_clipboard_watcher_is_paused_while_the_helper_serves(self):
+        adapter, procs, _ = self._make()
+        adapter.start_clipboard_watch()
+        clipboard_watch = next(p for p in procs if "--primary" not in p.args)
+
+        adapter.set_clipboard_paste_once("text")
+        assert clipboard_watch.returncode is not None
+        assert adapter.clipboard_generation("clipboard") is None
+        assert adapter.clipboard_generation("primary") is not None
+
+        procs[-1].consume()
+        adapter.wait_clipboard_served("clipboard")
+        assert adapter.clipboard_generation("clipboard") is not None
+        adapter.close()
+
+    def test_unavailable_without_wl_clipboard(self):
+        adapter = WaylandSystemAdapter(
+            virtual_kb=MagicMock(),
+            main_thread=DirectMainThreadInvoker(),
+            enable_wl_clipboard=False,
+        )
+
+        assert adapter.set_clipboard_paste_once("text") is False
+        assert adapter.wait_clipboard_served("clipboard") is None
+
+
 class _RecordingWaylandSystem:
     def __init__(
         self,
@@ -474,6 +772,37 @@ class TestWaylandSelectionAdapter:
         assert info.owner_id == 0
         assert system.keys_sent == ["ctrl+c", "ctrl+insert"]
 
+    def test_copy_wait_sleeps_on_clipboard_watcher_instead_of_polling(self, monkeypatch):
+        system = _RecordingWaylandSystem(clipboard="old")
+        waits = []
+
+        def wait_clipboard_change(selection, generation, timeout):
+            waits.append((selection, generation))
+            system.clipboard = "selected"      # Ctrl+C landed meanwhile
+            return True
+
+        system.clipboard_generation = lambda selection="clipboard": 7
+        system.wait_clipboard_change = wait_clipboard_change
+        adapter = _make_selection_adapter(system)
+        adapter.COPY_WAIT_TIMEOUT = 1.0
+        monkeypatch.setattr(
+            "lswitch.platform.wayland.time.sleep",
+            MagicMock(side_effect=AssertionError("polled")),
+        )
+
+        assert adapter.get_selection().text == "selected"
+        assert waits == [("clipboard", 7)]
+        assert system.keys_sent == ["ctrl+c"]
+
+    def test_watch_owner_changes_uses_primary_watcher(self):
+        system = MagicMock()
+        system.watch_selection_owner.return_value = True
+        adapter = WaylandSelectionAdapter(system=system, main_thread=DirectMainThreadInvoker())
+        callback = MagicMock()
+
+        assert adapter.watch_owner_changes(callback) is True
+        system.watch_selection_owner.assert_called_once_with("primary", callback)
+
     def test_get_selection_returns_empty_and_restores_clipboard_when_copy_fails(self):
         system = _RecordingWaylandSystem(clipboard="old", copy_text=None)
         adapter = _make_selection_adapter(system)
@@ -517,6 +846,57 @@ class TestWaylandSelectionAdapter:
         assert system.keys_sent == ["ctrl+v"]
         assert system.clipboard == "current"
 
+    def test_replace_selection_restores_as_soon_as_paste_once_is_served(self, monkeypatch):
+        system = _RecordingWaylandSystem(clipboard="current")
+        served = []
+        system.set_clipboard_paste_once = MagicMock(return_value=True)
+        system.wait_clipboard_served = (
+            lambda selection, timeout, since: served.append(timeout) or True
+        )
+        adapter = _make_selection_adapter(system)
+        adapter.PASTE_DELAY = 0.12
+        monkeypatch.setattr(
+            "lswitch.platform.wayland.time.sleep",
+            MagicMock(side_effect=AssertionError("fixed delay")),
+        )
+
+        assert adapter.replace_selection("converted") is True
+        system.set_clipboard_paste_once.assert_called_once_with(
+            "converted", selection="clipboard", ready_timeout=0.12,
+        )
+        assert system.keys_sent == ["ctrl+v"]
+        assert served == [adapter.PASTE_TIMEOUT]
+        assert system.clipboard_writes == ["current"]
+
+    def test_replace_selection_reoffers_text_read_before_ctrl_v(self, monkeypatch):
+        system = _RecordingWaylandSystem(clipboard="current")
+        system.set_clipboard_paste_once = MagicMock(return_value=True)
+        system.paste_once_pending = MagicMock(return_value=False)
+        waits = []
+        system.wait_clipboard_served = (
+            lambda selection, timeout, since: waits.append(since) or None
+        )
+        adapter = _make_selection_adapter(system)
+        sleeps = []
+        monkeypatch.setattr("lswitch.platform.wayland.time.sleep", sleeps.append)
+
+        before = time.monotonic()
+        assert adapter.replace_selection("converted") is True
+
+        assert system.clipboard_writes == ["converted", "current"]
+        assert system.keys_sent == ["ctrl+v"]
+        assert sleeps == [adapter.PASTE_DELAY, adapter.RESTORE_DELAY]
+        assert waits[0] >= before
+
+    def test_replace_selection_falls_back_when_paste_once_is_unavailable(self):
+        system = _RecordingWaylandSystem(clipboard="current")
+        system.set_clipboard_paste_once = MagicMock(return_value=False)
+        adapter = _make_selection_adapter(system)
+
+        assert adapter.replace_selection("converted") is True
+        assert system.keys_sent == ["ctrl+v"]
+        assert system.clipboard_writes == ["converted", "current"]
+
     def test_primary_strategy_replace_selection_does_not_paste(self):
         system = _RecordingWaylandSystem(clipboard="current", primary="selected")
         adapter = _make_primary_selection_adapter(system)
@@ -539,6 +919,7 @@ class TestWaylandSelectionAdapter:
                 "copy_retry_delay": 0.04,
                 "paste_delay": 0.05,
                 "restore_delay": 0.06,
+                "paste_timeout": 0.3,
                 "expand_selection_delay": 0.07,
             },
         )
@@ -548,6 +929,7 @@ class TestWaylandSelectionAdapter:
         assert adapter.COPY_RETRY_DELAY == 0.04
         assert adapter.PASTE_DELAY == 0.05
         assert adapter.RESTORE_DELAY == 0.06
+        assert adapter.PASTE_TIMEOUT == 0.3
         assert adapter.EXPAND_SELECTION_DELAY == 0.07
 
     def test_primary_strategy_replace_selection_by_typing(self):
@@ -854,6 +1236,242 @@ class TestKdeLayoutBackend:
             backend.get_layouts()
 
 
+class TestKdeSwitchMethodMemo:
+    RU = LayoutInfo(name="ru", index=1, xkb_name="ru")
+    EN = LayoutInfo(name="en", index=0, xkb_name="us")
+
+    @staticmethod
+    def _set_layout_calls(dbus):
+        return [args for method, args in dbus.calls if method == "setLayout"]
+
+    def test_working_method_is_tried_first_next_time(self):
+        dbus = _FakeKdeDbus(current=0)
+        backend = KdeLayoutBackend(dbus)
+        backend.switch_layout(target=self.RU)
+        dbus.calls.clear()
+
+        backend.switch_layout(target=self.EN)
+
+        assert self._set_layout_calls(dbus) == [(0,)]
+        assert backend.preferred_switch_method == "setLayout(index)"
+
+    def test_memo_persists_per_kde_version(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("KDE_SESSION_VERSION", "6")
+        state = str(tmp_path / "kde_layout.json")
+        KdeLayoutBackend(_FakeKdeDbus(current=0), state_path=state).switch_layout(target=self.RU)
+
+        dbus = _FakeKdeDbus(current=0)
+        KdeLayoutBackend(dbus, state_path=state).switch_layout(target=self.RU)
+        assert self._set_layout_calls(dbus) == [(1,)]
+
+        monkeypatch.setenv("KDE_SESSION_VERSION", "7")
+        assert KdeLayoutBackend(dbus, state_path=state).preferred_switch_method is None
+
+    def test_failing_memo_is_forgotten_and_relearned(self, tmp_path):
+        state = str(tmp_path / "kde_layout.json")
+        dbus = _FakeKdeDbus(current=0)
+        backend = KdeLayoutBackend(dbus, state_path=state)
+        backend.switch_layout(target=self.RU)
+
+        dbus.accepted_set_layout_signature = "uint32"
+        backend.switch_layout(target=self.EN)
+
+        assert backend.last_switch_method == "setLayout(uint32)"
+        assert KdeLayoutBackend(dbus, state_path=state).preferred_switch_method == (
+            "setLayout(uint32)"
+        )
+
+    def test_next_layout_cycle_is_remembered(self):
+        dbus = _FakeKdeDbus(
+            layouts=[("us", "", "English (US)"), ("ru", "", "Russian")],
+            current=0,
+            accepted_set_layout_signature="next",
+        )
+        backend = KdeLayoutBackend(dbus)
+        backend.switch_layout(target=self.RU)
+        dbus.calls.clear()
+
+        backend.switch_layout(target=self.EN)
+
+        assert self._set_layout_calls(dbus) == []
+        assert backend.last_switch_method == "switchToNextLayout x1"
+
+    def test_timings_are_kept_per_method(self):
+        backend = KdeLayoutBackend(_FakeKdeDbus(current=0))
+        backend.switch_layout(target=self.RU)
+        backend.switch_layout(target=self.EN)
+
+        timings = backend.switch_timings
+        assert (timings["setLayout(uint32)"].calls, timings["setLayout(uint32)"].failures) == (1, 1)
+        assert (timings["setLayout(index)"].calls, timings["setLayout(index)"].failures) == (2, 0)
+        assert "2 calls" in timings["setLayout(index)"].format()
+
+
+class _SignallingKdeDbus(_FakeKdeDbus):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.signal_callback = None
+
+    def subscribe(self, callback):
+        self.signal_callback = callback
+        return True
+
+
+class TestKdeLayoutSignals:
+    def _watched(self, **kwargs):
+        dbus = _SignallingKdeDbus(**kwargs)
+        backend = KdeLayoutBackend(dbus)
+        changes = []
+        assert backend.watch(lambda: changes.append(1)) is True
+        return backend, dbus, changes
+
+    def test_current_layout_is_read_once_then_served_from_cache(self):
+        backend, dbus, _ = self._watched(current=1)
+
+        for _ in range(3):
+            assert backend.get_current_layout().name == "ru"
+
+        assert dbus.calls.count(("getLayout", ())) == 1
+
+    def test_layout_changed_signal_updates_cache(self):
+        backend, dbus, changes = self._watched(current=0)
+        backend.get_current_layout()
+
+        dbus.signal_callback("layoutChanged", [1])
+
+        assert backend.get_current_layout().name == "ru"
+        assert dbus.calls.count(("getLayout", ())) == 1
+        assert changes == [1]
+
+    def test_layout_list_changed_signal_drops_caches(self):
+        backend, dbus, _ = self._watched(current=0)
+        backend.get_current_layout()
+        dbus.layouts = ["Russian", "English (US)"]
+
+        dbus.signal_callback("layoutListChanged", [])
+
+        assert [layout.name for layout in backend.get_layouts()] == ["ru", "en"]
+        assert backend.get_current_layout().name == "ru"
+        assert dbus.calls.count(("getLayoutsList", ())) == 2
+
+    def test_switch_updates_cached_index(self):
+        backend, dbus, _ = self._watched(current=0)
+
+        backend.switch_layout(target=LayoutInfo(name="ru", index=1, xkb_name="ru"))
+
+        assert backend.get_current_layout().name == "ru"
+        assert ("getLayout", ()) not in dbus.calls
+
+    def test_without_subscribe_every_call_asks_kde(self):
+        dbus = _FakeKdeDbus(current=1)
+        backend = KdeLayoutBackend(dbus)
+
+        assert backend.watch() is False
+        backend.get_current_layout()
+        backend.get_current_layout()
+
+        assert dbus.calls.count(("getLayout", ())) == 2
+
+    def test_adapter_watch_layout_changes_subscribes_backend(self):
+        dbus = _SignallingKdeDbus(current=0)
+        adapter = WaylandLayoutAdapter(
+            main_thread=DirectMainThreadInvoker(),
+            compositor="kde",
+            backend=KdeLayoutBackend(dbus),
+        )
+        callback = MagicMock()
+
+        assert adapter.watch_layout_changes(callback) is None
+        dbus.signal_callback("layoutChanged", [1])
+
+        callback.assert_called_once_with()
+        assert adapter.get_current_layout().name == "ru"
+
+
+class TestKdeKeyboardDbusClient:
+    def _install_fake_qtdbus(self, monkeypatch, replies):
+        created = []
+
+        class _Reply:
+            def __init__(self, value):
+                self.value = value
+
+            def type(self):
+                return "error" if isinstance(self.value, Exception) else "reply"
+
+            def errorName(self):
+                return str(self.value)
+
+            def errorMessage(self):
+                return str(self.value)
+
+            def arguments(self):
+                return [self.value]
+
+        class _Interface:
+            def __init__(self, service, path, interface, bus):
+                created.append(interface)
+
+            def isValid(self):
+                return True
+
+            def call(self, method, *args):
+                return _Reply(replies.pop(0))
+
+        qtdbus = types.ModuleType("PyQt6.QtDBus")
+        qtdbus.QDBusConnection = types.SimpleNamespace(sessionBus=lambda: object())
+        qtdbus.QDBusInterface = _Interface
+        qtdbus.QDBusMessage = types.SimpleNamespace(
+            MessageType=types.SimpleNamespace(ErrorMessage="error"),
+        )
+        pyqt6 = types.ModuleType("PyQt6")
+        pyqt6.QtDBus = qtdbus
+        monkeypatch.setitem(sys.modules, "PyQt6", pyqt6)
+        monkeypatch.setitem(sys.modules, "PyQt6.QtDBus", qtdbus)
+        return created
+
+    def test_interface_is_created_once(self, monkeypatch):
+        created = self._install_fake_qtdbus(monkeypatch, [0, 1, 1])
+        client = KdeKeyboardDbusClient(DirectMainThreadInvoker())
+
+        assert [client.call("getLayout") for _ in range(3)] == [0, 1, 1]
+        assert created == [KdeKeyboardDbusClient.INTERFACE]
+
+    def test_service_loss_recreates_interface(self, monkeypatch):
+        created = self._install_fake_qtdbus(monkeypatch, [
+            RuntimeError("org.freedesktop.DBus.Error.ServiceUnknown"), 1,
+        ])
+        client = KdeKeyboardDbusClient(DirectMainThreadInvoker())
+
+        with pytest.raises(WaylandLayoutBackendError):
+            client.call("getLayout")
+        assert client.call("getLayout") == 1
+        assert len(created) == 2
+
+    def test_only_read_only_methods_are_coalesced(self):
+        main_thread = MagicMock()
+        client = KdeKeyboardDbusClient(main_thread)
+
+        client.call("getLayout")
+        client.call("setLayout", DbusUInt32(1))
+
+        coalesce = [call.kwargs["coalesce"] for call in main_thread.call.call_args_list]
+        assert coalesce == [True, False]
+
+    def test_queue_latency_is_labelled_by_dbus_method(self):
+        main_thread = MagicMock()
+        client = KdeKeyboardDbusClient(main_thread)
+
+        client.call("getLayout")
+        client.call("switchToNextLayout")
+
+        labels = [call.kwargs["label"] for call in main_thread.call.call_args_list]
+        assert labels == [
+            "KdeKeyboardDbusClient.getLayout",
+            "KdeKeyboardDbusClient.switchToNextLayout",
+        ]
+
+
 class TestWaylandLayoutAdapter:
     def test_delegates_layout_operations_to_backend(self):
         backend = KdeLayoutBackend(_FakeKdeDbus(current=0))
@@ -98,6 +98,8 @@ class TestRunWaylandDiagnostics:
         assert "[ok] switch test restore: en index=0 via setLayout(uint32)" in text
         assert ("setLayout", (DbusUInt32(1),)) in fake_dbus.calls
         assert ("setLayout", (DbusUInt32(0),)) in fake_dbus.calls
+        assert "[info] remembered switch method: none" in text
+        assert "[info] switch latency setLayout(uint32): " in text
 
     def test_non_wayland_or_non_kde_are_warnings_not_failures(self):
         report = run_wayland_diagnostics(
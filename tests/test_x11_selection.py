@@ -0,0 +1,444 @@
+"""Tests for the in-process X11 selection client (fake Xlib display)."""
+
+from __future__ import annotations
+
+import queue
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("Xlib")
+from Xlib import X  # noqa: E402
+
+from lswitch.platform.selection_adapter import X11SelectionAdapter  # noqa: E402
+from lswitch.platform.x11_selection import (  # noqa: E402
+    X11SelectionClient,
+    X11SystemAdapter,
+)
+
+ATOMS = {name: 100 + i for i, name in enumerate(X11SelectionClient.ATOM_NAMES)}
+PRIMARY, CLIPBOARD = ATOMS["PRIMARY"], ATOMS["CLIPBOARD"]
+UTF8, STRING, INCR = ATOMS["UTF8_STRING"], ATOMS["STRING"], ATOMS["INCR"]
+PROP = ATOMS["LSWITCH_SELECTION"]
+
+
+class FakeWindow:
+    def __init__(self, display, wid):
+        self.display = display
+        self.id = wid
+        self.props: dict[int, SimpleNamespace] = {}
+        self.sent: list = []
+        self.converts: list[tuple[int, int]] = []
+
+    def convert_selection(self, selection, target, prop, when):
+        self.converts.append((selection, target))
+        self.display.selection_owner_hook(self, selection, target, prop)
+
+    def get_full_property(self, prop, prop_type, sizehint=10):
+        return self.props.get(prop)
+
+    def change_property(self, prop, prop_type, fmt, data):
+        self.props[prop] = SimpleNamespace(property_type=prop_type, format=fmt, value=data)
+
+    def delete_property(self, prop):
+        self.props.pop(prop, None)
+        self.display.on_delete(self, prop)
+
+    def set_selection_owner(self, atom, when):
+        self.display.owners[atom] = self
+
+    def send_event(self, event, event_mask=0, propagate=False):
+        self.sent.append(event)
+        if self is self.display.ours:
+            self.display.events.put(event)
+
+
+class FakeDisplay:
+    """Events are queued by the fake windows; the owner is scripted."""
+
+    def __init__(self):
+        self.display = SimpleNamespace(info=SimpleNamespace(max_request_length=65535))
+        self.events: queue.Queue = queue.Queue()
+        self.owners: dict[int, FakeWindow] = {}
+        self.ours = FakeWindow(self, 0x400001)
+        self.selection_owner_hook = lambda *args: None
+        self.on_delete = lambda *args: None
+
+    def next_event(self):
+        return self.events.get()
+
+    def flush(self):
+        pass
+
+    def get_selection_owner(self, atom):
+        return self.owners.get(atom, X.NONE)
+
+    def close(self):
+        pass
+
+    # XFixes
+    XFIXES_EVENT = 87
+
+    def has_extension(self, name):
+        return name == "XFIXES"
+
+    def xfixes_query_version(self):
+        return SimpleNamespace(major_version=5, minor_version=0)
+
+    def query_extension(self, name):
+        return SimpleNamespace(first_event=self.XFIXES_EVENT)
+
+    def xfixes_select_selection_input(self, window, selection, mask):
+        self.xfixes_selected = (window.id, selection, mask)
+
+    def notify(self, prop):
+        self.events.put(SimpleNamespace(type=X.SelectionNotify, property=prop))
+
+
+def _client(display: FakeDisplay) -> X11SelectionClient:
+    return X11SelectionClient(display, display.ours, dict(ATOMS))
+
+
+def _close(adapter: X11SystemAdapter) -> None:
+    """Close without the real xclip hand-over of owned selections."""
+    with patch("lswitch.platform.subprocess_impl.subprocess.run"):
+        adapter.close()
+
+
+def _owner_serving(display: FakeDisplay, values: dict[int, tuple[int, object]]):
+    """Script an owner that answers targets from *values* (target → type, data)."""
+    def hook(window, selection, target, prop):
+        if target in values:
+            prop_type, data = values[target]
+            window.props[prop] = SimpleNamespace(property_type=prop_type, value=data)
+            display.notify(prop)
+        else:
+            display.notify(X.NONE)
+    display.selection_owner_hook = hook
+
+
+class TestSelectionReads:
+    def test_reads_utf8_text(self):
+        display = FakeDisplay()
+        _owner_serving(display, {UTF8: (UTF8, "привет".encode())})
+        client = _client(display)
+        try:
+            assert client.read("primary") == "привет"
+            assert display.ours.converts == [(PRIMARY, UTF8)]
+            assert PROP not in display.ours.props      # cleaned up
+        finally:
+            client.close()
+
+    def test_falls_back_to_string_target(self):
+        display = FakeDisplay()
+        _owner_serving(display, {STRING: (STRING, "caf\xe9".encode("latin-1"))})
+        client = _client(display)
+        try:
+            assert client.read("clipboard") == "café"
+            assert display.ours.converts == [(CLIPBOARD, UTF8), (CLIPBOARD, STRING)]
+        finally:
+            client.close()
+
+    def test_silent_owner_times_out_once(self):
+        display = FakeDisplay()
+        client = _client(display)
+        try:
+            start = time.monotonic()
+            assert client.read("primary", timeout=0.05) == ""
+            assert time.monotonic() - start < 0.5
+            assert len(display.ours.converts) == 1
+        finally:
+            client.close()
+
+    def test_incr_transfer(self):
+        display = FakeDisplay()
+        chunks = [b"hello ", b"world", b""]
+
+        def hook(window, selection, target, prop):
+            window.props[prop] = SimpleNamespace(property_type=INCR, value=[11])
+            display.notify(prop)
+
+        def on_delete(window, prop):
+            if chunks:
+                window.props[prop] = SimpleNamespace(property_type=UTF8, value=chunks.pop(0))
+                display.events.put(SimpleNamespace(
+                    type=X.PropertyNotify, state=X.PropertyNewValue, atom=prop,
+                ))
+
+        display.selection_owner_hook = hook
+        display.on_delete = on_delete
+        client = _client(display)
+        try:
+            assert client.read("primary") == "hello world"
+        finally:
+            client.close()
+
+
+class TestSelectionOwnership:
+    def _request(self, requestor, target, prop=PROP):
+        return SimpleNamespace(
+            type=X.SelectionRequest, time=0, requestor=requestor,
+            selection=CLIPBOARD, target=target, property=prop,
+        )
+
+    def test_serves_owned_text(self):
+        display = FakeDisplay()
+        client = _client(display)
+        other = FakeWindow(display, 0x600001)
+        try:
+            assert client.set("ghbdtn", "clipboard") is True
+            assert client.owner("clipboard") == display.ours.id
+            # Our own reads do not round-trip through the server.
+            assert client.read("clipboard") == "ghbdtn"
+            assert display.ours.converts == []
+
+            display.events.put(self._request(other, UTF8))
+            display.events.put(self._request(other, ATOMS["TARGETS"], prop=ATOMS["TARGETS"]))
+            display.events.put(self._request(other, ATOMS["LSWITCH_WAKE"]))
+            deadline = time.monotonic() + 1.0
+            while len(other.sent) < 3 and time.monotonic() < deadline:
+                time.sleep(0.005)
+
+            assert other.props[PROP].value == b"ghbdtn"
+            assert other.props[PROP].property_type == UTF8
+            assert UTF8 in other.props[ATOMS["TARGETS"]].value
+            assert [e.property for e in other.sent] == [PROP, ATOMS["TARGETS"], X.NONE]
+        finally:
+            client.close()
+
+    def test_paste_completion_tracks_text_requests_only(self):
+        display = FakeDisplay()
+        client = _client(display)
+        other = FakeWindow(display, 0x600001)
+        try:
+            client.set("ghbdtn", "clipboard")
+            display.events.put(self._request(other, ATOMS["TARGETS"], prop=ATOMS["TARGETS"]))
+            assert client.wait_served("clipboard", 0.05) is False
+
+            display.events.put(self._request(other, ATOMS["text/plain;charset=utf-8"]))
+            assert client.wait_served("clipboard", 1.0) is True
+
+            client.set("next", "clipboard")            # new text, new wait
+            assert client.wait_served("clipboard", 0.01) is False
+        finally:
+            client.close()
+
+    def test_reads_before_since_are_not_the_paste(self):
+        display = FakeDisplay()
+        client = _client(display)
+        other = FakeWindow(display, 0x600001)
+        try:
+            client.set("ghbdtn", "clipboard")
+            display.events.put(self._request(other, UTF8))    # clipboard manager
+            assert client.wait_served("clipboard", 1.0) is True
+
+            pasted_at = time.monotonic()
+            assert client.wait_served("clipboard", 0.05, since=pasted_at) is False
+
+            display.events.put(self._request(other, UTF8))    # the paste
+            assert client.wait_served("clipboard", 1.0, since=pasted_at) is True
+        finally:
+            client.close()
+
+    def test_selection_clear_drops_ownership(self):
+        display = FakeDisplay()
+        client = _client(display)
+        try:
+            client.set("text", "clipboard")
+            display.events.put(SimpleNamespace(type=X.SelectionClear, atom=CLIPBOARD))
+            deadline = time.monotonic() + 1.0
+            while client._owned and time.monotonic() < deadline:
+                time.sleep(0.005)
+            assert client._owned == {}
+        finally:
+            client.close()
+
+    def test_close_stops_event_thread(self):
+        display = FakeDisplay()
+        client = _client(display)
+        client.close()
+        assert client.closed
+        assert not client._thread.is_alive()
+
+
+class TestOwnerNotifications:
+    def _owner_event(self, display, owner, sub_code=0, selection=PRIMARY):
+        display.events.put(SimpleNamespace(
+            type=FakeDisplay.XFIXES_EVENT, sub_code=sub_code,
+            owner=owner, selection=selection,
+        ))
+
+    def test_xfixes_owner_changes_reach_callback(self):
+        display = FakeDisplay()
+        client = _client(display)
+        seen = queue.Queue()
+        try:
+            assert client.watch_owner("primary", seen.put) is True
+            assert display.xfixes_selected[:2] == (display.ours.id, PRIMARY)
+
+            self._owner_event(display, FakeWindow(display, 0x3a00007))
+            self._owner_event(display, FakeWindow(display, 0x3a00007), selection=CLIPBOARD)
+            self._owner_event(display, X.NONE, sub_code=2)     # owner's client exited
+            assert seen.get(timeout=1.0) == 0x3a00007
+            assert seen.get(timeout=1.0) == 0
+            assert seen.empty()
+            assert display.ours.converts == []                 # text stays unread
+        finally:
+            client.close()
+
+    def test_without_xfixes(self):
+        display = FakeDisplay()
+        display.has_extension = lambda name: False
+        client = _client(display)
+        try:
+            assert client.watch_owner("primary", lambda owner: None) is False
+            assert X11SystemAdapter(client=client).watch_selection_owner(
+                "primary", lambda owner: None,
+            ) is False
+        finally:
+            client.close()
+
+
+class TestX11SystemAdapter:
+    def test_clipboard_calls_stay_in_process(self):
+        display = FakeDisplay()
+        _owner_serving(display, {UTF8: (UTF8, b"sel")})
+        adapter = X11SystemAdapter(client=_client(display))
+        try:
+            with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+                assert adapter.get_clipboard("primary") == "sel"
+                adapter.set_clipboard("new", "clipboard")
+                assert adapter.get_clipboard("clipboard") == "new"
+            run.assert_not_called()
+        finally:
+            _close(adapter)
+
+    def test_key_sequences_use_virtual_keyboard(self):
+        virtual_kb = MagicMock(available=True)
+        adapter = X11SystemAdapter(virtual_kb=virtual_kb)
+        with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+            adapter.send_key_sequence("ctrl+shift+Left")
+        virtual_kb.send_combo.assert_called_once_with("ctrl+shift+Left")
+        run.assert_not_called()
+
+    @pytest.mark.parametrize("virtual_kb", [
+        MagicMock(available=False),
+        MagicMock(available=True, **{"send_combo.side_effect": ValueError("F13")}),
+    ])
+    def test_key_sequences_fall_back_to_xdotool(self, virtual_kb):
+        adapter = X11SystemAdapter(virtual_kb=virtual_kb)
+        with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+            adapter.send_key_sequence("ctrl+v")
+        assert run.call_args[0][0] == ["xdotool", "key", "ctrl+v"]
+
+    def test_paste_wait_only_for_in_process_writes(self):
+        display = FakeDisplay()
+        client = _client(display)
+        adapter = X11SystemAdapter(client=client)
+        try:
+            assert adapter.wait_clipboard_served("clipboard", 0.01) is None
+            adapter.set_clipboard("x", "clipboard")
+            assert adapter.wait_clipboard_served("clipboard", 0.01) is False
+        finally:
+            _close(adapter)
+
+    @pytest.mark.parametrize("app_pastes", [False, True])
+    def test_manager_read_before_ctrl_v_does_not_restore_early(self, app_pastes, caplog):
+        display = FakeDisplay()
+        client = _client(display)
+        manager = FakeWindow(display, 0x600001)
+        app = FakeWindow(display, 0x700001)
+        adapter = X11SystemAdapter(client=client)
+        set_clipboard = adapter.set_clipboard
+
+        def request(requestor):
+            display.events.put(SimpleNamespace(
+                type=X.SelectionRequest, time=0, requestor=requestor,
+                selection=CLIPBOARD, target=UTF8, property=PROP,
+            ))
+            deadline = time.monotonic() + 1.0
+            while not requestor.sent and time.monotonic() < deadline:
+                time.sleep(0.005)
+
+        def set_and_get_copied(text, selection="clipboard"):
+            set_clipboard(text, selection)
+            if text == "new":
+                request(manager)      # answered between set() and Ctrl+V
+
+        adapter.set_clipboard = set_and_get_copied
+        adapter.send_key_sequence = lambda combo: app_pastes and request(app)
+        selection = X11SelectionAdapter(
+            system=adapter, timing={"paste_timeout": 0.1},
+        )
+        try:
+            with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+                run.return_value = SimpleNamespace(stdout="old", stderr="", returncode=0)
+                with caplog.at_level("DEBUG", logger="lswitch.platform.selection_adapter"):
+                    assert selection.replace_selection("new") is True
+            assert manager.props[PROP].value == b"new"
+            if app_pastes:
+                assert app.props[PROP].value == b"new"
+                assert "буфер прочитан" in caplog.text
+            else:
+                assert "не прочитан" in caplog.text
+        finally:
+            _close(adapter)
+
+    def test_close_hands_owned_clipboard_to_xclip(self):
+        display = FakeDisplay()
+        adapter = X11SystemAdapter(client=_client(display))
+        adapter.set_clipboard("restored", "clipboard")
+        with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+            adapter.close()
+        run.assert_called_once()
+        assert run.call_args[0][0] == ["xclip", "-i", "-selection", "clipboard"]
+        assert run.call_args[1]["input"] == "restored"
+
+    def test_close_leaves_selections_taken_by_others(self):
+        display = FakeDisplay()
+        client = _client(display)
+        adapter = X11SystemAdapter(client=client)
+        adapter.set_clipboard("ours", "clipboard")
+        display.events.put(SimpleNamespace(type=X.SelectionClear, atom=CLIPBOARD))
+        deadline = time.monotonic() + 1.0
+        while client._owned and time.monotonic() < deadline:
+            time.sleep(0.005)
+        with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+            adapter.close()
+        run.assert_not_called()
+
+    def test_falls_back_to_xclip_when_client_closed(self):
+        display = FakeDisplay()
+        client = _client(display)
+        client.close()
+        adapter = X11SystemAdapter(client=client)
+        with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+            run.return_value = SimpleNamespace(stdout="xclip", stderr="", returncode=0)
+            assert adapter.get_clipboard("primary") == "xclip"
+        assert run.call_args[0][0][:2] == ["xclip", "-o"]
+
+    def test_oversized_write_uses_xclip(self):
+        display = FakeDisplay()
+        client = _client(display)
+        client.max_inline = 4
+        adapter = X11SystemAdapter(client=client)
+        try:
+            with patch("lswitch.platform.subprocess_impl.subprocess.run") as run:
+                adapter.set_clipboard("too long", "clipboard")
+            assert run.call_args[0][0][:2] == ["xclip", "-i"]
+            assert client._owned == {}
+        finally:
+            adapter.close()
+
+    def test_selection_adapter_reads_owner_from_system(self):
+        display = FakeDisplay()
+        _owner_serving(display, {UTF8: (UTF8, b"word")})
+        display.owners[PRIMARY] = FakeWindow(display, 0x500002)
+        adapter = X11SystemAdapter(client=_client(display))
+        try:
+            info = X11SelectionAdapter(system=adapter).get_selection()
+            assert (info.text, info.owner_id) == ("word", 0x500002)
+        finally:
+            adapter.close()
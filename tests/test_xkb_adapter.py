@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import os
+from unittest.mock import MagicMock, patch
+
 import pytest
 
 from lswitch.platform.xkb_adapter import IXKBAdapter, LayoutInfo, X11XKBAdapter
@@ -77,6 +79,183 @@ class TestMockXKBAdapter:
         assert cur.name == "en"
 
 
+# ---------------------------------------------------------------------------
+# XKB notifications (fake libX11)
+# ---------------------------------------------------------------------------
+
+XKB_EVENT_BASE = 85
+
+
+def _fake_libx11(pending_events=()):
+    """MagicMock libX11 whose XNextEvent replays ``(xkb_type, group)`` pairs."""
+    from lswitch.platform.xkb_bindings import XKB_STATE_NOTIFY
+
+    lib = MagicMock()
+    lib.XOpenDisplay.return_value = 0x1234
+    lib.XkbGetState.return_value = 0
+    queue = list(pending_events)
+
+    def query_extension(dpy, opcode, event_base, error_base, major, minor):
+        event_base._obj.value = XKB_EVENT_BASE
+        return 1
+
+    def next_event(dpy, ref):
+        xkb_type, group = queue.pop(0)
+        ev = ref._obj
+        ev.type = XKB_EVENT_BASE
+        ev.xkb_state.xkb_type = xkb_type
+        ev.xkb_state.group = group
+        return 0
+
+    lib.XkbQueryExtension.side_effect = query_extension
+    lib.XPending.side_effect = lambda dpy: len(queue)
+    lib.XNextEvent.side_effect = next_event
+    lib.queue = queue
+    lib.XKB_STATE_NOTIFY = XKB_STATE_NOTIFY
+    return lib
+
+
+def _adapter_with(lib) -> X11XKBAdapter:
+    with patch.object(X11XKBAdapter, "_load_libx11", return_value=lib):
+        adapter = X11XKBAdapter()
+    adapter._layouts = [LayoutInfo("en", 0, "us"), LayoutInfo("ru", 1, "ru")]
+    return adapter
+
+
+class TestXkbLayoutNotifications:
+    def test_listener_selects_group_changes_only(self):
+        from lswitch.platform.xkb_bindings import XKB_GROUP_STATE_MASK, XKB_STATE_NOTIFY
+
+        lib = _fake_libx11()
+        adapter = _adapter_with(lib)
+        assert adapter.watch_layout_changes(lambda: None) is not None
+        lib.XkbSelectEventDetails.assert_called_once_with(
+            0x1234, 0x0100, XKB_STATE_NOTIFY, XKB_GROUP_STATE_MASK, XKB_GROUP_STATE_MASK,
+        )
+
+    def test_state_notify_updates_cache_and_calls_back(self):
+        lib = _fake_libx11()
+        adapter = _adapter_with(lib)
+        calls = []
+        listener = adapter.watch_layout_changes(lambda: calls.append(1))
+        lib.XkbGetState.reset_mock()
+
+        lib.queue.append((lib.XKB_STATE_NOTIFY, 1))
+        listener.process()
+
+        assert calls == [1]
+        assert adapter.get_current_layout().name == "ru"
+        lib.XkbGetState.assert_not_called()   # served from the cache
+
+    def test_burst_of_events_calls_back_once(self):
+        lib = _fake_libx11()
+        adapter = _adapter_with(lib)
+        calls = []
+        listener = adapter.watch_layout_changes(lambda: calls.append(1))
+
+        lib.queue.extend([(lib.XKB_STATE_NOTIFY, 1), (lib.XKB_STATE_NOTIFY, 0)])
+        listener.process()          # net result: unchanged
+        assert calls == []
+
+    def test_new_keyboard_invalidates_layout_list(self):
+        from lswitch.platform.xkb_bindings import XKB_NEW_KEYBOARD_NOTIFY
+
+        lib = _fake_libx11()
+        adapter = _adapter_with(lib)
+        calls = []
+        listener = adapter.watch_layout_changes(lambda: calls.append(1))
+
+        lib.queue.append((XKB_NEW_KEYBOARD_NOTIFY, 0))
+        listener.process()
+        assert calls == [1]
+        assert adapter._layouts is None
+
+    def test_switch_layout_updates_cache_immediately(self):
+        lib = _fake_libx11()
+        adapter = _adapter_with(lib)
+        adapter.watch_layout_changes(lambda: None)
+        with patch.object(adapter, "_cinnamon_activate", return_value=True):
+            adapter.switch_layout()
+        assert adapter.get_current_layout().name == "ru"
+
+    def test_unavailable_extension_returns_none(self):
+        lib = _fake_libx11()
+        lib.XkbQueryExtension.side_effect = None
+        lib.XkbQueryExtension.return_value = 0
+        adapter = _adapter_with(lib)
+        assert adapter.watch_layout_changes(lambda: None) is None
+        lib.XCloseDisplay.assert_called_once_with(0x1234)
+
+
+# ---------------------------------------------------------------------------
+# Keymap snapshot
+# ---------------------------------------------------------------------------
+
+# x11 keycode 24 = evdev 16 ('q' / 'й'), 38 = evdev 30 ('a' / 'ф')
+_FAKE_KEYSYMS = {
+    (24, 0, 0): ord("q"), (24, 0, 1): ord("Q"),
+    (24, 1, 0): 0x6CA, (24, 1, 1): 0x6EA,            # Cyrillic_shorti / SHORTI
+    (38, 0, 0): ord("a"), (38, 0, 1): ord("A"),
+    (38, 1, 0): 0x1000463, (38, 1, 1): 0x1000463,    # Unicode keysym 'ѣ'
+}
+
+
+def _fake_keysym_at(keycode, group, level):
+    return _FAKE_KEYSYMS.get((keycode, group, level), 0)
+
+
+class TestKeymapTable:
+    def test_lookup_both_directions(self):
+        from lswitch.platform.xkb_keymap import KeymapTable
+
+        table = KeymapTable.build(_fake_keysym_at, 2, lambda ks: {
+            0x6CA: "й", 0x6EA: "Й",
+        }.get(ks) or (chr(ks) if 0x20 <= ks < 0x7F else ""))
+        assert table.char(16, 0) == "q"
+        assert table.char(16, 1, shifted=True) == "Й"
+        assert table.key_for("Й", 1) == (16, True)
+        assert table.key_for("q", 0) == (16, False)
+        assert table.key_for("й", 0) is None
+        assert table.char(16, 3) == ""        # group not in snapshot
+
+    def test_keysym_to_char_without_xkbcommon(self):
+        from lswitch.platform import xkb_keymap
+
+        with patch.object(xkb_keymap, "_xkbcommon", None):
+            assert xkb_keymap.keysym_to_char(ord(",")) == ","
+            assert xkb_keymap.keysym_to_char(0x1000463) == "ѣ"
+            assert xkb_keymap.keysym_to_char(0xFF08) == ""          # BackSpace
+            assert xkb_keymap.keysym_to_char(0x6CA, lambda ks: "й") == "й"
+
+    def test_adapter_snapshots_keymap_once(self):
+        lib = _fake_libx11()
+        lib.XkbKeycodeToKeysym.side_effect = lambda dpy, kc, g, lvl: _fake_keysym_at(kc, g, lvl)
+        lib.XKeysymToString.side_effect = lambda ks: {0x6CA: b"Cyrillic_shorti"}.get(ks)
+        adapter = _adapter_with(lib)
+        ru = adapter.get_layouts()[1]
+
+        with patch("lswitch.platform.xkb_keymap._xkbcommon", None):
+            assert adapter.keycode_to_char(16, ru) == "й"
+            calls = lib.XkbKeycodeToKeysym.call_count
+            assert adapter.keycode_to_char(30, ru) == "ѣ"
+            assert adapter.char_to_key("й", "ru") == (16, False)
+        assert lib.XkbKeycodeToKeysym.call_count == calls
+
+    def test_keymap_notification_drops_snapshot(self):
+        from lswitch.platform.xkb_bindings import XKB_MAP_NOTIFY
+
+        lib = _fake_libx11()
+        lib.XkbKeycodeToKeysym.side_effect = lambda dpy, kc, g, lvl: _fake_keysym_at(kc, g, lvl)
+        adapter = _adapter_with(lib)
+        listener = adapter.watch_layout_changes(lambda: None)
+        adapter.keycode_to_char(16, adapter.get_layouts()[0])
+        assert adapter._keymap is not None
+
+        lib.queue.append((XKB_MAP_NOTIFY, 0))
+        listener.process()
+        assert adapter._keymap is None
+
+
 # ---------------------------------------------------------------------------
 # Live X11 tests (skipped when no DISPLAY — safe for CI)
 # ---------------------------------------------------------------------------